@@ -0,0 +1,39 @@
+import argparse
+import glob
+import os
+
+from kivy.atlas import Atlas
+
+from services.icons import ATLAS_NAME, ICON_DIR
+
+# === Config
+ATLAS_PAGE_SIZE = 1024
+PADDING = 2
+
+
+def build(icon_dir=ICON_DIR, out=ATLAS_NAME, size=ATLAS_PAGE_SIZE):
+    """Pack every PNG in icon_dir into <out>.atlas + <out>-N.png pages."""
+    icons = sorted(glob.glob(os.path.join(icon_dir, "*.png")))
+    if not icons:
+        raise SystemExit(f"No icons found in {icon_dir}")
+    # Each icon's id is its file name without ".png": atlas://assets/icons/<name>
+    result = Atlas.create(out, icons, size, padding=PADDING, use_path=False)
+    if not result:
+        raise SystemExit("Atlas creation failed (an icon may be larger than the page size)")
+    atlas_file, meta = result
+    return atlas_file, icons, meta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack assets/icons/*.png into one Kivy atlas.")
+    parser.add_argument("--icons", default=ICON_DIR)
+    parser.add_argument("--out", default=ATLAS_NAME, help="atlas base name (default: assets/icons)")
+    parser.add_argument("--size", type=int, default=ATLAS_PAGE_SIZE, help="page size in pixels")
+    args = parser.parse_args()
+
+    atlas_file, icons, meta = build(args.icons, args.out, args.size)
+    print(f"✅ {len(icons)} icons → {atlas_file} ({len(meta)} page(s))")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ package.name = slingo
 package.domain = com.ahlambhr
 
 source.dir = .
-source.include_exts = py,kv,png,jpg,jpeg,ttf,json,txt,mp3,wav,xml
+source.include_exts = py,kv,png,jpg,jpeg,ttf,json,txt,mp3,wav,xml,atlas
 
 version = 0.1
 orientation = portrait
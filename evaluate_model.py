@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from services import model_registry
+from train_sign_model import DATASET_DIR, held_out_set, load_dataset
+
+# === Config
+EVAL_BATCH_SIZE = 256
+LATENCY_SAMPLES = 200
+TOP_K = 3
+CALIBRATION_BINS = 15
+
+
+# === Metrics
+def confusion_matrix(y_true, y_pred, num_classes):
+    flat = y_true * num_classes + y_pred
+    return np.bincount(flat, minlength=num_classes * num_classes).reshape(num_classes, num_classes)
+
+
+def per_class_report(cm, classes):
+    tp = np.diag(cm).astype(float)
+    predicted = cm.sum(axis=0)
+    actual = cm.sum(axis=1)
+    precision = np.divide(tp, predicted, out=np.zeros_like(tp), where=predicted > 0)
+    recall = np.divide(tp, actual, out=np.zeros_like(tp), where=actual > 0)
+    f1 = np.divide(2 * precision * recall, precision + recall,
+                   out=np.zeros_like(tp), where=(precision + recall) > 0)
+    return [
+        {"class": c, "precision": round(float(p), 4), "recall": round(float(r), 4),
+         "f1": round(float(f), 4), "support": int(n)}
+        for c, p, r, f, n in zip(classes, precision, recall, f1, actual)
+    ]
+
+
+def top_k_accuracy(probs, y_true, k):
+    top = np.argpartition(-probs, kth=min(k, probs.shape[1]) - 1, axis=1)[:, :k]
+    return float(np.mean(np.any(top == y_true[:, None], axis=1)))
+
+
+def expected_calibration_error(probs, y_true, bins=CALIBRATION_BINS):
+    """ECE with equal-width confidence bins, plus the per-bin reliability table."""
+    confidence = probs.max(axis=1)
+    correct = (probs.argmax(axis=1) == y_true).astype(float)
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    ids = np.clip(np.digitize(confidence, edges[1:-1]), 0, bins - 1)
+    ece = 0.0
+    table = []
+    for b in range(bins):
+        mask = ids == b
+        if not mask.any():
+            continue
+        acc, conf, share = correct[mask].mean(), confidence[mask].mean(), mask.mean()
+        ece += share * abs(acc - conf)
+        table.append({"bin": f"{edges[b]:.2f}-{edges[b + 1]:.2f}", "count": int(mask.sum()),
+                      "accuracy": round(float(acc), 4), "confidence": round(float(conf), 4)})
+    return float(ece), table
+
+
+# === Speed
+def batched_predict(classifier, images, batch_size=EVAL_BATCH_SIZE):
+    """Run the whole set in large batches; returns (probs, images/sec)."""
+    outputs = []
+    start = time.perf_counter()
+    for i in range(0, len(images), batch_size):
+        outputs.append(classifier.predict(classifier.preprocess(images[i:i + batch_size])))
+    elapsed = time.perf_counter() - start
+    return np.concatenate(outputs, axis=0), len(images) / elapsed
+
+
+def single_image_latency(classifier, images, samples=LATENCY_SAMPLES):
+    batch = classifier.preprocess(images[:1])
+    for _ in range(5):  # warm-up
+        classifier.predict(batch)
+    timings = []
+    for i in range(min(samples, len(images))):
+        batch = classifier.preprocess(images[i:i + 1])
+        start = time.perf_counter()
+        classifier.predict(batch)
+        timings.append(1000 * (time.perf_counter() - start))
+    return {
+        "p50_ms": round(float(np.percentile(timings, 50)), 3),
+        "p99_ms": round(float(np.percentile(timings, 99)), 3),
+        "mean_ms": round(float(np.mean(timings)), 3),
+    }
+
+
+# === Evaluate
+def evaluate(version=None, dataset_dir=DATASET_DIR, batch_size=EVAL_BATCH_SIZE, top_k=TOP_K):
+    version = version or model_registry.active_version()
+    if not version:
+        raise ValueError("❌ No model in the registry.")
+    classifier = model_registry.load_version(version)
+    print(f"🧪 Evaluating {version} ({classifier.backend}, {classifier.img_size}px)")
+
+    images, labels = load_dataset(dataset_dir, img_size=classifier.img_size, verbose=False)
+    X_val, y_val, dataset_classes = held_out_set(images, labels)
+
+    # Map dataset class indices onto the model's class order
+    model_index = {c: i for i, c in enumerate(classifier.classes)}
+    known = np.array([dataset_classes[y] in model_index for y in y_val])
+    if not known.all():
+        print(f"⚠️ Skipping {int((~known).sum())} samples of classes the model doesn't know")
+    X_val = X_val[known]
+    y_true = np.array([model_index[dataset_classes[y]] for y in y_val[known]], dtype=np.int64)
+
+    probs, throughput = batched_predict(classifier, X_val, batch_size)
+    y_pred = probs.argmax(axis=1)
+    num_classes = len(classifier.classes)
+    cm = confusion_matrix(y_true, y_pred, num_classes)
+    ece, reliability = expected_calibration_error(probs, y_true)
+
+    report = {
+        "version": version,
+        "backend": classifier.backend,
+        "input_size": classifier.img_size,
+        "samples": int(len(y_true)),
+        "accuracy": round(float(np.mean(y_pred == y_true)), 4),
+        f"top_{top_k}_accuracy": round(top_k_accuracy(probs, y_true, top_k), 4),
+        "expected_calibration_error": round(ece, 4),
+        "mean_confidence": round(float(probs.max(axis=1).mean()), 4),
+        "throughput_images_per_s": round(throughput, 1),
+        "batch_size": batch_size,
+        "latency": single_image_latency(classifier, X_val),
+        "per_class": per_class_report(cm, classifier.classes),
+        "confusion_matrix": cm.tolist(),
+        "reliability": reliability,
+        "evaluated": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    return report
+
+
+def print_report(report):
+    print(f"\n✅ {report['version']}: accuracy {report['accuracy']:.4f}, "
+          f"top-{TOP_K} {report[f'top_{TOP_K}_accuracy']:.4f}, ECE {report['expected_calibration_error']:.4f}")
+    lat = report["latency"]
+    print(f"⚡ {report['throughput_images_per_s']} img/s (batch {report['batch_size']}), "
+          f"p50 {lat['p50_ms']} ms, p99 {lat['p99_ms']} ms")
+    print(f"\n{'class':>8} {'prec':>7} {'recall':>7} {'f1':>7} {'n':>5}")
+    for row in report["per_class"]:
+        print(f"{row['class']:>8} {row['precision']:7.3f} {row['recall']:7.3f} {row['f1']:7.3f} {row['support']:5d}")
+
+    # Most confused pairs are more readable than the full matrix
+    cm = np.array(report["confusion_matrix"])
+    np.fill_diagonal(cm, 0)
+    classes = [row["class"] for row in report["per_class"]]
+    worst = np.dstack(np.unravel_index(np.argsort(-cm, axis=None)[:5], cm.shape))[0]
+    print("\n🔀 Most confused (true → predicted):")
+    for t, p in worst:
+        if cm[t, p]:
+            print(f"   {classes[t]} → {classes[p]}: {cm[t, p]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate a registry model on the held-out set.")
+    parser.add_argument("version", nargs="?", help="registry version (default: active)")
+    parser.add_argument("--dataset", default=DATASET_DIR)
+    parser.add_argument("--batch-size", type=int, default=EVAL_BATCH_SIZE)
+    parser.add_argument("--out", help="report path (default: models/registry/<version>/evaluation.json)")
+    args = parser.parse_args()
+
+    report = evaluate(args.version, dataset_dir=args.dataset, batch_size=args.batch_size)
+    print_report(report)
+    out = args.out or os.path.join(model_registry.REGISTRY_DIR, report["version"], "evaluation.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n📄 Report saved to {out}")
+
+
+if __name__ == "__main__":
+    main()
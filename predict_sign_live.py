@@ -2,15 +2,16 @@ import cv2
 import numpy as np
 import time
 from collections import deque, Counter
-from tensorflow.keras.models import load_model
 from PIL import Image, ImageDraw, ImageFont
 import arabic_reshaper
 from bidi.algorithm import get_display
 import mediapipe as mp
 
-# === Load model and label map
-model = load_model("models/asl_model.h5")
-label_map = np.load("models/label_map.npy", allow_pickle=True).item()
+from services import model_registry
+
+# === Load the active model from the registry
+classifier = model_registry.load_active()
+print(f"🧠 Using model {classifier.version} ({classifier.backend})")
 
 # === MediaPipe setup
 mp_hands = mp.solutions.hands
@@ -24,7 +25,7 @@ except:
     font = ImageFont.load_default()
 
 # === Config
-img_size = 128
+img_size = classifier.img_size
 prediction_buffer = deque(maxlen=15)
 current_word = ""
 current_sentence = ""
@@ -63,13 +64,10 @@ while True:
 
         if roi.size > 0:
             resized = cv2.resize(roi, (img_size, img_size))
-            normalized = resized / 255.0
-            reshaped = normalized.reshape(1, img_size, img_size, 3)
-
-            pred = model.predict(reshaped)
+            pred = classifier.predict(classifier.preprocess(resized[np.newaxis]))
             class_id = np.argmax(pred)
             confidence = np.max(pred)
-            letter = label_map[class_id]
+            letter = classifier.label(class_id)
 
             prediction_buffer.append(letter)
 
@@ -1,14 +1,16 @@
 # screens/admin_dashboard.py
 
 import os
-import json
 import webbrowser
+from functools import lru_cache
 
+from kivy.clock import Clock
 from kivy.core.text import LabelBase
 from kivy.graphics import Color, RoundedRectangle
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.gridlayout import GridLayout
-from kivy.uix.scrollview import ScrollView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
 from kivy.uix.button import ButtonBehavior
 from kivy.uix.image import Image as KivyImage
 from kivy.uix.label import Label
@@ -21,14 +23,25 @@ from kivy.uix.screenmanager import Screen
 import arabic_reshaper
 from bidi.algorithm import get_display
 
+from services.credentials import hash_password, is_admin
+from services.icons import icon
+from services.search_index import SearchIndex
+from services.storage import get_storage
+from services.thumbnails import make_thumbnail
+
 # ─── Register Arabic font ────────────────────────────────────────────────────
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 FONT_PATH = os.path.join(BASE_DIR, "..", "fonts", "Amiri-Regular.ttf")
 if os.path.isfile(FONT_PATH):
     LabelBase.register(name="Amiri", fn_regular=FONT_PATH)
 
+# Wait this long after the last keystroke before searching
+SEARCH_DEBOUNCE = 0.15
+
+
+@lru_cache(maxsize=4096)
 def rtl(text: str) -> str:
-    """Reshape & reorder Arabic text for correct display."""
+    """Reshape & reorder Arabic text for correct display (memoized: rows repeat)."""
     return get_display(arabic_reshaper.reshape(text))
 
 
@@ -113,6 +126,114 @@ class IconTextButton(ButtonBehavior, BoxLayout):
         self.add_widget(self.label)
 
 
+# ─── List rows (RecycleView) ─────────────────────────────────────────────────
+# The admin lists are RecycleViews: only rows on screen exist as widgets, and
+# they are re-bound to new data as the list scrolls or the search changes.
+# Each row builds its children once; refresh_view_attrs() just swaps values.
+def _short(text: str, max_words: int = 2) -> str:
+    words = text.split()
+    return " ".join(words[:max_words]).rstrip() + ("..." if len(words) > max_words else "")
+
+
+def _row_icon(source: str) -> KivyImage:
+    icon = KivyImage(source=source, size_hint=(None, None), size=(32, 32), allow_stretch=True)
+    icon.pos_hint = {"center_y": 0.5}
+    return icon
+
+
+def _row_label(size_x, font_size=22, bold=True, color=(0.1, 0.1, 0.1, 1), halign="center") -> Label:
+    lbl = Label(
+        font_name="Amiri",
+        font_size=font_size,
+        bold=bold,
+        color=color,
+        size_hint=(size_x, 1),
+        halign=halign,
+        valign="middle"
+    )
+    lbl.bind(size=lbl.setter("text_size"))
+    return lbl
+
+
+class _ListRow(RecycleDataViewBehavior, BoxLayout):
+    """
+    Icon, labels, then edit / delete icons that call back with data["key"].
+    Subclasses add their labels in build_labels() and set them from a data
+    row in fill(data).
+    """
+    icon_source = ""
+
+    def __init__(self, **kwargs):
+        super().__init__(orientation="horizontal", spacing=12, padding=(12, 0), **kwargs)
+        self.key = None
+        self.on_edit = None
+        self.on_delete = None
+        self.add_widget(_row_icon(self.icon_source))
+        self.build_labels()
+        self.btn_edit = _row_icon(icon("pencil"))
+        self.btn_edit.bind(on_touch_down=lambda inst, touch: self._tap(inst, touch, self.on_edit))
+        self.add_widget(self.btn_edit)
+        self.btn_del = _row_icon(icon("trash"))
+        self.btn_del.bind(on_touch_down=lambda inst, touch: self._tap(inst, touch, self.on_delete))
+        self.add_widget(self.btn_del)
+
+    def _tap(self, widget, touch, callback):
+        if callback is not None and widget.collide_point(*touch.pos):
+            callback(self.key)
+
+    def refresh_view_attrs(self, rv, index, data):
+        self.key = data["key"]
+        self.on_edit = data["on_edit"]
+        self.on_delete = data["on_delete"]
+        self.fill(data)
+
+
+class UserRow(_ListRow):
+    icon_source = icon("users-alt")
+
+    def build_labels(self):
+        self.lbl_un = _row_label(0.30)
+        self.lbl_role = _row_label(0.30)
+        self.add_widget(self.lbl_un)
+        self.add_widget(self.lbl_role)
+
+    def fill(self, data):
+        self.lbl_un.text = data["key"]
+        self.lbl_role.text = rtl("مشرف") if data["admin"] else rtl("مستخدم")
+
+
+class WordRow(_ListRow):
+    icon_source = icon("game")
+
+    def build_labels(self):
+        self.lbl_word = _row_label(0.35)
+        self.lbl_img = _row_label(0.40, font_size=20, bold=False, color=(0.2, 0.2, 0.2, 1))
+        self.add_widget(self.lbl_word)
+        self.add_widget(self.lbl_img)
+
+    def fill(self, data):
+        self.lbl_word.text = rtl(data["key"])
+        self.lbl_img.text = rtl(os.path.basename(data["image"]))
+
+
+class AdRow(_ListRow):
+    icon_source = icon("ad-paid")
+
+    def build_labels(self):
+        self.lbl_title = _row_label(0.18, halign="left")
+        self.lbl_det = _row_label(0.40, font_size=20, bold=False, color=(0.2, 0.2, 0.2, 1), halign="left")
+        self.lbl_img = _row_label(0.22, font_size=20, bold=False, color=(0.2, 0.2, 0.2, 1))
+        self.add_widget(self.lbl_title)
+        self.add_widget(self.lbl_det)
+        self.add_widget(self.lbl_img)
+
+    def fill(self, data):
+        self.lbl_title.text = rtl(_short(data["title"]))
+        self.lbl_det.text = rtl(_short(data["details"].replace("\n", " ")))
+        self.lbl_img.text = rtl(os.path.basename(data["image"]))
+
+
+
 class DashboardScreen(Screen):
     """
     Admin Dashboard: manage Users, Words, and Ads JSON files.
@@ -120,10 +241,8 @@ class DashboardScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        # Paths to JSON files
-        self.users_file = os.path.join(BASE_DIR, "..", "users.json")
-        self.words_file = os.path.join(BASE_DIR, "..", "words.json")
-        self.ads_file   = os.path.join(BASE_DIR, "..", "ads.json")
+        # Users, words and ads all go through the storage layer
+        self.storage = get_storage()
 
         # ─── Root Layout: (sidebar | content) ───────────────────────────────
         self.root_layout = BoxLayout(orientation="horizontal", spacing=0)
@@ -144,7 +263,7 @@ class DashboardScreen(Screen):
 
         # 1) Admin avatar
         boss_icon = KivyImage(
-            source="assets/icons/boss.png",
+            source=icon("boss"),
             size_hint=(None, None),
             size=(64, 64),
             allow_stretch=True
@@ -153,15 +272,15 @@ class DashboardScreen(Screen):
         self.sidebar.add_widget(boss_icon)
 
         # 2) Navigation buttons
-        self.btn_users = IconTextButton(icon="assets/icons/users-alt.png", text="المستخدمون")
+        self.btn_users = IconTextButton(icon=icon("users-alt"), text="المستخدمون")
         self.btn_users.bind(on_release=lambda inst: self.switch_section("users"))
         self.sidebar.add_widget(self.btn_users)
 
-        self.btn_words = IconTextButton(icon="assets/icons/game.png", text="الكلمات")
+        self.btn_words = IconTextButton(icon=icon("game"), text="الكلمات")
         self.btn_words.bind(on_release=lambda inst: self.switch_section("words"))
         self.sidebar.add_widget(self.btn_words)
 
-        self.btn_ads = IconTextButton(icon="assets/icons/ad-paid.png", text="الإعلانات")
+        self.btn_ads = IconTextButton(icon=icon("ad-paid"), text="الإعلانات")
         self.btn_ads.bind(on_release=lambda inst: self.switch_section("ads"))
         self.sidebar.add_widget(self.btn_ads)
 
@@ -228,7 +347,7 @@ class DashboardScreen(Screen):
             padding=(16, 12),
         )
         search_icon = KivyImage(
-            source="assets/icons/search.png",
+            source=icon("search"),
             size_hint=(None, None),
             size=(36, 36),
             allow_stretch=True
@@ -270,21 +389,27 @@ class DashboardScreen(Screen):
         self.content_area.bind(size=lambda w, *_: setattr(self._sep_line, "size", (w.width, 2)))
         self.content_area.bind(pos=lambda w, *_: setattr(self._sep_line, "pos", (w.x, w.y + w.height - 160)))
 
-        # Scrollable Grid for listing rows
-        self.scrollview = ScrollView(size_hint=(1, 1))
-        self.list_grid = GridLayout(
-            cols=1,
+        # Column header (rebuilt per section) above a recycled list of rows
+        self.list_header = BoxLayout(orientation="vertical", size_hint_y=None, height=64)
+        self.content_area.add_widget(self.list_header)
+        self.list_view = RecycleView(size_hint=(1, 1))
+        self.list_layout = RecycleBoxLayout(
+            orientation="vertical",
             spacing=12,
             padding=(0, 0, 0, 12),
+            default_size=(None, 64),
+            default_size_hint=(1, None),
             size_hint_y=None
         )
-        self.list_grid.bind(minimum_height=self.list_grid.setter("height"))
-        self.scrollview.add_widget(self.list_grid)
-        self.content_area.add_widget(self.scrollview)
+        self.list_layout.bind(minimum_height=self.list_layout.setter("height"))
+        self.list_view.add_widget(self.list_layout)
+        self.content_area.add_widget(self.list_view)
 
-        # Track active section & bind search
+        # Track active section & bind search (debounced, see refresh_list)
         self.active_section = "users"
-        self.search_input.bind(text=lambda inst, val: self.refresh_list())
+        self._indexes = {}   # section → (storage version, rows, SearchIndex)
+        self._search_trigger = Clock.create_trigger(lambda dt: self.refresh_list(), SEARCH_DEBOUNCE)
+        self.search_input.bind(text=lambda inst, val: self._search_trigger())
 
         # Initially load “users” section
         self.switch_section("users")
@@ -332,6 +457,21 @@ class DashboardScreen(Screen):
             self.header_label.text = rtl("لوحة التحكم – إدارة الإعلانات")
             self.add_btn.text = rtl("+ إضافة إعلان جديد")
 
+        # Header and row class change with the section; searching only swaps data
+        if section == "users":
+            columns, viewclass, row_height = ["", rtl("اسم المستخدم"), rtl("الدور"), "", ""], UserRow, 64
+        elif section == "words":
+            columns, viewclass, row_height = ["", rtl("الكلمة"), rtl("الصورة"), "", ""], WordRow, 64
+        else:
+            columns, viewclass, row_height = (
+                ["", rtl("عنوان الإعلان"), rtl("التفاصيل"), rtl("الصورة"), "", ""], AdRow, 72
+            )
+        self.list_header.clear_widgets()
+        self.list_header.add_widget(self._make_list_header(columns))
+        self.list_view.data = []
+        self.list_layout.default_size = (None, row_height)
+        self.list_view.viewclass = viewclass
+
         # Reset search & reload
         self.search_input.original_text = ""
         self.search_input.text = ""
@@ -339,15 +479,26 @@ class DashboardScreen(Screen):
 
 
     def refresh_list(self):
-        self.list_grid.clear_widgets()
-        query = self.search_input.original_text.strip().lower()
-
-        if self.active_section == "users":
-            self._load_users(query)
-        elif self.active_section == "words":
-            self._load_words(query)
-        else:
-            self._load_ads(query)
+        self._search_trigger.cancel()
+        rows, index = self._section_index()
+        query = self.search_input.original_text.strip()
+        self.list_view.data = [rows[i] for i in index.search(query)]
+
+
+    def _section_index(self):
+        """Row data + search index for the active section, rebuilt only when its data changes."""
+        section = self.active_section
+        version = self.storage.version(section)
+        cached = self._indexes.get(section)
+        if cached is None or cached[0] != version:
+            if section == "users":
+                rows = self._load_users()
+            elif section == "words":
+                rows = self._load_words()
+            else:
+                rows = self._load_ads()
+            cached = self._indexes[section] = (version, rows, SearchIndex(r["search"] for r in rows))
+        return cached[1], cached[2]
 
 
     def open_add_popup(self):
@@ -356,7 +507,7 @@ class DashboardScreen(Screen):
         elif self.active_section == "words":
             self._open_word_popup(editing=False, word_name="")
         else:
-            self._open_ad_popup(editing=False, ad_index=None)
+            self._open_ad_popup(editing=False)
 
 
     # ─── UTILITY: CREATE HEADER ROW ────────────────────────────────────────────
@@ -380,95 +531,29 @@ class DashboardScreen(Screen):
 
 
     # ─── USERS SECTION ────────────────────────────────────────────────────────
-    def _load_users(self, query=""):
+    def _load_users(self):
         try:
-            with open(self.users_file, "r", encoding="utf-8") as f:
-                users_data = json.load(f)
+            users_data = self.storage.list_users()
         except Exception:
-            users_data = {}
+            users_data = []
 
-        header = self._make_list_header(["", rtl("اسم المستخدم"), rtl("كلمة المرور"), "", ""])
-        self.list_grid.add_widget(header)
+        return [
+            {
+                "key": uname,
+                "search": uname,
+                "admin": is_admin(pdata),
+                "on_edit": self._on_user_edit,
+                "on_delete": self._on_user_delete,
+            }
+            for uname, pdata in users_data
+        ]
 
-        for uname, pdata in users_data.items():
-            if query and query not in uname.lower():
-                continue
 
-            pwd = pdata.get("password", "")
-            row = BoxLayout(orientation="horizontal", size_hint_y=None, height=64, spacing=12, padding=(12, 0))
+    def _on_user_edit(self, username):
+        self._open_user_popup(editing=True, username=username)
 
-            # User icon
-            icon_user = KivyImage(
-                source="assets/icons/users-alt.png",
-                size_hint=(None, None),
-                size=(32, 32),
-                allow_stretch=True
-            )
-            icon_user.pos_hint = {"center_y": 0.5}
-            row.add_widget(icon_user)
-
-            # Username
-            lbl_un = Label(
-                text=uname,
-                font_name="Amiri",
-                font_size=22,
-                bold=True,
-                color=(0.1, 0.1, 0.1, 1),
-                size_hint=(0.30, 1),
-                halign="center",
-                valign="middle"
-            )
-            lbl_un.bind(size=lbl_un.setter("text_size"))
-            row.add_widget(lbl_un)
-
-            # Password
-            lbl_pw = Label(
-                text=pwd,
-                font_name="Amiri",
-                font_size=22,
-                bold=True,
-                color=(0.1, 0.1, 0.1, 1),
-                size_hint=(0.30, 1),
-                halign="center",
-                valign="middle"
-            )
-            lbl_pw.bind(size=lbl_pw.setter("text_size"))
-            row.add_widget(lbl_pw)
-
-            # Edit icon
-            btn_edit = KivyImage(
-                source="assets/icons/pencil.png",
-                size_hint=(None, None),
-                size=(32, 32),
-                allow_stretch=True
-            )
-            btn_edit.pos_hint = {"center_y": 0.5}
-            btn_edit.bind(on_touch_down=lambda inst, touch, u=uname: self._on_user_edit(inst, touch, u))
-            row.add_widget(btn_edit)
-
-            # Delete icon
-            btn_del = KivyImage(
-                source="assets/icons/trash.png",
-                size_hint=(None, None),
-                size=(32, 32),
-                allow_stretch=True
-            )
-            btn_del.pos_hint = {"center_y": 0.5}
-            btn_del.bind(on_touch_down=lambda inst, touch, u=uname: self._on_user_delete(inst, touch, u))
-            row.add_widget(btn_del)
-
-            self.list_grid.add_widget(row)
-
-
-    def _on_user_edit(self, widget, touch, username):
-        if widget.collide_point(*touch.pos):
-            self._open_user_popup(editing=True, username=username)
-
-
-    def _on_user_delete(self, widget, touch, username):
-        if not widget.collide_point(*touch.pos):
-            return
 
+    def _on_user_delete(self, username):
         content = BoxLayout(orientation="vertical", padding=20, spacing=20)
         lbl = Label(
             text=rtl(f"هل أنت متأكد أنك تريد حذف المستخدم '{username}'؟"),
@@ -519,12 +604,7 @@ class DashboardScreen(Screen):
 
         def confirm_delete(inst):
             try:
-                with open(self.users_file, "r+", encoding="utf-8") as f:
-                    data = json.load(f)
-                    data.pop(username, None)
-                    f.seek(0)
-                    f.truncate()
-                    json.dump(data, f, ensure_ascii=False, indent=2)
+                self.storage.delete_user(username)
             except Exception:
                 pass
             popup.dismiss()
@@ -583,13 +663,9 @@ class DashboardScreen(Screen):
         )
 
         if editing:
-            try:
-                with open(self.users_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    inp_pass.original_text = data.get(username, {}).get("password", "")
-                    inp_pass.text = rtl(inp_pass.original_text)
-            except Exception:
-                inp_pass.text = ""
+            # Only the hash is stored; an empty field keeps the current password
+            inp_user.original_text = username
+            inp_pass.hint_text = rtl("كلمة مرور جديدة (اتركها فارغة للإبقاء عليها)")
 
         box.add_widget(inp_user)
         box.add_widget(inp_pass)
@@ -637,17 +713,14 @@ class DashboardScreen(Screen):
         def save_user(inst):
             new_uname = inp_user.original_text.strip()
             new_pwd = inp_pass.original_text.strip()
-            if not new_uname or not new_pwd:
+            if not new_uname or not (new_pwd or editing):
                 return
             try:
-                with open(self.users_file, "r+", encoding="utf-8") as f:
-                    data = json.load(f)
-                    if editing and username != new_uname:
-                        data.pop(username, None)
-                    data[new_uname] = {"password": new_pwd}
-                    f.seek(0)
-                    f.truncate()
-                    json.dump(data, f, ensure_ascii=False, indent=2)
+                record = dict(self.storage.get_user(username) or {}) if editing else {}
+                if new_pwd:
+                    record["password"] = hash_password(new_pwd)
+                self.storage.save_user(new_uname, record,
+                                       rename_from=username if editing else None)
             except Exception:
                 pass
             popup.dismiss()
@@ -659,96 +732,29 @@ class DashboardScreen(Screen):
 
 
     # ─── WORDS SECTION ────────────────────────────────────────────────────────
-    def _load_words(self, query=""):
+    def _load_words(self):
         try:
-            with open(self.words_file, "r", encoding="utf-8") as f:
-                words_data = json.load(f)
+            words_data = self.storage.list_words()
         except Exception:
             words_data = []
 
-        header = self._make_list_header(["", rtl("الكلمة"), rtl("الصورة"), "", ""])
-        self.list_grid.add_widget(header)
-
-        for item in words_data:
-            wtext = item.get("word", "")
-            wimg = item.get("image", "")
-            if query and query not in wtext.lower():
-                continue
-
-            row = BoxLayout(
-                orientation="horizontal",
-                size_hint_y=None,
-                height=64,
-                spacing=12,
-                padding=(12, 0)
-            )
+        return [
+            {
+                "key": item.get("word", ""),
+                "search": item.get("word", ""),
+                "image": item.get("image", ""),
+                "on_edit": self._on_word_edit,
+                "on_delete": self._on_word_delete,
+            }
+            for item in words_data
+        ]
 
-            icon_word = KivyImage(
-                source="assets/icons/game.png",
-                size_hint=(None, None),
-                size=(32, 32),
-                allow_stretch=True
-            )
-            icon_word.pos_hint = {"center_y": 0.5}
-            row.add_widget(icon_word)
 
-            lbl_word = Label(
-                text=rtl(wtext),
-                font_name="Amiri",
-                font_size=22,
-                bold=True,
-                color=(0.1, 0.1, 0.1, 1),
-                size_hint=(0.35, 1),
-                halign="center",
-                valign="middle"
-            )
-            lbl_word.bind(size=lbl_word.setter("text_size"))
-            row.add_widget(lbl_word)
-
-            lbl_img = Label(
-                text=rtl(os.path.basename(wimg)),
-                font_name="Amiri",
-                font_size=20,
-                color=(0.2, 0.2, 0.2, 1),
-                size_hint=(0.40, 1),
-                halign="center",
-                valign="middle"
-            )
-            lbl_img.bind(size=lbl_img.setter("text_size"))
-            row.add_widget(lbl_img)
-
-            btn_edit = KivyImage(
-                source="assets/icons/pencil.png",
-                size_hint=(None, None),
-                size=(32, 32),
-                allow_stretch=True
-            )
-            btn_edit.pos_hint = {"center_y": 0.5}
-            btn_edit.bind(on_touch_down=lambda inst, touch, wn=wtext: self._on_word_edit(inst, touch, wn))
-            row.add_widget(btn_edit)
-
-            btn_del = KivyImage(
-                source="assets/icons/trash.png",
-                size_hint=(None, None),
-                size=(32, 32),
-                allow_stretch=True
-            )
-            btn_del.pos_hint = {"center_y": 0.5}
-            btn_del.bind(on_touch_down=lambda inst, touch, wn=wtext: self._on_word_delete(inst, touch, wn))
-            row.add_widget(btn_del)
-
-            self.list_grid.add_widget(row)
+    def _on_word_edit(self, word_name):
+        self._open_word_popup(editing=True, word_name=word_name)
 
 
-    def _on_word_edit(self, widget, touch, word_name):
-        if widget.collide_point(*touch.pos):
-            self._open_word_popup(editing=True, word_name=word_name)
-
-
-    def _on_word_delete(self, widget, touch, word_name):
-        if not widget.collide_point(*touch.pos):
-            return
-
+    def _on_word_delete(self, word_name):
         content = BoxLayout(orientation="vertical", padding=20, spacing=20)
         lbl = Label(
             text=rtl(f"هل أنت متأكد أنك تريد حذف الكلمة '{word_name}'؟"),
@@ -799,12 +805,7 @@ class DashboardScreen(Screen):
 
         def confirm_delete(inst):
             try:
-                with open(self.words_file, "r+", encoding="utf-8") as f:
-                    arr = json.load(f)
-                    arr = [it for it in arr if it.get("word") != word_name]
-                    f.seek(0)
-                    f.truncate()
-                    json.dump(arr, f, ensure_ascii=False, indent=2)
+                self.storage.delete_word(word_name)
             except Exception:
                 pass
             popup.dismiss()
@@ -864,15 +865,12 @@ class DashboardScreen(Screen):
 
         if editing:
             try:
-                with open(self.words_file, "r", encoding="utf-8") as f:
-                    arr = json.load(f)
-                    for it in arr:
-                        if it.get("word") == word_name:
-                            inp_word.original_text = it.get("word", "")
-                            inp_word.text = rtl(inp_word.original_text)
-                            inp_img.original_text = it.get("image", "")
-                            inp_img.text = rtl(inp_img.original_text)
-                            break
+                it = self.storage.get_word(word_name)
+                if it:
+                    inp_word.original_text = it.get("word", "")
+                    inp_word.text = rtl(inp_word.original_text)
+                    inp_img.original_text = it.get("image", "")
+                    inp_img.text = rtl(inp_img.original_text)
             except Exception:
                 pass
 
@@ -958,19 +956,8 @@ class DashboardScreen(Screen):
             if not new_wtext or not new_wimg:
                 return
             try:
-                with open(self.words_file, "r+", encoding="utf-8") as f:
-                    arr = json.load(f)
-                    if editing:
-                        for it in arr:
-                            if it.get("word") == word_name:
-                                it["word"] = new_wtext
-                                it["image"] = new_wimg
-                                break
-                    else:
-                        arr.append({"word": new_wtext, "image": new_wimg})
-                    f.seek(0)
-                    f.truncate()
-                    json.dump(arr, f, ensure_ascii=False, indent=2)
+                self.storage.save_word({"word": new_wtext, "image": new_wimg},
+                                       original=word_name if editing else None)
             except Exception:
                 pass
             popup.dismiss()
@@ -982,118 +969,31 @@ class DashboardScreen(Screen):
 
 
     # ─── ADS SECTION ─────────────────────────────────────────────────────────
-    def _load_ads(self, query=""):
+    def _load_ads(self):
         try:
-            with open(self.ads_file, "r", encoding="utf-8") as f:
-                ads_data = json.load(f)
+            ads_data = self.storage.list_ads()
         except Exception:
             ads_data = []
 
-        header = self._make_list_header(
-            ["", rtl("عنوان الإعلان"), rtl("التفاصيل"), rtl("الصورة"), "", ""]
-        )
-        self.list_grid.add_widget(header)
-
-        for idx, item in enumerate(ads_data):
-            full_title   = item.get("title", "")
-            full_details = item.get("details", "").replace("\n", " ")
-            img_path     = item.get("image", "")
-
-            if query and query not in full_title.lower():
-                continue
-
-            max_words = 2
-            title_words = full_title.split()
-            title_short = " ".join(title_words[:max_words]).rstrip() + ("..." if len(title_words) > max_words else "")
-            details_words = full_details.split()
-            details_short = " ".join(details_words[:max_words]).rstrip() + ("..." if len(details_words) > max_words else "")
-
-            row = BoxLayout(
-                orientation="horizontal",
-                size_hint_y=None,
-                height=72,
-                spacing=12,
-                padding=(12, 0)
-            )
-
-            icon_ad = KivyImage(
-                source="assets/icons/ad-paid.png",
-                size_hint=(None, None),
-                size=(32, 32),
-                allow_stretch=True
-            )
-            icon_ad.pos_hint = {"center_y": 0.5}
-            row.add_widget(icon_ad)
-
-            lbl_title = Label(
-                text=rtl(title_short),
-                font_name="Amiri",
-                font_size=22,
-                bold=True,
-                color=(0.1, 0.1, 0.1, 1),
-                size_hint=(0.18, 1),
-                halign="left",
-                valign="middle"
-            )
-            lbl_title.bind(size=lbl_title.setter("text_size"))
-            row.add_widget(lbl_title)
-
-            lbl_det = Label(
-                text=rtl(details_short),
-                font_name="Amiri",
-                font_size=20,
-                color=(0.2, 0.2, 0.2, 1),
-                size_hint=(0.40, 1),
-                halign="left",
-                valign="middle"
-            )
-            lbl_det.bind(size=lbl_det.setter("text_size"))
-            row.add_widget(lbl_det)
-
-            lbl_img = Label(
-                text=rtl(os.path.basename(img_path)),
-                font_name="Amiri",
-                font_size=20,
-                color=(0.2, 0.2, 0.2, 1),
-                size_hint=(0.22, 1),
-                halign="center",
-                valign="middle"
-            )
-            lbl_img.bind(size=lbl_img.setter("text_size"))
-            row.add_widget(lbl_img)
-
-            btn_edit = KivyImage(
-                source="assets/icons/pencil.png",
-                size_hint=(None, None),
-                size=(32, 32),
-                allow_stretch=True
-            )
-            btn_edit.pos_hint = {"center_y": 0.5}
-            btn_edit.bind(on_touch_down=lambda inst, touch, i=idx: self._on_ad_edit(inst, touch, i))
-            row.add_widget(btn_edit)
-
-            btn_del = KivyImage(
-                source="assets/icons/trash.png",
-                size_hint=(None, None),
-                size=(32, 32),
-                allow_stretch=True
-            )
-            btn_del.pos_hint = {"center_y": 0.5}
-            btn_del.bind(on_touch_down=lambda inst, touch, i=idx: self._on_ad_delete(inst, touch, i))
-            row.add_widget(btn_del)
-
-            self.list_grid.add_widget(row)
+        return [
+            {
+                "key": item["id"],
+                "search": item.get("title", ""),
+                "title": item.get("title", ""),
+                "details": item.get("details", ""),
+                "image": item.get("image", ""),
+                "on_edit": self._on_ad_edit,
+                "on_delete": self._on_ad_delete,
+            }
+            for item in ads_data
+        ]
 
 
-    def _on_ad_edit(self, widget, touch, ad_index):
-        if widget.collide_point(*touch.pos):
-            self._open_ad_popup(editing=True, ad_index=ad_index)
+    def _on_ad_edit(self, ad_id):
+        self._open_ad_popup(editing=True, ad_id=ad_id)
 
 
-    def _on_ad_delete(self, widget, touch, ad_index):
-        if not widget.collide_point(*touch.pos):
-            return
-
+    def _on_ad_delete(self, ad_id):
         content = BoxLayout(orientation="vertical", padding=20, spacing=20)
         lbl = Label(
             text=rtl("هل أنت متأكد أنك تريد حذف هذا الإعلان؟"),
@@ -1144,13 +1044,7 @@ class DashboardScreen(Screen):
 
         def confirm_delete(inst):
             try:
-                with open(self.ads_file, "r+", encoding="utf-8") as f:
-                    arr = json.load(f)
-                    if 0 <= ad_index < len(arr):
-                        arr.pop(ad_index)
-                        f.seek(0)
-                        f.truncate()
-                        json.dump(arr, f, ensure_ascii=False, indent=2)
+                self.storage.delete_ad(ad_id)
             except Exception:
                 pass
             popup.dismiss()
@@ -1161,7 +1055,7 @@ class DashboardScreen(Screen):
         popup.open()
 
 
-    def _open_ad_popup(self, editing=False, ad_index=None):
+    def _open_ad_popup(self, editing=False, ad_id=None):
         title_txt = rtl("تعديل إعلان") if editing else rtl("إضافة إعلان جديد")
         popup = ModalView(size_hint=(0.9, 0.8), auto_dismiss=False)
 
@@ -1224,20 +1118,18 @@ class DashboardScreen(Screen):
             height=56
         )
 
-        if editing and ad_index is not None:
+        if editing and ad_id is not None:
             try:
-                with open(self.ads_file, "r", encoding="utf-8") as f:
-                    arr = json.load(f)
-                    if 0 <= ad_index < len(arr):
-                        item = arr[ad_index]
-                        inp_title.original_text = item.get("title", "")
-                        inp_title.text = rtl(inp_title.original_text)
-                        inp_details.original_text = item.get("details", "")
-                        inp_details.text = rtl(inp_details.original_text)
-                        inp_link.original_text = item.get("link", "")
-                        inp_link.text = rtl(inp_link.original_text)
-                        inp_img.original_text = item.get("image", "")
-                        inp_img.text = rtl(inp_img.original_text)
+                item = self.storage.get_ad(ad_id)
+                if item:
+                    inp_title.original_text = item.get("title", "")
+                    inp_title.text = rtl(inp_title.original_text)
+                    inp_details.original_text = item.get("details", "")
+                    inp_details.text = rtl(inp_details.original_text)
+                    inp_link.original_text = item.get("link", "")
+                    inp_link.text = rtl(inp_link.original_text)
+                    inp_img.original_text = item.get("image", "")
+                    inp_img.text = rtl(inp_img.original_text)
             except Exception:
                 pass
 
@@ -1327,27 +1219,16 @@ class DashboardScreen(Screen):
             if not (new_title and new_details and new_link and new_img):
                 return
             try:
-                with open(self.ads_file, "r+", encoding="utf-8") as f:
-                    arr = json.load(f)
-                    if editing and ad_index is not None and 0 <= ad_index < len(arr):
-                        arr[ad_index] = {
-                            "image": new_img,
-                            "title": new_title,
-                            "details": new_details,
-                            "link": new_link
-                        }
-                    else:
-                        arr.append({
-                            "image": new_img,
-                            "title": new_title,
-                            "details": new_details,
-                            "link": new_link
-                        })
-                    f.seek(0)
-                    f.truncate()
-                    json.dump(arr, f, ensure_ascii=False, indent=2)
+                self.storage.save_ad({
+                    "image": new_img,
+                    "title": new_title,
+                    "details": new_details,
+                    "link": new_link
+                }, ad_id=ad_id if editing else None)
             except Exception:
                 pass
+            # Carousel-size copy now, so the home screen never decodes the original
+            make_thumbnail(new_img)
             popup.dismiss()
             self.refresh_list()
 
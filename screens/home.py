@@ -1,4 +1,3 @@
-import json
 import os
 import random
 import tempfile
@@ -25,6 +24,10 @@ from kivy.graphics.texture import Texture
 import arabic_reshaper
 from bidi.algorithm import get_display
 
+from services.icons import icon
+from services.storage import AD_FIELDS, get_storage
+from services.thumbnails import load_texture
+
 # Register Arabic font & white background
 LabelBase.register(name="Amiri", fn_regular="fonts/Amiri-Regular.ttf")
 Window.clearcolor = (1, 1, 1, 1)
@@ -36,20 +39,67 @@ class IconButton(ButtonBehavior, KivyImage):
     pass
 
 class HomeScreen(Screen):
+    """
+    Built once. Each visit only updates what can change: the greeting, the
+    daily sign and (when ads were edited) the carousel slides. The carousel
+    timer runs only while the screen is shown.
+    """
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # tighten spacing so sections sit closer
         self.layout = BoxLayout(orientation='vertical', spacing=12, padding=24)
         self.add_widget(self.layout)
-        self.daily_sign = self.load_random_daily_sign()
+        self.daily_sign = {"word": "", "image": ""}
+        self._username = None
+        self._ads_version = object()   # never equal → first visit loads the ads
+        self._carousel_event = None
+        self._build()
 
     def on_pre_enter(self):
+        username = getattr(App.get_running_app(), 'current_user', 'User')
+        if username != self._username:
+            self._username = username
+            self.greeting.text = rtl(f"مرحباً، {username}")
+
         # pick a brand-new random sign (with its image) every time HomeScreen is shown
         self.daily_sign = self.load_random_daily_sign()
+        self.daily_img.source = os.path.join("datapics", self.daily_sign['image'])
+        self.daily_word.text = rtl(f"كلمة: {self.daily_sign['word']}")
 
-        self.layout.clear_widgets()
-        username = getattr(App.get_running_app(), 'current_user', 'User')
+        self._refresh_ads()
+
+    def on_enter(self):
+        if self._carousel_event is None and self.ad_carousel.slides:
+            self._carousel_event = Clock.schedule_interval(lambda dt: self.ad_carousel.load_next(), 5)
 
+    def on_leave(self):
+        if self._carousel_event is not None:
+            self._carousel_event.cancel()
+            self._carousel_event = None
+        daily_video = getattr(self, 'daily_video', None)
+        if daily_video is not None and daily_video.parent is not None:
+            daily_video.state = 'stop'
+            self.layout.remove_widget(daily_video)
+
+    def _refresh_ads(self):
+        try:
+            version = get_storage().version("ads")
+        except Exception:
+            version = None
+        # No version (lookup failed, or nothing recorded yet): always reload
+        if version is not None and version == self._ads_version:
+            return
+        self._ads_version = version
+        self.ad_carousel.clear_widgets()
+        for ad in self.load_ads_data():
+            self.ad_carousel.add_widget(self._make_ad_slide(ad))
+        # The carousel sits between the services row and the action row
+        if self.ad_carousel.slides and self.ad_carousel.parent is None:
+            self.layout.add_widget(self.ad_carousel, index=3)
+        elif not self.ad_carousel.slides and self.ad_carousel.parent is not None:
+            self.layout.remove_widget(self.ad_carousel)
+
+    def _build(self):
         # 1) Top bar with Logout
         top = BoxLayout(orientation='horizontal', size_hint_y=0.08, spacing=12)
         # Logout button
@@ -66,8 +116,7 @@ class HomeScreen(Screen):
         top.add_widget(logout_btn)
 
         # Greeting and profile image
-        greeting = Label(
-            text=rtl(f"مرحباً، {username}"),
+        greeting = self.greeting = Label(
             font_name="Amiri", font_size=28, bold=True,
             halign='right', valign='middle', color=(0.1,0.1,0.1,1)
         )
@@ -97,10 +146,8 @@ class HomeScreen(Screen):
             service_grid.add_widget(self.create_service_card(ico, lbl))
         scroll.add_widget(service_grid)
 
-        # 4) Ads carousel (35% weight)
-        ad_carousel = self.create_ad_carousel()
-        if ad_carousel:
-            ad_carousel.size_hint_y = 0.35
+        # 4) Ads carousel (35% weight); slides are filled in by _refresh_ads()
+        self.ad_carousel = Carousel(direction='right', loop=True, size_hint_y=0.35)
 
         # 5) Action row (10% weight)
         action_row = BoxLayout(orientation='horizontal', spacing=12, size_hint_y=0.10)
@@ -130,9 +177,7 @@ class HomeScreen(Screen):
 
         # left panel
         left = BoxLayout(orientation='horizontal', size_hint=(0.7,1), padding=14, spacing=14)
-        img_path = os.path.join("datapics", self.daily_sign['image'])
-        icon_img = KivyImage(
-            source=img_path,
+        icon_img = self.daily_img = KivyImage(
             size_hint=(0.3,1),
             allow_stretch=True
         )
@@ -145,8 +190,7 @@ class HomeScreen(Screen):
             halign='left', valign='middle'
         )
         t1.bind(size=t1.setter('text_size'))
-        t2 = Label(
-            text=rtl(f"كلمة: {self.daily_sign['word']}"),
+        t2 = self.daily_word = Label(
             font_name="Amiri", font_size=24, bold=True,
             color=(0.1,0.1,0.1,1),
             halign='left', valign='middle'
@@ -200,9 +244,9 @@ class HomeScreen(Screen):
         )
         msg.bind(size=msg.setter('text_size'))
         icons = [
-            ("assets/icons/email.png",    "mailto:slingoapp@gmail.com"),
-            ("assets/icons/whatsapp.png", "https://wa.me/213696321064"),
-            ("assets/icons/instagram.png","https://instagram.com/slingo_app")
+            (icon("email"),    "mailto:slingoapp@gmail.com"),
+            (icon("whatsapp"), "https://wa.me/213696321064"),
+            (icon("instagram"),"https://instagram.com/slingo_app")
         ]
         btn_row = BoxLayout(orientation='horizontal', spacing=14, size_hint=(1,0.5))
         for ico, link in icons:
@@ -229,8 +273,6 @@ class HomeScreen(Screen):
         self.layout.add_widget(top)
         self.layout.add_widget(lingo_banner)
         self.layout.add_widget(scroll)
-        if ad_carousel:
-            self.layout.add_widget(ad_carousel)
         self.layout.add_widget(action_row)
         self.layout.add_widget(daily_box)
         self.layout.add_widget(contact_bar)
@@ -241,8 +283,7 @@ class HomeScreen(Screen):
 
     def load_random_daily_sign(self):
         try:
-            with open("words.json", "r", encoding="utf-8") as f:
-                words = json.load(f)
+            words = get_storage().list_words()
         except:
             words = []
         return random.choice(words) if words else {"word":"", "image":""}
@@ -321,25 +362,23 @@ class HomeScreen(Screen):
 
     def load_ads_data(self):
         try:
-            with open("ads.json", "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return [ad for ad in data
-                    if all(k in ad for k in ("image","title","details","link"))]
+            return [ad for ad in get_storage().list_ads()
+                    if all(k in ad for k in AD_FIELDS)]
         except:
             return []
 
-    def create_ad_carousel(self):
-        ads = self.load_ads_data()
-        if not ads:
-            return None
-        carousel = Carousel(direction='right', loop=True)
-        for ad in ads:
-            img = KivyImage(source=ad["image"], allow_stretch=True)
-            img.ad_data = ad
-            img.bind(on_touch_down=self.show_ad_popup)
-            carousel.add_widget(img)
-        Clock.schedule_interval(lambda dt: carousel.load_next(), 5)
-        return carousel
+    def _make_ad_slide(self, ad):
+        img = self._ad_image(ad, allow_stretch=True)
+        img.ad_data = ad
+        img.bind(on_touch_down=self.show_ad_popup)
+        return img
+
+    def _ad_image(self, ad, **kwargs):
+        # Display-size thumbnail from the shared texture cache, never the original
+        texture = load_texture(ad["image"])
+        if texture is None:
+            return KivyImage(source=ad["image"], **kwargs)
+        return KivyImage(texture=texture, **kwargs)
 
     def show_ad_popup(self, widget, touch):
         if not widget.collide_point(*touch.pos):
@@ -353,7 +392,7 @@ class HomeScreen(Screen):
         box.bind(pos=lambda w,*a: setattr(box.bg,'pos',w.pos))
         box.bind(size=lambda w,*a: setattr(box.bg,'size',w.size))
 
-        ad_img = KivyImage(source=ad["image"], size_hint=(1,0.4), allow_stretch=True)
+        ad_img = self._ad_image(ad, size_hint=(1,0.4), allow_stretch=True)
         title = Label(
             text=rtl(ad["title"]),
             font_name="Amiri", font_size=28, bold=True,
@@ -14,20 +14,13 @@ from kivy.app import App
 
 import arabic_reshaper
 from bidi.algorithm import get_display
-import json
-import os
+
+from services.credentials import authenticate, is_admin
+from services.storage import get_storage
 
 LabelBase.register(name="Amiri", fn_regular="fonts/Amiri-Regular.ttf")
 Window.clearcolor = (1, 1, 1, 1)
 
-USERS_FILE = "users.json"
-
-def load_users():
-    if os.path.exists(USERS_FILE):
-        with open(USERS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
-
 def rtl(text):
     return get_display(arabic_reshaper.reshape(text))
 
@@ -158,7 +151,6 @@ class LoginScreen(Screen):
     def login(self, instance):
         uname = self.username.text_input.text.strip()
         pwd = self.password.text_input.text.strip()
-        users = load_users()
 
         self.username.text_input.hint_text = rtl("اسم المستخدم")
         self.username.text_input.hint_text_color = (0.5, 0.5, 0.5, 1)
@@ -174,18 +166,17 @@ class LoginScreen(Screen):
             self.password.text_input.hint_text = rtl("⚠️ أدخل كلمة المرور")
             self.password.text_input.hint_text_color = [1, 0, 0, 1]
             return
-        # 1) If admin credentials, go to Dashboard
-        if uname == "admin_ahlam" and pwd == "admin1234":
-            App.get_running_app().current_user = "admin_ahlam"
+        user = authenticate(get_storage(), uname, pwd)
+        if user is None:
+            self.warning_label.text = rtl("⚠️ اسم المستخدم أو كلمة المرور غير صحيحة")
+            return
+        App.get_running_app().current_user = uname
+        # Admin accounts go to the Dashboard
+        if is_admin(user):
             self.warning_label.text = ""
             self.manager.current = "admin_dashboard"
-            return
-
-        if uname in users and users[uname]["password"] == pwd:
-            App.get_running_app().current_user = uname
-            self.manager.current = "home"
         else:
-            self.warning_label.text = rtl("⚠️ اسم المستخدم أو كلمة المرور غير صحيحة")
+            self.manager.current = "home"
 
     def update_bg(self, *args):
         self.bg.size = self.size
@@ -1,6 +1,7 @@
 # screens/predictor.py
 
 import os
+import threading
 import time
 from collections import deque, Counter
 
@@ -26,7 +27,9 @@ from kivy.uix.modalview import ModalView
 from kivy.uix.screenmanager import Screen
 
 import mediapipe as mp
-from tensorflow.keras.models import load_model
+
+from services import model_registry
+from services.icons import icon
 
 # ─── Register Arabic font ──────────────────────────────────────────────────────
 LabelBase.register(name="Amiri", fn_regular="fonts/Amiri-Regular.ttf")
@@ -51,9 +54,12 @@ class PredictorScreen(Screen):
         super().__init__(**kwargs)
 
         # ─── Load ML model & Mediapipe setup ───────────────────────────────────
-        self.model = load_model("models/asl_model.h5")
-        self.label_map = np.load("models/label_map.npy", allow_pickle=True).item()
-        self.img_size = 128
+        # The classifier comes from the versioned registry (models/registry/);
+        # a newer active version is hot-swapped in while the screen is running.
+        self.classifier = model_registry.load_active()
+        self._registry_stamp = model_registry.active_stamp()
+        self._swap_thread = None
+        self.registry_event = None
 
         # Camera capture (live) and video capture (imported)
         self.cap = None
@@ -109,7 +115,7 @@ class PredictorScreen(Screen):
         # 2) “Back to Home” BUTTON
         # ─────────────────────────────────────────────────────────────────────
         self.back_btn = IconButton(
-            source="assets/icons/angle-double-left.png",
+            source=icon("angle-double-left"),
             size_hint=(None, None),
             size=(50, 50),
             allow_stretch=True,
@@ -168,7 +174,7 @@ class PredictorScreen(Screen):
         self.btn_language.bind(on_release=lambda *_: self._switch_to_language())
 
         self.btn_toggle = IconButton(
-            source="assets/icons/switch.png",
+            source=icon("switch"),
             size_hint=(None, None),
             size=(50, 50),
             allow_stretch=True,
@@ -303,7 +309,7 @@ class PredictorScreen(Screen):
 
         # Trash icon (larger) placed inside the card, top-left corner
         trash_btn = IconButton(
-            source="assets/icons/trash.png",
+            source=icon("trash"),
             size_hint=(None, None),
             size=(60, 60),                     # bigger icon
             pos_hint={"x": 0.02, "top": 0.95},  # inside top-left of the card
@@ -384,19 +390,19 @@ class PredictorScreen(Screen):
             return container
 
         camera_item = _create_nav_item(
-            icon_path="assets/icons/camera.png",
+            icon_path=icon("camera"),
             label_text=rtl("صورة"),
             callback=self.upload_image,
             is_predict=False,
         )
         predict_item = _create_nav_item(
-            icon_path="assets/icons/translate.png",
+            icon_path=icon("translate"),
             label_text=rtl("تعرُّف"),
             callback=self.restart_camera,
             is_predict=True,
         )
         video_item = _create_nav_item(
-            icon_path="assets/icons/video.png",
+            icon_path=icon("video"),
             label_text=rtl("فيديو"),
             callback=self.upload_video,
             is_predict=False,
@@ -444,8 +450,63 @@ class PredictorScreen(Screen):
         self.cap = cv2.VideoCapture(0)
         self.event = Clock.schedule_interval(self.update, 1.0 / 30.0)
 
+        # Watch the registry for a newly activated model
+        if not self.registry_event:
+            self.registry_event = Clock.schedule_interval(self._check_registry, 5.0)
+
     def on_leave(self):
         self.stop_camera()
+        if self.registry_event:
+            self.registry_event.cancel()
+            self.registry_event = None
+
+    # ─── Model hot-swap ──────────────────────────────────────────────────────
+    def _check_registry(self, dt):
+        """
+        Cheap poll (stat + listdir); only reloads when the registry changed.
+        The stamp is recorded once the active version is installed, so a swap
+        that was busy or failed is tried again on the next poll.
+        """
+        stamp = model_registry.active_stamp()
+        if stamp == self._registry_stamp:
+            return
+        version = model_registry.active_version()
+        if version and version != self.classifier.version:
+            self.hot_swap(version, stamp)
+        else:
+            self._registry_stamp = stamp
+
+    def hot_swap(self, version=None, stamp=None):
+        """
+        Load `version` (default: the active one) on a worker thread. Frames keep
+        using the current classifier until the new one is fully loaded and
+        verified; the swap itself happens on the Kivy thread between frames.
+        `stamp` is the registry stamp to record once it's installed.
+        """
+        if self._swap_thread and self._swap_thread.is_alive():
+            return
+        version = version or model_registry.active_version()
+        if not version:
+            return
+
+        def worker():
+            try:
+                loaded = model_registry.load_version(version)
+            except Exception as e:
+                print(f"⚠️ Model {version} not loaded: {e}")
+                return
+            Clock.schedule_once(lambda dt: self._install_classifier(loaded, stamp), 0)
+
+        self._swap_thread = threading.Thread(target=worker, daemon=True)
+        self._swap_thread.start()
+
+    def _install_classifier(self, loaded, stamp=None):
+        self.classifier = loaded
+        if stamp is not None:
+            self._registry_stamp = stamp
+        # Buffered letters may belong to the old label set
+        self.prediction_buffer.clear()
+        print(f"✅ Switched to model {loaded.version}")
 
     def stop_camera(self):
         # Release live camera
@@ -536,13 +597,12 @@ class PredictorScreen(Screen):
             roi = display_frame[y_min:y_max, x_min:x_max]
 
             if roi.size > 0:
-                resized = cv2.resize(roi, (self.img_size, self.img_size))
-                normalized = resized.astype("float32") / 255.0
-                reshaped = normalized.reshape(1, self.img_size, self.img_size, 3)
-                pred = self.model.predict(reshaped)
+                classifier = self.classifier
+                resized = cv2.resize(roi, (classifier.img_size, classifier.img_size))
+                pred = classifier.predict(classifier.preprocess(resized[np.newaxis]))
                 class_id = np.argmax(pred)
                 confidence = np.max(pred)
-                letter = self.label_map[class_id]
+                letter = classifier.label(class_id)
                 self.prediction_buffer.append(letter)
 
                 if (
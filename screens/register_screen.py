@@ -10,24 +10,13 @@ from kivy.core.window import Window
 from kivy.animation import Animation
 from kivy.core.text import LabelBase
 from kivy.app import App
-import json
-import os
+
+from services.credentials import hash_password
+from services.storage import get_storage
 
 LabelBase.register(name="Amiri", fn_regular="fonts/Amiri-Regular.ttf")
 Window.clearcolor = (1, 1, 1, 1)
 
-USERS_FILE = "users.json"
-
-def load_users():
-    if os.path.exists(USERS_FILE):
-        with open(USERS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
-
-def save_users(users):
-    with open(USERS_FILE, "w", encoding="utf-8") as f:
-        json.dump(users, f)
-
 def rtl(text):
     import arabic_reshaper
     from bidi.algorithm import get_display
@@ -127,20 +116,20 @@ class RegisterScreen(Screen):
         return layout
 
     def register(self, instance):
-        users = load_users()
+        storage = get_storage()
         uname = self.username.text_input.text.strip()
         pwd = self.password.text_input.text.strip()
         confirm_pwd = self.confirm_password.text_input.text.strip()
 
-        if uname in users:
+        if uname and storage.get_user(uname) is not None:
             self.message.text = rtl("❗ اسم المستخدم موجود مسبقًا")
         elif not uname or not pwd or not confirm_pwd:
             self.message.text = rtl("⚠️ يرجى ملء جميع الحقول")
         elif pwd != confirm_pwd:
             self.message.text = rtl("❌ كلمتا المرور غير متطابقتين")
+        elif not storage.create_user(uname, {"password": hash_password(pwd)}):
+            self.message.text = rtl("❗ اسم المستخدم موجود مسبقًا")
         else:
-            users[uname] = {"password": pwd}
-            save_users(users)
             App.get_running_app().current_user = uname
             self.manager.current = "home"
 
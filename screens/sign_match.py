@@ -1,7 +1,6 @@
 # screens/sign_match.py
 
 import os
-import json
 import random
 import tempfile
 import subprocess
@@ -25,6 +24,9 @@ from kivy.uix.screenmanager import Screen
 from kivy.uix.video import Video
 from kivy.uix.widget import Widget
 
+from services.icons import icon
+from services.storage import get_storage
+
 # ─── Register your Arabic font ────────────────────────────────────────────────
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 FONT_PATH = os.path.join(BASE_DIR, 'fonts', 'Amiri-Regular.ttf')
@@ -124,12 +126,10 @@ class SignMatchScreen(Screen):
             self.bg_rect = Rectangle(pos=self.pos, size=self.size)
         self.bind(pos=self._update_bg, size=self._update_bg)
 
-        # ─── Load words from JSON ───────────────────────────────────────────
+        # ─── Load words from storage ────────────────────────────────────────
         self.video_dir = 'datavideos'
         self.img_dir = 'datapics'
-        json_path = os.path.join(BASE_DIR, 'words.json')
-        with open(json_path, 'r', encoding='utf-8') as f:
-            self.words = json.load(f)
+        self.words = get_storage().list_words()
 
         # Prepare question data
         self.questions = self._generate_questions()
@@ -190,7 +190,7 @@ class SignMatchScreen(Screen):
         # 2) BACK ARROW BUTTON (under header)
         #
         self.back_btn = IconButton(
-            source="assets/icons/angle-double-left.png",
+            source=icon("angle-double-left"),
             size_hint=(None, None),
             size=(50, 50),
             allow_stretch=True,
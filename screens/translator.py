@@ -1,17 +1,13 @@
-import os
-import json
 import arabic_reshaper
 import cv2
 import numpy as np
 import pytesseract
+import threading
 from bidi.algorithm import get_display
 from datetime import datetime
-from io import BytesIO
-from pdf2image import convert_from_path
 
 from kivy.app import App
 from kivy.clock import Clock
-from kivy.core.image import Image as CoreImage
 from kivy.core.text import LabelBase
 from kivy.graphics import Color, RoundedRectangle, Rectangle
 from kivy.graphics.texture import Texture
@@ -25,6 +21,10 @@ from kivy.uix.image import Image as KivyImage
 from kivy.uix.label import Label
 from kivy.uix.modalview import ModalView
 from kivy.uix.popup import Popup
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.progressbar import ProgressBar
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.textinput import TextInput
 from kivy.uix.video import Video
@@ -34,29 +34,74 @@ from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.uix.widget import Widget
 from kivy.animation import Animation
 from kivy.utils import get_color_from_hex
+from kivy.logger import Logger
+
+from services.arabic_text import has_foreign, normalizer_for
+from services.clip_index import get_clip_index
+from services.document_ingest import DocumentIngest
+from services.icons import icon
+from services.ocr import OCRQueueFull, get_ocr_service
+from services.pdf_pages import PdfPageSource
+from services.playback import PlaybackScheduler
+from services.sentence_video import PAUSE_HOLD, SentenceRenderer
+from services.sign_lexicon import build_playlist, get_lexicon
+from services.storage import get_storage
 
 # ─── Register Arabic font & configure Tesseract ──────────────────────────────
 LabelBase.register(name="Amiri", fn_regular="fonts/Amiri-Regular.ttf")
 pytesseract.pytesseract.tesseract_cmd = r"C:\\Program Files\\Tesseract-OCR\\tesseract.exe"
 
+# Hold on the last sign between words (seconds, at 1× speed)
+WORD_PAUSE = 0.6
+# Video widgets kept open for upcoming clips (1 visible + N-1 warming)
+DECODER_POOL_SIZE = 4
+# Sentence clips: fade between signs (0 = hard cuts) and what a space becomes
+SENTENCE_CROSSFADE = 0.0
+SENTENCE_PAUSES = PAUSE_HOLD
+# Longest side of the image shown in the OCR region picker
+ROI_PREVIEW_MAX = 1200
+# Playback speeds the speed button cycles through (kept per user)
+PLAYBACK_SPEEDS = (0.5, 0.75, 1.0, 1.5)
+
 
 def rtl(text: str) -> str:
     """Reshape Arabic text for right-to-left display."""
     return get_display(arabic_reshaper.reshape(text))
 
 
-def clean_arabic_text(text: str) -> str:
-    """Remove any non-Arabic characters except spaces and newlines."""
-    if not isinstance(text, str):
-        return ""
-    return ''.join(c for c in text if 'ء' <= c <= 'ي' or c == ' ' or c == '\n')
-
-
 class IconButton(ButtonBehavior, KivyImage):
     """A tappable Image button (for nav and other icons)."""
     pass
 
 
+class PdfPageRow(RecycleDataViewBehavior, BoxLayout):
+    """One PDF page in the import viewer: lazily rendered thumbnail + pick button."""
+    def __init__(self, **kwargs):
+        super().__init__(orientation='vertical', spacing=6, **kwargs)
+        self.page = None
+        self.source = None
+        self.on_pick = None
+        self.image = KivyImage(size_hint_y=None, height=360)
+        self.button = Button(font_size=20, size_hint_y=None, height=64)
+        self.button.bind(on_release=lambda _: self.on_pick and self.on_pick(self.page))
+        self.add_widget(self.image)
+        self.add_widget(self.button)
+
+    def refresh_view_attrs(self, rv, index, data):
+        if self.source is not None and self.page is not None:
+            self.source.forget(self.page)
+        self.page = data['page']
+        self.source = data['source']
+        self.on_pick = data['on_pick']
+        self.button.font_name = data['font_name']
+        self.button.text = rtl(f"اختر نص الصفحة {self.page}")
+        self.image.texture = self.source.request(self.page, self._on_texture)
+
+    def _on_texture(self, page, texture):
+        if page == self.page:
+            self.image.texture = texture
+
+
 class ArabicInput(TextInput):
     """A TextInput subclass that preserves and reshapes Arabic as you type."""
     def __init__(self, **kwargs):
@@ -82,11 +127,11 @@ class TranslatorScreen(Screen):
         super().__init__(**kwargs)
 
         self.font_name = "Amiri"
-        self.history_file = "history.json"
+        self.storage = get_storage()
         self.video_dataset_path = "datavideos"
-        self.letter_sequence = []
-        self.current_index = 0
-        self.event = None
+        self.clip_index = None  # loaded in the background, see _load_clip_index
+        self.ocr_job = None
+        self.ingest_job = None
         self.current_mode = "text_to_sign"
 
         # ─────────────────────────────────────────────────────────────────────────────
@@ -135,7 +180,7 @@ class TranslatorScreen(Screen):
         # 2) “Back to Home” BUTTON (above the SWITCH BAR)
         # ─────────────────────────────────────────────────────────────────────────────
         self.back_btn = IconButton(
-            source="assets/icons/angle-double-left.png",
+            source=icon("angle-double-left"),
             size_hint=(None, None),
             size=(50, 50),
             allow_stretch=True
@@ -192,7 +237,7 @@ class TranslatorScreen(Screen):
 
         # 3.b) custom switch icon
         self.btn_toggle = IconButton(
-            source="assets/icons/switch.png",
+            source=icon("switch"),
             size_hint=(None, None),
             size=(50, 50),
             allow_stretch=True,
@@ -269,29 +314,41 @@ class TranslatorScreen(Screen):
         ))
 
         self.video_box = FloatLayout(size_hint=(1, 1), pos_hint={'x': 0, 'y': 0})
-        self.video1 = Video(
-            size_hint=(1, 1),
-            pos_hint={'x': 0, 'y': 0},
-            allow_stretch=True,
-            keep_ratio=False,
-            state='stop',
-            options={'eos': 'stop'}
-        )
-        self.video2 = Video(
-            size_hint=(1, 1),
-            pos_hint={'x': 0, 'y': 0},
-            allow_stretch=True,
-            keep_ratio=False,
-            state='stop',
-            options={'eos': 'stop'}
+        # A small pool of stacked Video widgets: one on screen, the rest warm
+        # the next clips of the sequence (see services/clip_preloader.py)
+        self.videos = []
+        for i in range(DECODER_POOL_SIZE):
+            video = Video(
+                size_hint=(1, 1),
+                pos_hint={'x': 0, 'y': 0},
+                allow_stretch=True,
+                keep_ratio=False,
+                state='stop',
+                options={'eos': 'stop'}
+            )
+            video.opacity = 1 if i == 0 else 0
+            self.videos.append(video)
+            self.video_box.add_widget(video)
+        # The scheduler reorders video_box's children, so the speed button
+        # sits in its own layer above it
+        video_layer = FloatLayout(size_hint=(1, 1))
+        video_layer.add_widget(self.video_box)
+        self.speed_btn = Button(
+            text="1×",
+            font_size=22,
+            bold=True,
+            size_hint=(None, None),
+            size=(84, 48),
+            pos_hint={'right': 0.96, 'top': 0.95},
+            background_normal="",
+            background_color=(1, 0.5, 0.1, 0.85),
+            color=(1, 1, 1, 1)
         )
-        self.video2.opacity = 0
-        self.active_video = self.video1
-        self.inactive_video = self.video2
-
-        self.video_box.add_widget(self.video1)
-        self.video_box.add_widget(self.video2)
-        avatar_card.add_widget(self.video_box)
+        self.speed_btn.bind(on_release=lambda _: self.cycle_playback_speed())
+        video_layer.add_widget(self.speed_btn)
+        avatar_card.add_widget(video_layer)
+        self.player = PlaybackScheduler(self.videos, self.video_box)
+        self.sentence_renderer = SentenceRenderer(SENTENCE_CROSSFADE, SENTENCE_PAUSES)
         avatar_anchor.add_widget(avatar_card)
         middle_container.add_widget(avatar_anchor)
 
@@ -359,8 +416,24 @@ class TranslatorScreen(Screen):
             size_hint=(1, 1)
         )
 
+        # Live preview of which words get a whole-word sign vs fingerspelling
+        self.preview_label = Label(
+            text="",
+            font_name=self.font_name,
+            font_size=22,
+            color=(0.35, 0.35, 0.35, 1),
+            size_hint_y=None,
+            height=36,
+            halign="right",
+            shorten=True
+        )
+        self.preview_label.bind(size=self.preview_label.setter('text_size'))
+        self.text_input.bind(text=self.update_preview)
+        threading.Thread(target=self._load_clip_index, daemon=True).start()
+
         text_input_card.add_widget(self.input_label)
         text_input_card.add_widget(self.text_input)
+        text_input_card.add_widget(self.preview_label)
         text_anchor.add_widget(text_input_card)
         middle_container.add_widget(text_anchor)
 
@@ -437,31 +510,31 @@ class TranslatorScreen(Screen):
             return container
 
         chat_item = _create_nav_item(
-            icon_path="assets/icons/mic.png",
+            icon_path=icon("mic"),
             label_text="Chat",
             callback=self.recognize_speech,
             is_translate=False
         )
         camera_item = _create_nav_item(
-            icon_path="assets/icons/camera.png",
+            icon_path=icon("camera"),
             label_text="Camera",
             callback=self.open_camera_modal,
             is_translate=False
         )
         translate_item = _create_nav_item(
-            icon_path="assets/icons/translate.png",
+            icon_path=icon("translate"),
             label_text="Translate",
             callback=lambda: self.start_translation(None),
             is_translate=True
         )
         history_item = _create_nav_item(
-            icon_path="assets/icons/history.png",
+            icon_path=icon("history"),
             label_text="History",
             callback=self.show_history,
             is_translate=False
         )
         pdf_item = _create_nav_item(
-            icon_path="assets/icons/pdf.png",
+            icon_path=icon("pdf"),
             label_text="PDF",
             callback=self.select_pdf_as_image,
             is_translate=False
@@ -472,11 +545,6 @@ class TranslatorScreen(Screen):
 
         self.root_layout.add_widget(bottom_nav)
 
-        # Ensure the history file exists
-        if not os.path.exists(self.history_file):
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False, indent=2)
-
     # ─────────────────────────────────────────────────────────────────────────────
     # Bind "Back to Home" button once this screen is in a ScreenManager
     # ─────────────────────────────────────────────────────────────────────────────
@@ -587,7 +655,7 @@ class TranslatorScreen(Screen):
         camera_wrap.bind(size=lambda w, *_: setattr(br_cam, 'size', w.size))
 
         camera_btn = IconButton(
-            source="assets/icons/camera.png",
+            source=icon("camera"),
             size_hint=(None, None),
             size=(32, 32),
             pos_hint={'center_x': 0.5, 'center_y': 0.5},
@@ -615,7 +683,7 @@ class TranslatorScreen(Screen):
         extract_wrap.bind(size=lambda w, *_: setattr(br_ext, 'size', w.size))
 
         pic_icon = IconButton(
-            source="assets/icons/picture.png",
+            source=icon("picture"),
             size_hint=(None, None),
             size=(24, 24),
             pos_hint={'center_y': 0.5},
@@ -662,7 +730,7 @@ class TranslatorScreen(Screen):
         self.camera_modal.dismiss()
 
     # ─────────────────────────────────────────────────────────────────────────────
-    # CAPTURE PHOTO FROM CAMERA: save a temp PNG, then ROI+OCR
+    # CAPTURE PHOTO FROM CAMERA: save a temp PNG, then ROI+OCR (in the background)
     # ─────────────────────────────────────────────────────────────────────────────
     def _capture_from_camera(self):
         """
@@ -676,20 +744,8 @@ class TranslatorScreen(Screen):
         if img is None:
             return
 
-        r = cv2.selectROI("حدد المنطقة", img, fromCenter=False, showCrosshair=True)
-        cv2.destroyAllWindows()
-        if r == (0, 0, 0, 0):
-            return
-
-        x, y, w, h = r
-        roi = img[int(y):int(y+h), int(x):int(x+h)]
-        gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-        text = pytesseract.image_to_string(gray, lang='ara')
-        cleaned = ''.join(c for c in text if 'ء' <= c <= 'ي' or c == ' ')
-        self.text_input.original_text = cleaned
-        self.text_input.text = rtl(cleaned)
-
         self._close_camera_modal()
+        self.ocr_region(img)
 
     # ─────────────────────────────────────────────────────────────────────────────
     # select_image_from_file: pick image, preview, then ROI+OCR
@@ -737,17 +793,7 @@ class TranslatorScreen(Screen):
             img = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_COLOR)
             if img is None:
                 return
-            r = cv2.selectROI("حدد المنطقة", img, fromCenter=False, showCrosshair=True)
-            cv2.destroyAllWindows()
-            if r == (0, 0, 0, 0):
-                return
-            x, y, w, h = r
-            roi = img[int(y):int(y+h), int(x):int(x+h)]
-            gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-            text = pytesseract.image_to_string(gray, lang='ara')
-            cleaned = ''.join(c for c in text if 'ء' <= c <= 'ي' or c == ' ')
-            self.text_input.original_text = cleaned
-            self.text_input.text = rtl(cleaned)
+            self.ocr_region(img)
 
         confirm_button.bind(on_release=on_confirm)
         popup.open()
@@ -760,8 +806,7 @@ class TranslatorScreen(Screen):
         if not raw_text:
             return
 
-        import re
-        if re.search(r"[^\sء-ي]", raw_text):
+        if has_foreign(raw_text):
             content = BoxLayout(orientation='vertical', spacing=10, padding=20)
             warning_label = Label(
                 text=rtl("النص يحتوي على أحرف غير عربية. هل تريد المتابعة؟"),
@@ -814,73 +859,118 @@ class TranslatorScreen(Screen):
             self._really_start_translation(raw_text)
 
     def _really_start_translation(self, cleaned_text):
-        text = clean_arabic_text(cleaned_text)
+        text = self.normalize_text(cleaned_text)
         self.save_history(text)
-        self.letter_sequence = [c for c in text if c != '\n']
-        self.current_index = 0
-        if self.event:
-            self.event.cancel()
-        self.event = Clock.schedule_interval(self.show_next_letter, 1.0)
+        self.clip_index = get_clip_index(self.video_dataset_path)
+        items = self.build_playlist(text)
+        if not items:
+            return
+
+        # Same text rendered before → one clip, one decoder
+        speed = self.player.speed
+        sentence = self.sentence_renderer.lookup(items, speed)
+        if sentence:
+            self.player.play([(sentence, self.sentence_renderer.duration(items, speed))])
+            return
+
+        # First time: play letter by letter now, stitch in the background for next time
+        self.player.play(items)
+        self.sentence_renderer.request(items, speed=speed)
 
     # ─────────────────────────────────────────────────────────────────────────────
-    # show_next_letter & display_video: unchanged
+    # PLAYLIST: one (clip, duration) per word sign or letter, a pause between words
     # ─────────────────────────────────────────────────────────────────────────────
-    def show_next_letter(self, dt):
-        if self.current_index >= len(self.letter_sequence):
-            if self.event:
-                self.event.cancel()
+    def build_playlist(self, text):
+        if self.clip_index is None:
+            self.clip_index = get_clip_index(self.video_dataset_path)
+        return build_playlist(text, self.clip_index, self.storage, word_pause=WORD_PAUSE)
+
+    def normalize_text(self, text, keep_newlines=True):
+        """Tashkeel, letter variants and digits folded to what datavideos has clips for."""
+        if self.clip_index is None:
+            self.clip_index = get_clip_index(self.video_dataset_path)
+        return normalizer_for(self.clip_index)(text, keep_newlines=keep_newlines)
+
+    def segment_text(self, text):
+        """Longest-match word/phrase signs first, fingerspelling for the rest."""
+        if self.clip_index is None:
+            self.clip_index = get_clip_index(self.video_dataset_path)
+        return get_lexicon(self.clip_index, self.storage).segment(text)
+
+    def _load_clip_index(self):
+        """
+        Worker thread: the first build probes every clip, which mustn't happen
+        on the UI thread (it did, on the first keystroke of the preview).
+        """
+        try:
+            index = get_clip_index(self.video_dataset_path)
+        except OSError as e:
+            Logger.warning(f"Translator: clip index not loaded: {e}")
             return
-        letter = self.letter_sequence[self.current_index]
-        if letter == ' ':
-            self.current_index += 1
+        Clock.schedule_once(lambda dt: self._on_clip_index(index))
+
+    def _on_clip_index(self, index):
+        if self.clip_index is None:
+            self.clip_index = index
+        self.update_preview()
+
+    def update_preview(self, *args):
+        if self.clip_index is None:
+            return  # shown once _load_clip_index finishes
+        text = self.normalize_text(getattr(self.text_input, 'original_text', ""))
+        if not text.strip():
+            self.preview_label.text = ""
             return
-        vids = [
-            f for f in os.listdir(self.video_dataset_path)
-            if f.startswith(letter) and f.lower().endswith(('.mp4','.avi','.mov'))
-        ]
-        if vids:
-            video_path = os.path.join(self.video_dataset_path, vids[0])
-            self.display_video(video_path)
-        self.current_index += 1
-
-    def display_video(self, path):
-        self.inactive_video.source = path
-        self.inactive_video.opacity = 0
-        self.inactive_video.state = 'play'
-
-        def check_loaded(dt):
-            if self.inactive_video.texture:
-                self.video_box.remove_widget(self.inactive_video)
-                self.video_box.add_widget(self.inactive_video)
-                self.active_video.opacity = 0
-                self.inactive_video.opacity = 1
-                self.active_video.state = 'stop'
-                self.active_video, self.inactive_video = self.inactive_video, self.active_video
-            else:
-                Clock.schedule_once(check_loaded, 0.1)
+        try:
+            segments = self.segment_text(text)
+        except (OSError, ValueError):
+            return  # word list or dataset changing underneath; the next keystroke retries
+        except Exception:
+            Logger.exception("Translator: preview failed")
+            return
+        signed = [s.text for s in segments if s.clip]
+        spelled = [s.text for s in segments if not s.clip]
+        parts = []
+        if signed:
+            parts.append("إشارة: " + "، ".join(signed))
+        if spelled:
+            parts.append("تهجئة: " + "، ".join(spelled))
+        self.preview_label.text = rtl(" | ".join(parts))
 
-        Clock.schedule_once(check_loaded, 0.1)
+    # ─────────────────────────────────────────────────────────────────────────────
+    # PLAYBACK SPEED: the button on the video card, remembered in the user record
+    # ─────────────────────────────────────────────────────────────────────────────
+    def on_pre_enter(self, *args):
+        _, record = self._current_user()
+        self.set_playback_speed((record or {}).get("playback_speed", 1.0), remember=False)
+
+    def _current_user(self):
+        username = getattr(App.get_running_app(), 'current_user', None)
+        return username, (self.storage.get_user(username) if username else None)
+
+    def cycle_playback_speed(self):
+        faster = [s for s in PLAYBACK_SPEEDS if s > self.player.speed]
+        self.set_playback_speed(faster[0] if faster else PLAYBACK_SPEEDS[0])
+
+    def set_playback_speed(self, speed, remember=True):
+        """Takes effect from the next clip or pause; saved to the user's record."""
+        self.player.set_speed(speed)
+        self.speed_btn.text = f"{self.player.speed:g}×"
+        if not remember:
+            return
+        username, record = self._current_user()
+        if record is not None and record.get("playback_speed") != self.player.speed:
+            self.storage.save_user(username, {**record, "playback_speed": self.player.speed})
 
     # ─────────────────────────────────────────────────────────────────────────────
     # HISTORY POPUP: plain rows with transparent text button + trash icon
     # ─────────────────────────────────────────────────────────────────────────────
     def show_history(self):
-        if not os.path.exists(self.history_file):
+        # Newest first; only the tail of the log is read
+        display_list = self.storage.history_tail(10)
+        if not display_list:
             return
 
-        try:
-            with open(self.history_file, 'r', encoding='utf-8') as f:
-                all_history = json.load(f)
-        except:
-            all_history = []
-
-        if not all_history:
-            return
-
-        # Take the last 10 entries and reverse so newest is on top
-        last_ten = all_history[-10:]
-        display_list = list(reversed(last_ten))
-
         # Vertical GridLayout to hold up to 10 rows
         layout = GridLayout(
             cols=1,
@@ -890,8 +980,7 @@ class TranslatorScreen(Screen):
         )
         layout.bind(minimum_height=layout.setter('height'))
 
-        for idx, entry in enumerate(display_list):
-            full_index = len(all_history) - 1 - idx
+        for entry in display_list:
             full_text = entry['text']
             timestamp = entry['time']
 
@@ -935,13 +1024,13 @@ class TranslatorScreen(Screen):
                 anchor_y='center'
             )
             trash_btn = IconButton(
-                source="assets/icons/trash.png",
+                source=icon("trash"),
                 size_hint=(None, None),
                 size=(30, 30),
                 pos_hint={'center_x': 0.5, 'center_y': 0.5},
                 allow_stretch=True
             )
-            trash_btn.bind(on_release=lambda inst, i=full_index: self.delete_history(i))
+            trash_btn.bind(on_release=lambda inst, i=entry['id']: self.delete_history(i))
             trash_container.add_widget(trash_btn)
 
             row.add_widget(trash_container)
@@ -962,19 +1051,8 @@ class TranslatorScreen(Screen):
         popup.open()
         self.history_popup = popup
 
-    def delete_history(self, index: int):
-        if not os.path.exists(self.history_file):
-            return
-        try:
-            with open(self.history_file, 'r', encoding='utf-8') as f:
-                history = json.load(f)
-        except:
-            history = []
-
-        if 0 <= index < len(history):
-            del history[index]
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump(history, f, ensure_ascii=False, indent=2)
+    def delete_history(self, entry_id):
+        self.storage.delete_history(entry_id)
 
         if hasattr(self, 'history_popup') and self.history_popup:
             self.history_popup.dismiss()
@@ -987,19 +1065,10 @@ class TranslatorScreen(Screen):
             self.history_popup.dismiss()
 
     # ─────────────────────────────────────────────────────────────────────────────
-    # SAVE_HISTORY: appends to history.json
+    # SAVE_HISTORY: through the storage layer
     # ─────────────────────────────────────────────────────────────────────────────
     def save_history(self, text: str):
-        history = []
-        if os.path.exists(self.history_file):
-            try:
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    history = json.load(f)
-            except:
-                history = []
-        history.append({"time": datetime.now().strftime("%Y-%m-%d %H:%M"), "text": text})
-        with open(self.history_file, 'w', encoding='utf-8') as f:
-            json.dump(history, f, ensure_ascii=False, indent=2)
+        self.storage.add_history(text, datetime.now().strftime("%Y-%m-%d %H:%M"))
 
     # ─────────────────────────────────────────────────────────────────────────────
     # select_pdf_as_image & extract_text: unchanged from before
@@ -1012,9 +1081,16 @@ class TranslatorScreen(Screen):
             font_name=self.font_name,
             font_size=20
         )
+        whole_button = Button(
+            text=rtl("📄 قراءة المستند كاملاً"),
+            size_hint=(1, 0.1),
+            font_name=self.font_name,
+            font_size=20
+        )
         layout = BoxLayout(orientation='vertical')
         layout.add_widget(filechooser)
         layout.add_widget(confirm_button)
+        layout.add_widget(whole_button)
         popup = ModalView(size_hint=(0.95, 0.95))
         popup.add_widget(layout)
 
@@ -1024,64 +1100,196 @@ class TranslatorScreen(Screen):
             if selection:
                 selected["path"] = selection[0]
 
+        def on_whole_document(_):
+            popup.dismiss()
+            if selected["path"]:
+                self.ingest_document(selected["path"])
+
+        whole_button.bind(on_release=on_whole_document)
+
         def on_confirm(_):
             popup.dismiss()
             if not selected["path"]:
                 return
             try:
-                images = convert_from_path(selected["path"], dpi=60)
-                scroll_layout = GridLayout(cols=1, spacing=10, padding=10, size_hint_y=None)
-                scroll_layout.bind(minimum_height=scroll_layout.setter('height'))
-                for idx, img in enumerate(images):
-                    buf = BytesIO()
-                    img.save(buf, format='PNG')
-                    buf.seek(0)
-                    core_img = CoreImage(buf, ext='png').texture
-                    img_widget = KivyImage(texture=core_img, size_hint_y=None, height=360)
-                    btn = Button(
-                        text=rtl(f"اختر نص الصفحة {idx+1}"),
-                        font_name=self.font_name,
-                        font_size=20,
-                        size_hint_y=None,
-                        height=64
-                    )
-                    def make_callback(img_np):
-                        def callback(instance):
-                            self.extract_text_from_selected_image(img_np)
-                        return callback
-                    img_np = np.array(img)
-                    btn.bind(on_release=make_callback(img_np))
-                    scroll_layout.add_widget(img_widget)
-                    scroll_layout.add_widget(btn)
-
-                scroll_view = ScrollView(size_hint=(1, 1))
-                scroll_view.add_widget(scroll_layout)
-                pdf_popup = ModalView(size_hint=(0.98, 0.98))
-                pdf_popup.add_widget(scroll_view)
-                pdf_popup.open()
+                source = PdfPageSource(selected["path"])
             except Exception:
-                pass
+                return
+
+            def pick_page(page):
+                # OCR needs far more detail than the 60-dpi thumbnail
+                source.render_full(page, self.extract_text_from_selected_image)
+
+            # Virtualized list: only rows on screen exist, and only they render
+            pages_view = RecycleView(size_hint=(1, 1), viewclass=PdfPageRow)
+            pages_layout = RecycleBoxLayout(
+                orientation='vertical',
+                spacing=10,
+                padding=10,
+                default_size=(None, 434),
+                default_size_hint=(1, None),
+                size_hint_y=None
+            )
+            pages_layout.bind(minimum_height=pages_layout.setter('height'))
+            pages_view.add_widget(pages_layout)
+            pages_view.data = [
+                {'page': n, 'source': source, 'on_pick': pick_page, 'font_name': self.font_name}
+                for n in range(1, source.pages + 1)
+            ]
+            pdf_popup = ModalView(size_hint=(0.98, 0.98))
+            pdf_popup.add_widget(pages_view)
+            pdf_popup.bind(on_dismiss=lambda *_: source.close())
+            pdf_popup.open()
 
         filechooser.bind(selection=on_select)
         confirm_button.bind(on_release=on_confirm)
         popup.open()
 
+    # ─────────────────────────────────────────────────────────────────────────────
+    # WHOLE-DOCUMENT IMPORT: text layer if present, else parallel OCR; paragraphs
+    # are appended to the input as they arrive, in page order
+    # ─────────────────────────────────────────────────────────────────────────────
+    def ingest_document(self, path):
+        if self.ingest_job is not None:
+            self.ingest_job.cancel()
+        self.text_input.original_text = ""
+        self.text_input.text = ""
+
+        popup, status, bar, cancel_btn = self._progress_popup()
+
+        def on_paragraphs(page, paragraphs):
+            lines = [self.normalize_text(p, keep_newlines=False) for p in paragraphs]
+            lines = [line for line in lines if line]
+            if not lines:
+                return
+            existing = self.text_input.original_text
+            text = (existing + "\n" if existing else "") + "\n".join(lines)
+            self.text_input.original_text = text
+            self.text_input.text = "\n".join(rtl(line) for line in text.splitlines())
+
+        def on_progress(done, total):
+            bar.value = done / total if total else 1.0
+            status.text = rtl(f"جاري قراءة المستند... {done}/{total}")
+
+        def on_done(stats):
+            self.ingest_job = None
+            popup.dismiss()
+
+        def on_error(error):
+            self.ingest_job = None
+            status.text = rtl("تعذر قراءة المستند")
+            cancel_btn.text = rtl("إغلاق")
+
+        job = DocumentIngest(path, on_paragraphs, on_progress, on_done, on_error)
+        self.ingest_job = job
+
+        def on_cancel(_):
+            job.cancel()
+            if self.ingest_job is job:
+                self.ingest_job = None
+            popup.dismiss()
+
+        cancel_btn.bind(on_release=on_cancel)
+        popup.open()
+        job.start()
+
     def extract_text_from_selected_image(self, img_np):
         try:
             img_bgr = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
-            r = cv2.selectROI("حدد المنطقة", img_bgr, fromCenter=False, showCrosshair=True)
-            cv2.destroyAllWindows()
-            if r == (0, 0, 0, 0):
+            self.ocr_region(img_bgr)
+        except Exception:
+            pass
+
+    # ─────────────────────────────────────────────────────────────────────────────
+    # OCR: pick a region, recognize it on the OCR worker pool, progress + cancel
+    # ─────────────────────────────────────────────────────────────────────────────
+    def ocr_region(self, img_bgr):
+        # Select on a screen-sized copy, crop from the full-resolution image
+        scale = min(1.0, ROI_PREVIEW_MAX / max(img_bgr.shape[:2]))
+        preview = img_bgr if scale == 1.0 else cv2.resize(
+            img_bgr, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        r = cv2.selectROI("حدد المنطقة", preview, fromCenter=False, showCrosshair=True)
+        cv2.destroyAllWindows()
+        if r == (0, 0, 0, 0):
+            return
+        x, y, w, h = (int(round(v / scale)) for v in r)
+        roi = img_bgr[y:y + h, x:x + w]
+        self.run_ocr([cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)])
+
+    def _progress_popup(self):
+        content = BoxLayout(orientation='vertical', spacing=10, padding=20)
+        status = Label(
+            text=rtl("جاري استخراج النص..."),
+            font_name=self.font_name,
+            font_size=24,
+            color=(1, 1, 1, 1)
+        )
+        bar = ProgressBar(max=1.0, value=0, size_hint_y=None, height=24)
+        cancel_btn = Button(
+            text=rtl("إلغاء"),
+            font_name=self.font_name,
+            font_size=22,
+            size_hint_y=None,
+            height=56,
+            background_color=(0.5, 0.1, 0.1, 1),
+            color=(1, 1, 1, 1)
+        )
+        content.add_widget(status)
+        content.add_widget(bar)
+        content.add_widget(cancel_btn)
+        popup = ModalView(size_hint=(0.8, 0.3), auto_dismiss=False)
+        popup.add_widget(content)
+        return popup, status, bar, cancel_btn
+
+    def run_ocr(self, gray_images, on_text=None):
+        """Queue images on the OCR pool; the result replaces the input text."""
+        if self.ocr_job is not None:
+            self.ocr_job.cancel()
+
+        popup, status, bar, cancel_btn = self._progress_popup()
+
+        def on_progress(job):
+            bar.value = job.progress
+            if job.total > 1:
+                status.text = rtl(f"جاري استخراج النص... {job.done}/{job.total}")
+
+        def on_done(texts):
+            self.ocr_job = None
+            popup.dismiss()
+            cleaned = self.normalize_text(" ".join(texts), keep_newlines=False)
+            if on_text:
+                on_text(cleaned)
                 return
-            x, y, w, h = r
-            roi = img_bgr[int(y):int(y+h), int(x):int(x+h)]
-            gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-            text = pytesseract.image_to_string(gray, lang='ara')
-            cleaned = ''.join(c for c in text if 'ء' <= c <= 'ي' or c == ' ')
             self.text_input.original_text = cleaned
             self.text_input.text = rtl(cleaned)
-        except Exception:
-            pass
+
+        def on_error(error):
+            self.ocr_job = None
+            status.text = rtl("تعذر استخراج النص")
+            cancel_btn.text = rtl("إغلاق")
+
+        try:
+            job = get_ocr_service().submit(
+                gray_images, on_progress=on_progress, on_done=on_done, on_error=on_error
+            )
+        except OCRQueueFull:
+            # Same popup, as an error message with a close button
+            status.text = rtl("النظام مشغول، حاول مرة أخرى")
+            bar.opacity = 0
+            cancel_btn.text = rtl("إغلاق")
+            cancel_btn.bind(on_release=lambda _: popup.dismiss())
+            popup.open()
+            return
+        self.ocr_job = job
+
+        def on_cancel(_):
+            job.cancel()
+            if self.ocr_job is job:
+                self.ocr_job = None
+            popup.dismiss()
+
+        cancel_btn.bind(on_release=on_cancel)
+        popup.open()
 
     # ─────────────────────────────────────────────────────────────────────────────
     # recognize_speech: unchanged from before
@@ -1092,7 +1300,7 @@ class TranslatorScreen(Screen):
             recognizer = sr.Recognizer()
             with sr.Microphone() as source:
                 audio = recognizer.listen(source, timeout=5)
-                text = recognizer.recognize_google(audio, language='ar-SA')
+                text = self.normalize_text(recognizer.recognize_google(audio, language='ar-SA'))
                 self.text_input.original_text = text
                 self.text_input.text = rtl(text)
         except:
@@ -1108,7 +1316,7 @@ class PredictorScreen(Screen):
 
         # 1) “Back to Home” button at top-left (bound via on_parent)
         self.back_btn = IconButton(
-            source="assets/icons/angle-double-left.png",
+            source=icon("angle-double-left"),
             size_hint=(None, None),
             size=(50, 50),
             allow_stretch=True
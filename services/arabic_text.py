@@ -0,0 +1,128 @@
+# services/arabic_text.py
+
+import re
+
+# ─── Arabic text normalization ───────────────────────────────────────────────
+# One str.translate pass (C speed) does diacritic stripping, letter folding,
+# digit mapping and dropping of everything else; precompiled regexes then
+# tidy whitespace. Shared by typed text, OCR output and speech recognition.
+
+# Tashkeel, Quranic annotation marks, superscript alef and tatweel
+_TASHKEEL = (
+    [chr(c) for c in range(0x064B, 0x0660)]
+    + ["ٰ", "ـ"]
+    + [chr(c) for c in range(0x06D6, 0x06EE)]
+)
+
+# Variant → base letter. Applied only when the variant has no clip of its own.
+_FOLDING = {
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ؤ": "و",
+    "ئ": "ي", "ى": "ي",
+    "ة": "ه",
+    # Persian / Urdu code points that keyboards and OCR often produce
+    "ک": "ك", "ی": "ي", "ہ": "ه", "ھ": "ه",
+}
+
+# Each digit in its three common forms: ASCII, Arabic-Indic, Eastern Arabic-Indic
+_DIGIT_FORMS = [(str(d), chr(0x0660 + d), chr(0x06F0 + d)) for d in range(10)]
+
+# Characters a normalized text may contain; everything else becomes a space
+_KEEP_RE = re.compile(r"[ء-غف-ي0-9٠-٩۰-۹\n ]")
+# The translate table is a flat list over U+0000–U+08FF (Latin … Arabic
+# Extended-A): list indexing is several times faster than dict lookups.
+_TABLE_SIZE = 0x0900
+_OUTSIDE_RE = re.compile(r"[^\x00-\u08ff]+")
+_SPACES_RE = re.compile(r" {2,}")
+_BLANK_LINES_RE = re.compile(r" ?\n[ \n]*")
+# A letter from any script other than Arabic (digits and punctuation are fine)
+_FOREIGN_RE = re.compile(r"[^\W\d_؀-ۿݐ-ݿࢠ-ࣿ]")
+
+
+def _build_table(available=None) -> list:
+    mapping = {c: "" for c in _TASHKEEL}
+    for variant, base in _FOLDING.items():
+        if available is None or variant not in available:
+            mapping[variant] = base
+    # All digits go to one script: the one with the most clips (ASCII by default)
+    script = 0
+    if available is not None:
+        counts = [sum(forms[i] in available for forms in _DIGIT_FORMS) for i in range(3)]
+        script = max(range(3), key=lambda i: (counts[i], -i))
+    for forms in _DIGIT_FORMS:
+        for form in forms:
+            mapping[form] = forms[script]
+
+    table = []
+    for code in range(_TABLE_SIZE):
+        char = chr(code)
+        out = mapping.get(char, char)
+        if out and not _KEEP_RE.match(out):
+            out = "\n" if char in "\r\u2028\u2029" else " "
+        table.append(out)
+    return table
+
+
+class ArabicNormalizer:
+    """
+    Callable normalizer. With `available` (the set of sign keys we have
+    clips for), a hamza/taa-marbuta/alef-maqsura variant is only folded if
+    it has no clip itself, and digits map to the script that has clips.
+    """
+
+    def __init__(self, available=None):
+        self._table = _build_table(set(available) if available is not None else None)
+
+    def fold(self, text: str) -> str:
+        """Normalize a single-line key (clip file name, words.json entry)."""
+        return self(text, keep_newlines=False)
+
+    def __call__(self, text: str, keep_newlines: bool = True) -> str:
+        if not isinstance(text, str):
+            return ""
+        text = _OUTSIDE_RE.sub(" ", text.translate(self._table))
+        if not keep_newlines:
+            return " ".join(text.split())
+        text = _SPACES_RE.sub(" ", text)
+        return _BLANK_LINES_RE.sub("\n", text).strip()
+
+
+normalize = ArabicNormalizer()
+
+
+_TASHKEEL_TABLE = {ord(c): None for c in _TASHKEEL}
+
+
+def strip_tashkeel(text: str) -> str:
+    return text.translate(_TASHKEEL_TABLE)
+
+
+_SEARCH_TABLE = {ord(c): None for c in _TASHKEEL}
+_SEARCH_TABLE.update({ord(variant): base for variant, base in _FOLDING.items()})
+_SEARCH_TABLE.update({ord(form): forms[0] for forms in _DIGIT_FORMS for form in forms[1:]})
+
+
+def search_key(text: str) -> str:
+    """
+    Matching form for search: no tashkeel, letter variants folded, digits in
+    ASCII, Latin lowercased; unlike normalize() other scripts are kept.
+    """
+    return " ".join(text.translate(_SEARCH_TABLE).casefold().split())
+
+
+def has_foreign(text: str) -> bool:
+    """True if the text contains letters from a non-Arabic script."""
+    return _FOREIGN_RE.search(text) is not None
+
+
+_normalizers = {}
+
+
+def normalizer_for(clip_index) -> ArabicNormalizer:
+    """Normalizer tuned to the clips in `clip_index`; rebuilt when it changes."""
+    key = clip_index.video_dir
+    cached = _normalizers.get(key)
+    if cached is None or cached[0] != clip_index.stamp:
+        available = {k for k in clip_index.keys() if len(k) == 1}
+        cached = _normalizers[key] = (clip_index.stamp, ArabicNormalizer(available))
+    return cached[1]
@@ -0,0 +1,116 @@
+# services/atomic_io.py
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# ─── Crash- and concurrency-safe file writes ─────────────────────────────────
+# atomic_write(): the new contents go to a temp file in the same directory,
+# are fsync'd, then renamed over the target (os.replace is atomic on POSIX
+# and Windows), so readers and crashes only ever see the old file or the new
+# one — never a truncated mix. file_lock(): an advisory lock on "<path>.lock"
+# (flock / msvcrt) that serializes read-modify-write cycles between threads
+# and between app instances.
+try:
+    import fcntl
+except ImportError:   # Windows
+    fcntl = None
+    import msvcrt
+
+_path_locks = {}
+_path_locks_guard = threading.Lock()
+
+
+def atomic_write(path: str, data) -> None:
+    """Replace `path` with `data` (str or bytes) atomically and durably."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    if fcntl is not None:
+        # Make the rename itself durable
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+class _PathLock:
+    def __init__(self):
+        self.rlock = threading.RLock()
+        self.depth = 0      # re-entrant use by the owning thread
+        self.file = None
+
+
+def _path_lock(path):
+    with _path_locks_guard:
+        lock = _path_locks.get(path)
+        if lock is None:
+            lock = _path_locks[path] = _PathLock()
+        return lock
+
+
+def _acquire(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+    while True:
+        try:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:   # LK_LOCK gives up after ~10 s; keep waiting
+            time.sleep(0.05)
+
+
+def _release(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path: str):
+    """Exclusive advisory lock for `path` (held via a sibling .lock file); re-entrant."""
+    lock = _path_lock(os.path.abspath(path))
+    # The OS lock is per open file, so threads of this process queue on the RLock
+    with lock.rlock:
+        if lock.depth == 0:
+            lock.file = open(os.path.abspath(path) + ".lock", "a+b")
+            try:
+                _acquire(lock.file)
+            except BaseException:
+                lock.file.close()
+                raise
+        lock.depth += 1
+        try:
+            yield
+        finally:
+            lock.depth -= 1
+            if lock.depth == 0:
+                try:
+                    _release(lock.file)
+                finally:
+                    lock.file.close()
+                    lock.file = None
@@ -0,0 +1,165 @@
+# services/clip_index.py
+
+import json
+import os
+import re
+import threading
+
+# ─── Clip index ──────────────────────────────────────────────────────────────
+# Maps every sign key found in the video dataset (a single letter such as "ب",
+# or a multi-letter word / phrase such as "بيت" or "السلام عليكم") to its clip
+# files and their durations. Built once, persisted under cache/, and rebuilt
+# only when the dataset directory's mtime changes (files added/removed/renamed).
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, "cache")
+VIDEO_EXTS = (".mp4", ".avi", ".mov")
+INDEX_FORMAT = 1
+
+# "ب_2", "ب-3", "ب (4)" are extra takes of "ب"
+_VARIANT_RE = re.compile(r"(?:[_\-]\d+|\s*\(\d+\))$")
+
+
+def clip_key(filename: str) -> str:
+    """File name → sign key: drop extension and take suffix, '_' separates words."""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    stem = _VARIANT_RE.sub("", stem)
+    return " ".join(stem.replace("_", " ").split())
+
+
+def probe_duration(path: str) -> float:
+    """Clip length in seconds from the container header (no frame decoding)."""
+    import cv2
+    cap = cv2.VideoCapture(path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        frames = cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0.0
+    finally:
+        cap.release()
+    return round(frames / fps, 3) if fps > 0 and frames > 0 else 0.0
+
+
+class ClipIndex:
+    def __init__(self, video_dir: str, cache_path: str = None):
+        self.video_dir = video_dir
+        if cache_path is None:
+            tag = re.sub(r"[^\w]+", "_", os.path.abspath(video_dir)).strip("_")[-80:]
+            cache_path = os.path.join(CACHE_DIR, f"clip_index_{tag}.json")
+        self.cache_path = cache_path
+        self._files = {}      # file name → {"size", "mtime_ns", "duration"}
+        self._by_key = {}     # key → [file name, ...] in selection order
+        self._dir_mtime = None
+        self._lock = threading.Lock()
+
+    # ─── Lookup (O(1)) ──────────────────────────────────────────────────────
+    def __contains__(self, key):
+        return key in self._by_key
+
+    def keys(self):
+        return self._by_key.keys()
+
+    def clips(self, key) -> list:
+        return [os.path.join(self.video_dir, n) for n in self._by_key.get(key, ())]
+
+    def first(self, key):
+        names = self._by_key.get(key)
+        return os.path.join(self.video_dir, names[0]) if names else None
+
+    def duration(self, path) -> float:
+        entry = self._files.get(os.path.basename(path))
+        return entry["duration"] if entry else 0.0
+
+    @property
+    def stamp(self):
+        """Changes whenever the index is rebuilt from a different folder state."""
+        return self._dir_mtime
+
+    # ─── Build / persist ────────────────────────────────────────────────────
+    def _stat_dir(self):
+        try:
+            return os.stat(self.video_dir).st_mtime_ns
+        except OSError:
+            return None
+
+    def is_stale(self) -> bool:
+        return self._dir_mtime != self._stat_dir()
+
+    def load(self):
+        """Use the persisted index if the directory is unchanged, else rebuild."""
+        with self._lock:
+            cached = self._read_cache()
+            if cached and cached.get("dir_mtime_ns") == self._stat_dir():
+                self._set_files(cached["files"], cached["dir_mtime_ns"])
+            else:
+                self._rebuild(cached.get("files", {}) if cached else {})
+        return self
+
+    def refresh_if_stale(self):
+        """One stat() call when nothing changed."""
+        if self.is_stale():
+            with self._lock:
+                self._rebuild(self._files)
+        return self
+
+    def _rebuild(self, previous):
+        dir_mtime = self._stat_dir()
+        files = {}
+        if dir_mtime is not None:
+            with os.scandir(self.video_dir) as entries:
+                for entry in entries:
+                    if not entry.is_file() or not entry.name.lower().endswith(VIDEO_EXTS):
+                        continue
+                    st = entry.stat()
+                    old = previous.get(entry.name)
+                    if old and old.get("size") == st.st_size and old.get("mtime_ns") == st.st_mtime_ns:
+                        duration = old.get("duration", 0.0)   # unchanged file, skip probing
+                    else:
+                        duration = probe_duration(entry.path)
+                    files[entry.name] = {
+                        "size": st.st_size, "mtime_ns": st.st_mtime_ns, "duration": duration,
+                    }
+        self._set_files(files, dir_mtime)
+        self._write_cache()
+
+    def _set_files(self, files, dir_mtime):
+        by_key = {}
+        for name in files:
+            by_key.setdefault(clip_key(name), []).append(name)
+        for names in by_key.values():
+            # Deterministic: the plain "ب.mp4" first, then its numbered takes
+            names.sort(key=lambda n: (len(n), n))
+        self._files = files
+        self._by_key = by_key
+        self._dir_mtime = dir_mtime
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data if data.get("format") == INDEX_FORMAT else None
+
+    def _write_cache(self):
+        data = {"format": INDEX_FORMAT, "dir_mtime_ns": self._dir_mtime, "files": self._files}
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp = self.cache_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            pass  # the in-memory index still works; we just re-probe next launch
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_clip_index(video_dir: str) -> ClipIndex:
+    """Shared, lazily loaded index per dataset directory (safe to call from any thread)."""
+    key = os.path.abspath(video_dir)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = ClipIndex(video_dir).load()
+    return index.refresh_if_stale()
@@ -0,0 +1,165 @@
+# services/clip_preloader.py
+
+from collections import OrderedDict
+
+from kivy.graphics.texture import Texture
+
+# ─── Decoder warm pool ───────────────────────────────────────────────────────
+# A handful of Video widgets that open upcoming clips ahead of time and park
+# on their first frame, so the file open + decoder setup is off the critical
+# path. The first decoded frame of every clip is also kept (LRU, byte budget)
+# so a clip that isn't warm yet can show its opening frame instantly.
+# The frame is copied when the widget's texture first changes for a clip —
+# `loaded` fires before any frame has been decoded into it.
+FIRST_FRAME_BUDGET = 32 * 1024 * 1024
+
+
+class FirstFrameCache:
+    def __init__(self, budget_bytes=FIRST_FRAME_BUDGET):
+        self.budget_bytes = budget_bytes
+        self.bytes = 0
+        self._frames = OrderedDict()   # path → (texture, nbytes)
+
+    def __contains__(self, path):
+        return path in self._frames
+
+    def __len__(self):
+        return len(self._frames)
+
+    def get(self, path):
+        entry = self._frames.get(path)
+        if entry is None:
+            return None
+        self._frames.move_to_end(path)
+        return entry[0]
+
+    def put(self, path, texture):
+        """Keep a GPU-side copy of `texture` (the Video reuses its own)."""
+        if texture is None or path in self._frames:
+            return
+        width, height = texture.size
+        nbytes = width * height * 4
+        if nbytes > self.budget_bytes:
+            return
+        copy = Texture.create(size=texture.size, colorfmt='rgba')
+        copy.blit_buffer(texture.pixels, colorfmt='rgba', bufferfmt='ubyte')
+        copy.uvpos = texture.uvpos
+        copy.uvsize = texture.uvsize
+        self._frames[path] = (copy, nbytes)
+        self.bytes += nbytes
+        while self.bytes > self.budget_bytes:
+            _, (_, evicted) = self._frames.popitem(last=False)
+            self.bytes -= evicted
+
+    def clear(self):
+        self._frames.clear()
+        self.bytes = 0
+
+
+class DecoderPool:
+    """
+    Owns the Video widgets. Each one is idle, warming (opening a clip) or
+    ready (paused on the clip's first frame). `on_ready(video)` fires when a
+    warming widget gets its first frame.
+    """
+
+    def __init__(self, videos, frame_cache=None):
+        self.videos = list(videos)
+        self.frame_cache = frame_cache if frame_cache is not None else FirstFrameCache()
+        self.on_ready = None
+        self._path = {v: None for v in self.videos}
+        self._ready = set()
+        for video in self.videos:
+            video.bind(loaded=self._on_loaded, texture=self._on_texture)
+
+    # ─── Queries ─────────────────────────────────────────────────────────────
+    def path_of(self, video):
+        return self._path.get(video)
+
+    def is_ready(self, video):
+        return video in self._ready
+
+    def holder(self, path, exclude=()):
+        """A widget already opened on `path`, ready ones first."""
+        candidates = [v for v in self.videos if self._path[v] == path and v not in exclude]
+        candidates.sort(key=lambda v: v not in self._ready)
+        return candidates[0] if candidates else None
+
+    # ─── Loading ─────────────────────────────────────────────────────────────
+    def load(self, path, exclude=()):
+        video = self.holder(path, exclude)
+        if video is not None:
+            return video
+        free = [v for v in self.videos if v not in exclude]
+        if not free:
+            return None
+        # Prefer an idle widget; otherwise reuse the first non-excluded one
+        video = next((v for v in free if self._path[v] is None), free[0])
+        self._open(video, path)
+        return video
+
+    def prefetch(self, paths, busy=()):
+        """
+        Warm the next clips in order, one widget per occurrence (so "ككك"
+        gets three warm decoders). Widgets holding clips no longer wanted
+        are recycled; widgets in `busy` are never touched.
+        """
+        claimed = set(busy)
+        missing = []
+        for path in paths:
+            video = self.holder(path, exclude=claimed)
+            if video is None:
+                missing.append(path)
+            else:
+                claimed.add(video)
+        for path in missing:
+            free = [v for v in self.videos if v not in claimed]
+            if not free:
+                break
+            video = next((v for v in free if self._path[v] is None), free[0])
+            self._open(video, path)
+            claimed.add(video)
+
+    def release(self, video):
+        """Unload the widget, so opening the same path again fires `loaded` anew."""
+        self._path[video] = None
+        self._ready.discard(video)
+        video.state = 'stop'
+        video.unload()
+        video.source = ''
+
+    def reset(self):
+        for video in self.videos:
+            self.release(video)
+
+    def _open(self, video, path):
+        self._path[video] = path
+        self._ready.discard(video)
+        video.opacity = 0
+        if video.source == path and video.loaded:
+            # Same source still open ("باب" reusing the widget of the first
+            # ب): no new `loaded` will come, so it's ready as it is
+            video.seek(0)
+            video.state = 'pause'
+            self._ready.add(video)
+            return
+        video.source = path
+        video.state = 'play'   # decode until the first frame, then park
+
+    def _on_loaded(self, video, loaded):
+        path = self._path.get(video)
+        if not loaded or path is None or video in self._ready:
+            return
+        self._ready.add(video)
+        video.state = 'pause'
+        if self.on_ready:
+            self.on_ready(video)
+
+    def _on_texture(self, video, texture):
+        path = self._path.get(video)
+        if path is None or texture is None or path in self.frame_cache:
+            return
+        try:
+            self.frame_cache.put(path, texture)
+        except Exception:
+            pass
@@ -0,0 +1,199 @@
+# services/credentials.py
+
+import argparse
+import base64
+import hashlib
+import hmac
+import getpass
+import os
+import secrets
+import threading
+import time
+
+# ─── Password hashing ────────────────────────────────────────────────────────
+# Passwords are stored as salted scrypt hashes (hashlib, no extra package):
+#   "scrypt$<n>$<r>$<p>$<salt b64>$<hash b64>"
+# Each record carries its own cost, so raising SCRYPT_N later only affects
+# new hashes; older ones are re-hashed on the user's next successful login,
+# the same way legacy plaintext entries are migrated.
+#
+# SCRYPT_N is sized so one verification stays around TARGET_LOGIN_MS on the
+# slowest phone we target (2^14 ≈ 16 MB, ~40 ms on a desktop, a few hundred
+# ms on a low-end ARM phone). Re-check on a device with
+#   python -m services.credentials --benchmark
+# and override with SLINGO_SCRYPT_N if needed.
+SCRYPT_N = int(os.environ.get("SLINGO_SCRYPT_N", 1 << 14))
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+HASH_BYTES = 32
+TARGET_LOGIN_MS = 500
+
+# Successful verifications are remembered for a while, so logging out and
+# back in during a session doesn't pay the scrypt cost again
+VERIFY_CACHE_SECONDS = 10 * 60
+
+# There is no built-in admin: the first one is created explicitly with
+#   python -m services.credentials --create-admin <username>
+# which asks for a password (or, with --generate, prints a random one once).
+
+_PREFIX = "scrypt$"
+_cache_key = os.urandom(32)   # per process: cache entries reveal nothing on disk
+_verified = {}                # digest → expiry
+_lock = threading.Lock()
+
+
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+        maxmem=128 * r * (n + p + 2) + (1 << 20), dklen=HASH_BYTES,
+    )
+
+
+def hash_password(password: str, n=None, r=SCRYPT_R, p=SCRYPT_P) -> str:
+    n = n or SCRYPT_N
+    salt = os.urandom(SALT_BYTES)
+    digest = _scrypt(password, salt, n, r, p)
+    return "$".join(("scrypt", str(n), str(r), str(p),
+                     base64.b64encode(salt).decode("ascii"),
+                     base64.b64encode(digest).decode("ascii")))
+
+
+def is_hashed(stored) -> bool:
+    return isinstance(stored, str) and stored.startswith(_PREFIX)
+
+
+def _parse(stored):
+    _, n, r, p, salt, digest = stored.split("$")
+    return int(n), int(r), int(p), base64.b64decode(salt), base64.b64decode(digest)
+
+
+def needs_rehash(stored) -> bool:
+    """Plaintext, or hashed with a lower cost than the current settings."""
+    if not is_hashed(stored):
+        return True
+    try:
+        n, r, p, _, _ = _parse(stored)
+    except ValueError:
+        return True
+    return (n, r, p) < (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+
+
+def verify_password(password: str, stored) -> bool:
+    if not isinstance(stored, str) or not stored:
+        return False
+    if not is_hashed(stored):
+        # Legacy plaintext entry (migrated by authenticate() on success)
+        return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+
+    cache_key = hmac.new(_cache_key, f"{stored}\0{password}".encode("utf-8"), hashlib.sha256).digest()
+    now = time.monotonic()
+    with _lock:
+        if _verified.get(cache_key, 0) > now:
+            return True
+    try:
+        n, r, p, salt, expected = _parse(stored)
+        ok = hmac.compare_digest(_scrypt(password, salt, n, r, p), expected)
+    except (ValueError, MemoryError):
+        return False
+    if ok:
+        with _lock:
+            for key in [k for k, expiry in _verified.items() if expiry <= now]:
+                del _verified[key]
+            _verified[cache_key] = now + VERIFY_CACHE_SECONDS
+    return ok
+
+
+def authenticate(storage, username: str, password: str):
+    """
+    The user's record if the password matches, else None. Plaintext or
+    under-cost hashes are upgraded in place on success.
+    """
+    record = storage.get_user(username)
+    if not record or not verify_password(password, record.get("password")):
+        return None
+    if needs_rehash(record.get("password")):
+        record = {**record, "password": hash_password(password)}
+        storage.save_user(username, record)
+    return record
+
+
+def is_admin(record) -> bool:
+    return bool(record) and record.get("role") == "admin"
+
+
+def create_admin(storage, username: str, password: str) -> bool:
+    """Add a new admin account; False (nothing changed) if the name is taken."""
+    return storage.create_user(username, {"password": hash_password(password), "role": "admin"})
+
+
+# ─── Benchmark ───────────────────────────────────────────────────────────────
+def time_hash(n, r=SCRYPT_R, p=SCRYPT_P, rounds=3) -> float:
+    """Best-of-`rounds` seconds for one scrypt hash at cost n."""
+    salt = os.urandom(SALT_BYTES)
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        _scrypt("benchmark-password", salt, n, r, p)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def calibrate(target_ms=TARGET_LOGIN_MS, max_log2=20):
+    """[(n, ms)] for n = 2^10 … and the largest n within target_ms on this machine."""
+    results = []
+    chosen = 1 << 10
+    for log2 in range(10, max_log2 + 1):
+        n = 1 << log2
+        ms = time_hash(n) * 1000
+        results.append((n, ms))
+        if ms > target_ms:
+            break
+        chosen = n
+    return results, chosen
+
+
+def _create_admin_command(username, generate):
+    from services.storage import get_storage
+    if generate:
+        password = secrets.token_urlsafe(12)
+    else:
+        password = getpass.getpass(f"Password for {username}: ")
+        if not password or password != getpass.getpass("Repeat: "):
+            raise SystemExit("❌ Passwords are empty or don't match")
+    if not create_admin(get_storage(), username, password):
+        raise SystemExit(f"❌ User '{username}' already exists; nothing was changed")
+    print(f"✅ Admin '{username}' created")
+    if generate:
+        print(f"   One-time password (shown only now, change it after logging in): {password}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Admin accounts and password hashing cost.")
+    parser.add_argument("--benchmark", action="store_true", help="time scrypt at increasing cost")
+    parser.add_argument("--create-admin", metavar="USERNAME", help="add an admin account")
+    parser.add_argument("--generate", action="store_true",
+                        help="with --create-admin: generate a one-time password and print it")
+    parser.add_argument("--target-ms", type=float, default=TARGET_LOGIN_MS,
+                        help=f"login time budget (default {TARGET_LOGIN_MS} ms)")
+    args = parser.parse_args()
+    if args.create_admin:
+        _create_admin_command(args.create_admin, args.generate)
+        return
+    if not args.benchmark:
+        parser.print_help()
+        return
+
+    current_ms = time_hash(SCRYPT_N) * 1000
+    print(f"Current cost: n=2^{SCRYPT_N.bit_length() - 1}, r={SCRYPT_R}, p={SCRYPT_P} "
+          f"→ {current_ms:.1f} ms per login, {128 * SCRYPT_R * SCRYPT_N / 2**20:.0f} MB")
+    results, chosen = calibrate(args.target_ms)
+    print(f"\n{'n':>10} {'ms':>9} {'memory':>8}")
+    for n, ms in results:
+        print(f"{'2^' + str(n.bit_length() - 1):>10} {ms:9.1f} {128 * SCRYPT_R * n / 2**20:6.0f} MB")
+    print(f"\nLargest cost within {args.target_ms:.0f} ms here: n=2^{chosen.bit_length() - 1} "
+          f"(set SLINGO_SCRYPT_N={chosen})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# services/document_ingest.py
+
+import os
+import re
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# ─── Whole-document ingestion ────────────────────────────────────────────────
+# Every page of a PDF → paragraphs, streamed to the UI in page order.
+#   1. Pages with an embedded text layer are read with pdftotext (poppler,
+#      already required by pdf2image): no rasterizing, no OCR.
+#   2. The remaining (scanned) pages are OCR'd on a small thread pool, with
+#      tesseract's automatic page segmentation grouping words into paragraphs.
+#      The heavy steps are already separate processes (pdftoppm via
+#      pdf2image, the tesseract binary via pytesseract) and OpenCV releases
+#      the GIL, so threads are enough — worker processes would re-import
+#      main.py and with it the whole Kivy UI.
+OCR_DPI = 300
+OCR_LANG = "ara"
+# A page's text layer counts only if it has at least this many Arabic letters
+MIN_TEXT_LAYER_LETTERS = 20
+
+_ARABIC_LETTER_RE = re.compile(r"[ء-ي]")
+_PARAGRAPH_BREAK_RE = re.compile(r"\n\s*\n")
+
+
+def text_layer_pages(path: str) -> list:
+    """Embedded text per page (pdftotext separates pages with form feeds)."""
+    try:
+        result = subprocess.run(
+            ["pdftotext", "-enc", "UTF-8", path, "-"],
+            check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return []
+    pages = result.stdout.decode("utf-8", errors="replace").split("\f")
+    if pages and not pages[-1].strip():
+        pages.pop()   # trailing form feed
+    return pages
+
+
+def has_text_layer(page_text: str) -> bool:
+    return len(_ARABIC_LETTER_RE.findall(page_text)) >= MIN_TEXT_LAYER_LETTERS
+
+
+def split_paragraphs(page_text: str) -> list:
+    paragraphs = (" ".join(p.split()) for p in _PARAGRAPH_BREAK_RE.split(page_text))
+    return [p for p in paragraphs if p]
+
+
+def ocr_page(path, page, dpi=OCR_DPI, lang=OCR_LANG, tesseract_cmd=None, file_sha=None):
+    """
+    Worker-thread entry point: rasterize one page, clean it up and OCR it
+    with automatic layout analysis (--psm 3). Returns (page, [paragraph, ...]).
+    Cached by PDF content + page, so re-importing a document skips rendering too.
+    """
+    from services import ocr_cache
+    from services.ocr_preprocess import PREPROCESS_VERSION, preprocess
+
+    key = None
+    if file_sha:
+        key = ocr_cache.content_key("pdf-page", file_sha, page, dpi, lang, PREPROCESS_VERSION)
+        cached = ocr_cache.get(key)
+        if cached is not None:
+            return page, [p for p in cached.split("\n") if p]
+
+    import numpy as np
+    import pytesseract
+    from pdf2image import convert_from_path
+    if tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    image = convert_from_path(path, dpi=dpi, first_page=page, last_page=page, grayscale=True)[0]
+    data = pytesseract.image_to_data(
+        preprocess(np.asarray(image)), lang=lang, config="--psm 3",
+        output_type=pytesseract.Output.DICT
+    )
+    blocks = {}   # (block, paragraph) → {line: [words]}, in reading order
+    for i, word in enumerate(data["text"]):
+        word = word.strip()
+        if not word or float(data["conf"][i]) < 0:
+            continue
+        block = (data["block_num"][i], data["par_num"][i])
+        blocks.setdefault(block, {}).setdefault(data["line_num"][i], []).append(word)
+    paragraphs = [" ".join(" ".join(words) for words in lines.values()) for lines in blocks.values()]
+    if key:
+        ocr_cache.put(key, "\n".join(paragraphs))
+    return page, paragraphs
+
+
+class DocumentIngest:
+    """
+    Runs one document in the background. Callbacks fire on the Kivy thread:
+      on_paragraphs(page, paragraphs)   in page order, as soon as possible
+      on_progress(done, total)
+      on_done(stats)                    {"pages", "text_layer", "ocr"}
+      on_error(exc)
+    """
+
+    def __init__(self, path, on_paragraphs, on_progress=None, on_done=None, on_error=None,
+                 workers=None, dpi=OCR_DPI, lang=OCR_LANG):
+        self.path = path
+        self.on_paragraphs = on_paragraphs
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.dpi = dpi
+        self.lang = lang
+        self._cancelled = threading.Event()
+        self._ready = {}        # page → paragraphs, waiting for earlier pages
+        self._next_page = 1
+        self._done = 0
+        self._total = 0
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    # ─── Worker side ─────────────────────────────────────────────────────────
+    def _call(self, callback, *args):
+        if callback is None or self.cancelled:
+            return
+        from kivy.clock import Clock
+        Clock.schedule_once(lambda dt: callback(*args))
+
+    def _finish_page(self, page, paragraphs):
+        self._done += 1
+        self._ready[page] = paragraphs
+        # Stream in order: release every page whose predecessors are done
+        while self._next_page in self._ready:
+            released = self._ready.pop(self._next_page)
+            if released:
+                self._call(self.on_paragraphs, self._next_page, released)
+            self._next_page += 1
+        self._call(self.on_progress, self._done, self._total)
+
+    def _run(self):
+        try:
+            from services.pdf_pages import page_count
+            self._total = page_count(self.path)
+            layer = text_layer_pages(self.path)
+
+            scanned = []
+            for page in range(1, self._total + 1):
+                text = layer[page - 1] if page <= len(layer) else ""
+                if has_text_layer(text):
+                    self._finish_page(page, split_paragraphs(text))
+                else:
+                    scanned.append(page)
+            if scanned and not self.cancelled:
+                self._ocr_pages(scanned)
+        except Exception as e:
+            self._call(self.on_error, e)
+            return
+        if not self.cancelled:
+            self._call(self.on_done, {
+                "pages": self._total,
+                "text_layer": self._total - len(scanned),
+                "ocr": len(scanned),
+            })
+
+    def _ocr_pages(self, pages):
+        import pytesseract
+        from services.ocr_cache import file_digest
+        cmd = pytesseract.pytesseract.tesseract_cmd
+        file_sha = file_digest(self.path)
+        executor = ThreadPoolExecutor(max_workers=min(self.workers, len(pages)),
+                                      thread_name_prefix="document-ocr")
+        try:
+            futures = [executor.submit(ocr_page, self.path, p, self.dpi, self.lang, cmd, file_sha)
+                       for p in pages]
+            for future in as_completed(futures):
+                if self.cancelled:
+                    break
+                page, paragraphs = future.result()
+                self._finish_page(page, paragraphs)
+        finally:
+            executor.shutdown(wait=not self.cancelled, cancel_futures=True)
@@ -0,0 +1,164 @@
+# services/history_store.py
+
+import json
+import os
+import threading
+import time
+
+from services.atomic_io import atomic_write, file_lock
+
+# ─── Translation history (append-only JSONL) ─────────────────────────────────
+# One JSON object per line:
+#   {"id": "18c2…", "time": "2025-06-01 10:12", "text": "…"}   an entry
+#   {"del": "18c2…"}                                          a tombstone
+# Saving a translation appends one line (O(1), fsync'd); a torn last line
+# from a crash is simply skipped. The popup reads the newest N entries by
+# scanning backwards from the end of the file. Deletes append tombstones,
+# and the file is rewritten without dead lines once enough pile up. Appends
+# and rewrites take the file lock, so a compaction in one app instance can
+# never drop a line another instance is appending.
+COMPACT_AFTER_TOMBSTONES = 50
+_TAIL_CHUNK = 8192
+
+
+class HistoryStore:
+    def __init__(self, path="history.jsonl", legacy_path="history.json"):
+        self.path = path
+        self.legacy_path = legacy_path
+        self._lock = threading.Lock()
+        self._tombstones = None   # counted lazily on the first delete
+        self._tail_checked = False
+        self._migrate_legacy()
+
+    # ─── Writes ──────────────────────────────────────────────────────────────
+    def _append(self, record):
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with file_lock(self.path), open(self.path, "ab+") as f:
+            if not self._tail_checked:
+                # Terminate a line torn by an earlier crash so ours starts clean
+                f.seek(0, os.SEEK_END)
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        line = b"\n" + line
+                self._tail_checked = True
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def add(self, text, when=None) -> dict:
+        entry = {
+            "id": f"{time.time_ns():x}",
+            "time": when or time.strftime("%Y-%m-%d %H:%M"),
+            "text": text,
+        }
+        with self._lock:
+            self._append(entry)
+        return entry
+
+    def delete(self, entry_id) -> None:
+        with self._lock:
+            if self._tombstones is None:
+                self._tombstones = sum(1 for r in self._records() if "del" in r)
+            self._append({"del": entry_id})
+            self._tombstones += 1
+            if self._tombstones >= COMPACT_AFTER_TOMBSTONES:
+                self._compact()
+
+    def compact(self) -> None:
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        with file_lock(self.path):
+            live = self._live_entries()
+            atomic_write(self.path, "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in live))
+        self._tombstones = 0
+        self._tail_checked = True
+
+    # ─── Reads ───────────────────────────────────────────────────────────────
+    def _records(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue   # torn write
+        except OSError:
+            return
+
+    def _live_entries(self):
+        entries = {}
+        for record in self._records():
+            if "del" in record:
+                entries.pop(record["del"], None)
+            elif "id" in record:
+                entries[record["id"]] = record
+        return list(entries.values())
+
+    def all(self) -> list:
+        """Every live entry, oldest first (full scan; the UI uses tail())."""
+        with self._lock:
+            return self._live_entries()
+
+    def _lines_backwards(self):
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return
+        with f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            rest = b""
+            while pos > 0:
+                step = min(_TAIL_CHUNK, pos)
+                pos -= step
+                f.seek(pos)
+                lines = (f.read(step) + rest).split(b"\n")
+                rest = lines.pop(0)   # may be a partial line; finish it next chunk
+                for line in reversed(lines):
+                    if line.strip():
+                        yield line
+            if rest.strip():
+                yield rest
+
+    def tail(self, n=10) -> list:
+        """Newest n live entries, newest first, reading only the end of the file."""
+        result = []
+        deleted = set()
+        with self._lock:
+            for line in self._lines_backwards():
+                try:
+                    record = json.loads(line.decode("utf-8"))
+                except ValueError:
+                    continue
+                # A tombstone always comes after the entry it deletes
+                if "del" in record:
+                    deleted.add(record["del"])
+                elif record.get("id") not in deleted:
+                    result.append(record)
+                    if len(result) >= n:
+                        break
+        return result
+
+    # ─── Migration ───────────────────────────────────────────────────────────
+    def _migrate_legacy(self):
+        """One-time conversion of the old history.json list into the log."""
+        if os.path.exists(self.path) or not os.path.exists(self.legacy_path):
+            return
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except (OSError, ValueError):
+            return
+        base = time.time_ns()
+        lines = []
+        for i, entry in enumerate(legacy):
+            if not isinstance(entry, dict) or "text" not in entry:
+                continue
+            record = {"id": f"{base + i:x}", "time": entry.get("time", ""), "text": entry["text"]}
+            lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+        with file_lock(self.path):
+            if not os.path.exists(self.path):   # another instance may have migrated meanwhile
+                atomic_write(self.path, "".join(lines))
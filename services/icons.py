@@ -0,0 +1,37 @@
+# services/icons.py
+
+import json
+
+# ─── Icon lookup ─────────────────────────────────────────────────────────────
+# All of assets/icons/*.png are packed into one atlas by build_icon_atlas.py,
+# so the UI's icons share a single texture: one file open and one upload at
+# start-up, and no texture switches between icons in a list. icon("trash")
+# returns the atlas:// url when the icon is in the atlas, or the loose PNG
+# when the atlas hasn't been built (or predates the icon).
+# Paths are relative to the app's working directory, like the rest of assets/.
+ICON_DIR = "assets/icons"
+ATLAS_NAME = "assets/icons"   # → assets/icons.atlas + assets/icons-0.png
+
+_atlas_ids = None
+
+
+def _load_atlas_ids():
+    ids = set()
+    try:
+        with open(ATLAS_NAME + ".atlas", "r", encoding="utf-8") as f:
+            pages = json.load(f)
+    except (OSError, ValueError):
+        return ids
+    for regions in pages.values():
+        ids.update(regions)
+    return ids
+
+
+def icon(name: str) -> str:
+    """Image source for assets/icons/<name>.png."""
+    global _atlas_ids
+    if _atlas_ids is None:
+        _atlas_ids = _load_atlas_ids()
+    if name in _atlas_ids:
+        return f"atlas://{ATLAS_NAME}/{name}"
+    return f"{ICON_DIR}/{name}.png"
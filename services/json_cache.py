@@ -0,0 +1,151 @@
+# services/json_cache.py
+
+import atexit
+import copy
+import json
+import os
+import threading
+
+from services.atomic_io import atomic_write, file_lock
+
+# ─── Shared JSON file cache ──────────────────────────────────────────────────
+# One parsed copy per path, reused until the file's (mtime_ns, size) changes,
+# so the home screen, dashboard search and login stop re-parsing the same
+# JSON on every visit / keystroke / attempt. Writes go through the cache:
+# the new data is written atomically (atomic_io) and becomes the cached copy.
+# Cached objects are shared — treat what load() returns as read-only and
+# use edit() / queue_edit() to change a file.
+#
+# Edits are read-modify-write cycles under the file's advisory lock, so two
+# app instances can't interleave and drop each other's changes:
+#   edit()        runs now, against the file as it is on disk.
+#   queue_edit()  applies to an in-memory view at once (load() sees it) and
+#                 is written out with any others made within BATCH_DELAY.
+#                 At flush time the file is checked optimistically: if no one
+#                 else wrote it since the view was taken, the view is written
+#                 as is; otherwise the queued edits are replayed onto the
+#                 fresh contents.
+BATCH_DELAY = 0.5
+
+_entries = {}   # path → (stamp, data)
+_metrics = {}   # path → {"parses", "hits", "writes", "conflicts"}
+_pending = {}   # path → {"base", "view", "edits", "default", "timer"}
+_lock = threading.RLock()
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _count(path, metric):
+    counts = _metrics.setdefault(path, {"parses": 0, "hits": 0, "writes": 0, "conflicts": 0})
+    counts[metric] += 1
+
+
+def load(path, default=None):
+    """Parsed contents of `path` (plus queued edits), re-read only when the file has changed."""
+    path = os.path.abspath(path)
+    with _lock:
+        pending = _pending.get(path)
+        if pending is not None:
+            _count(path, "hits")
+            return pending["view"]
+        stamp = _stamp(path)
+        cached = _entries.get(path)
+        if cached is not None and stamp is not None and cached[0] == stamp:
+            _count(path, "hits")
+            return cached[1]
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            _entries.pop(path, None)
+            return default
+        _count(path, "parses")
+        _entries[path] = (stamp, data)
+        return data
+
+
+def store(path, data):
+    """Write `data` atomically and make it the cached copy."""
+    path = os.path.abspath(path)
+    with _lock:
+        atomic_write(path, json.dumps(data, ensure_ascii=False, indent=2))
+        _count(path, "writes")
+        _entries[path] = (_stamp(path), data)
+
+
+def edit(path, mutate, default=None):
+    """Locked load → mutate(a private copy) → store, right now. Returns mutate's result."""
+    path = os.path.abspath(path)
+    flush(path)
+    with file_lock(path), _lock:
+        data = copy.deepcopy(load(path, default))
+        result = mutate(data)
+        store(path, data)
+        return result
+
+
+def queue_edit(path, mutate, default=None):
+    """Apply mutate() to the in-memory view now; write it out within BATCH_DELAY."""
+    path = os.path.abspath(path)
+    with _lock:
+        pending = _pending.get(path)
+        if pending is None:
+            data = load(path, default)
+            cached = _entries.get(path)
+            timer = threading.Timer(BATCH_DELAY, flush, args=(path,))
+            timer.daemon = True
+            pending = _pending[path] = {
+                "base": cached[0] if cached is not None else None,
+                "view": copy.deepcopy(data),
+                "edits": [],
+                "default": default,
+                "timer": timer,
+            }
+            timer.start()
+        result = mutate(pending["view"])
+        pending["edits"].append(mutate)
+        return result
+
+
+def flush(path=None):
+    """Write out queued edits (for one path, or all of them)."""
+    with _lock:
+        paths = [os.path.abspath(path)] if path is not None else list(_pending)
+    for p in paths:
+        with file_lock(p), _lock:
+            pending = _pending.pop(p, None)
+            if pending is None:
+                continue
+            pending["timer"].cancel()
+            if _stamp(p) == pending["base"]:
+                data = pending["view"]
+            else:
+                # Someone else wrote the file since our view was taken
+                _count(p, "conflicts")
+                data = copy.deepcopy(load(p, pending["default"]))
+                for mutate in pending["edits"]:
+                    mutate(data)
+            store(p, data)
+
+
+atexit.register(flush)
+
+
+def invalidate(path=None):
+    with _lock:
+        if path is None:
+            _entries.clear()
+        else:
+            _entries.pop(os.path.abspath(path), None)
+
+
+def metrics() -> dict:
+    """{path: {"parses", "hits", "writes", "conflicts"}} since start-up."""
+    with _lock:
+        return {path: dict(counts) for path, counts in _metrics.items()}
@@ -0,0 +1,255 @@
+# services/model_registry.py
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+# ─── Registry layout ─────────────────────────────────────────────────────────
+#   models/registry/<version>/model.h5 | model.tflite
+#   models/registry/<version>/manifest.json
+#   models/registry/ACTIVE          ← name of the version the app should use
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(BASE_DIR, "models")
+REGISTRY_DIR = os.path.join(MODELS_DIR, "registry")
+ACTIVE_FILE = os.path.join(REGISTRY_DIR, "ACTIVE")
+MANIFEST_NAME = "manifest.json"
+
+LEGACY_MODEL = os.path.join(MODELS_DIR, "asl_model.h5")
+LEGACY_LABEL_MAP = os.path.join(MODELS_DIR, "label_map.npy")
+
+DEFAULT_NORMALIZATION = {"scale": 1.0 / 255.0, "offset": 0.0}
+ARTIFACT_NAMES = {"keras": "model.h5", "tflite": "model.tflite"}
+
+
+class RegistryError(Exception):
+    """Raised when a registry entry is missing, incomplete or corrupted."""
+
+
+def sha256_of(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json_atomic(path: str, data) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# ─── Queries ─────────────────────────────────────────────────────────────────
+def list_versions() -> list:
+    """All versions that have a manifest, oldest first."""
+    if not os.path.isdir(REGISTRY_DIR):
+        return []
+    return sorted(
+        v for v in os.listdir(REGISTRY_DIR)
+        if os.path.isfile(os.path.join(REGISTRY_DIR, v, MANIFEST_NAME))
+    )
+
+
+def active_version():
+    """The version named in ACTIVE, else the newest one, else None."""
+    try:
+        with open(ACTIVE_FILE, "r", encoding="utf-8") as f:
+            version = f.read().strip()
+        if version and os.path.isfile(os.path.join(REGISTRY_DIR, version, MANIFEST_NAME)):
+            return version
+    except OSError:
+        pass
+    versions = list_versions()
+    return versions[-1] if versions else None
+
+
+def active_stamp():
+    """
+    Cheap change token for polling: (ACTIVE mtime, newest version).
+    Two stat calls and a listdir, no file is parsed.
+    """
+    try:
+        mtime = os.stat(ACTIVE_FILE).st_mtime_ns
+    except OSError:
+        mtime = None
+    versions = list_versions()
+    return mtime, versions[-1] if versions else None
+
+
+def set_active(version: str) -> None:
+    if not os.path.isfile(os.path.join(REGISTRY_DIR, version, MANIFEST_NAME)):
+        raise RegistryError(f"Unknown model version: {version}")
+    tmp = ACTIVE_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(tmp, ACTIVE_FILE)
+
+
+def load_manifest(version: str) -> dict:
+    path = os.path.join(REGISTRY_DIR, version, MANIFEST_NAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise RegistryError(f"Cannot read manifest for {version}: {e}")
+    for key in ("classes", "input_size", "backend", "artifact", "sha256"):
+        if key not in manifest:
+            raise RegistryError(f"Manifest for {version} is missing '{key}'")
+    manifest.setdefault("normalization", dict(DEFAULT_NORMALIZATION))
+    manifest["version"] = version
+    return manifest
+
+
+# ─── Publishing ──────────────────────────────────────────────────────────────
+def new_version_name() -> str:
+    name = time.strftime("%Y%m%d-%H%M%S")
+    suffix = 1
+    candidate = name
+    while os.path.exists(os.path.join(REGISTRY_DIR, candidate)):
+        suffix += 1
+        candidate = f"{name}-{suffix}"
+    return candidate
+
+
+def publish(artifact_path: str, classes, input_size: int, backend: str = "keras",
+            normalization=None, extra=None, activate: bool = True) -> str:
+    """
+    Copy a trained artifact into a new registry version, write its manifest
+    and (optionally) make it the active model. Returns the version name.
+    """
+    if backend not in ARTIFACT_NAMES:
+        raise RegistryError(f"Unsupported backend: {backend}")
+    os.makedirs(REGISTRY_DIR, exist_ok=True)
+    version = new_version_name()
+    version_dir = os.path.join(REGISTRY_DIR, version)
+    os.makedirs(version_dir)
+
+    artifact = ARTIFACT_NAMES[backend]
+    target = os.path.join(version_dir, artifact)
+    shutil.copyfile(artifact_path, target)
+
+    manifest = {
+        "classes": [str(c) for c in classes],
+        "input_size": int(input_size),
+        "normalization": normalization or dict(DEFAULT_NORMALIZATION),
+        "backend": backend,
+        "artifact": artifact,
+        "sha256": sha256_of(target),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    if extra:
+        manifest.update(extra)
+    _write_json_atomic(os.path.join(version_dir, MANIFEST_NAME), manifest)
+
+    if activate:
+        set_active(version)
+    return version
+
+
+def migrate_legacy():
+    """
+    One-time import of models/asl_model.h5 + the pickled models/label_map.npy
+    into the registry. The pickle is only ever read here, from our own
+    training output; everything afterwards reads the JSON manifest.
+    Returns the new version name, or None if there is nothing to migrate.
+    """
+    if list_versions() or not (os.path.isfile(LEGACY_MODEL) and os.path.isfile(LEGACY_LABEL_MAP)):
+        return None
+    label_map = np.load(LEGACY_LABEL_MAP, allow_pickle=True).item()
+    classes = [label_map[i] for i in sorted(label_map)]
+    return publish(LEGACY_MODEL, classes, input_size=128, backend="keras",
+                   extra={"migrated_from": "asl_model.h5"})
+
+
+# ─── Loading ─────────────────────────────────────────────────────────────────
+def artifact_path(version: str) -> str:
+    return os.path.join(REGISTRY_DIR, version, load_manifest(version)["artifact"])
+
+
+class LoadedModel:
+    """
+    A ready-to-run classifier: the backend object plus everything from the
+    manifest needed to preprocess input and decode output.
+    """
+
+    def __init__(self, manifest: dict, runner):
+        self.manifest = manifest
+        self.version = manifest["version"]
+        self.classes = manifest["classes"]
+        self.img_size = manifest["input_size"]
+        self.backend = manifest["backend"]
+        self._scale = float(manifest["normalization"].get("scale", 1.0))
+        self._offset = float(manifest["normalization"].get("offset", 0.0))
+        self._runner = runner
+
+    def preprocess(self, bgr_images) -> np.ndarray:
+        """uint8 batch (N, H, W, 3) already resized → normalized float32."""
+        batch = np.asarray(bgr_images, dtype=np.float32)
+        return batch * self._scale + self._offset
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """Normalized float32 batch → class probabilities (N, num_classes)."""
+        return self._runner(batch)
+
+    def label(self, class_id: int) -> str:
+        return self.classes[int(class_id)]
+
+
+def _keras_runner(path):
+    from tensorflow.keras.models import load_model
+    model = load_model(path, compile=False)
+
+    def run(batch):
+        # Direct call avoids predict()'s per-call tf.data setup for tiny batches
+        return np.asarray(model(batch, training=False))
+    return run
+
+
+def _tflite_runner(path):
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        from tensorflow.lite import Interpreter
+    interpreter = Interpreter(model_path=path)
+    interpreter.allocate_tensors()
+    inp = interpreter.get_input_details()[0]
+    out = interpreter.get_output_details()[0]
+
+    def run(batch):
+        results = []
+        for sample in batch:
+            interpreter.set_tensor(inp["index"], sample[np.newaxis].astype(inp["dtype"]))
+            interpreter.invoke()
+            results.append(interpreter.get_tensor(out["index"])[0])
+        return np.asarray(results)
+    return run
+
+
+_RUNNERS = {"keras": _keras_runner, "tflite": _tflite_runner}
+
+
+def load_version(version: str, verify: bool = True) -> LoadedModel:
+    manifest = load_manifest(version)
+    path = artifact_path(version)
+    if not os.path.isfile(path):
+        raise RegistryError(f"Artifact missing for {version}: {path}")
+    if verify and sha256_of(path) != manifest["sha256"]:
+        raise RegistryError(f"Checksum mismatch for {version}")
+    runner_factory = _RUNNERS.get(manifest["backend"])
+    if runner_factory is None:
+        raise RegistryError(f"Unsupported backend: {manifest['backend']}")
+    return LoadedModel(manifest, runner_factory(path))
+
+
+def load_active(verify: bool = True) -> LoadedModel:
+    version = active_version() or migrate_legacy()
+    if version is None:
+        raise RegistryError("No model in registry and no legacy model to migrate")
+    return load_version(version, verify=verify)
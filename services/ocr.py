@@ -0,0 +1,165 @@
+# services/ocr.py
+
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+import numpy as np
+from kivy.clock import Clock
+
+from services import ocr_cache
+from services.ocr_preprocess import PREPROCESS_VERSION, preprocess
+
+# ─── OCR service ─────────────────────────────────────────────────────────────
+# Tesseract off the UI thread. A small pool of worker threads, each holding
+# its own persistent tesserocr API handle (language data loaded once) when
+# tesserocr is installed; otherwise each call falls back to pytesseract,
+# which forks the tesseract binary. Images are cleaned up first (see
+# ocr_preprocess) and results are cached by content hash, so importing the
+# same image again is instant. Callbacks are delivered on the Kivy thread.
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+DEFAULT_LANG = "ara"
+DEFAULT_WORKERS = 2
+MAX_PENDING = 8
+
+
+class OCRQueueFull(Exception):
+    """Raised by submit() when MAX_PENDING jobs are already waiting."""
+
+
+class OCRJob:
+    """
+    Handle for one submitted job (one or more images). `future` resolves to
+    the list of page texts; `progress` is the fraction of images finished.
+    """
+
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.future = None
+        self._cancelled = threading.Event()
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Stop before the next image; results of a cancelled job are dropped."""
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+
+class _Engine:
+    """Per-thread recognizer: one long-lived tesserocr handle, or pytesseract."""
+
+    def __init__(self, lang):
+        self.lang = lang
+        self.api = None
+        if tesserocr is not None:
+            try:
+                self.api = tesserocr.PyTessBaseAPI(lang=lang)
+            except Exception:
+                self.api = None   # missing traineddata etc. → subprocess path
+
+    def recognize(self, gray):
+        gray = np.ascontiguousarray(gray, dtype=np.uint8)
+        if self.api is not None:
+            height, width = gray.shape[:2]
+            self.api.SetImageBytes(gray.tobytes(), width, height, 1, width)
+            return self.api.GetUTF8Text()
+        import pytesseract
+        return pytesseract.image_to_string(gray, lang=self.lang)
+
+
+class OCRService:
+    def __init__(self, workers=DEFAULT_WORKERS, lang=DEFAULT_LANG, max_pending=MAX_PENDING,
+                 preprocess=True):
+        self.lang = lang
+        self.preprocess = preprocess
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr")
+        self._local = threading.local()
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        return "tesserocr" if tesserocr is not None else "pytesseract"
+
+    def _engine(self, lang):
+        engines = getattr(self._local, "engines", None)
+        if engines is None:
+            engines = self._local.engines = {}
+        if lang not in engines:
+            engines[lang] = _Engine(lang)
+        return engines[lang]
+
+    def submit(self, images, lang=None, on_progress=None, on_done=None, on_error=None) -> OCRJob:
+        """
+        Queue grayscale images (a single array or a list of them).
+        on_progress(job), on_done(texts) and on_error(exc) run on the Kivy thread.
+        """
+        if isinstance(images, np.ndarray):
+            images = [images]
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise OCRQueueFull(f"{self._pending} OCR jobs already pending")
+            self._pending += 1
+
+        job = OCRJob(len(images))
+        lang = lang or self.lang
+
+        def run():
+            engine = self._engine(lang)
+            texts = []
+            for image in images:
+                if job.cancelled:
+                    raise CancelledError()
+                key = ocr_cache.content_key(image, lang, PREPROCESS_VERSION if self.preprocess else 0)
+                text = ocr_cache.get(key)
+                if text is None:
+                    text = engine.recognize(preprocess(image) if self.preprocess else image)
+                    ocr_cache.put(key, text)
+                texts.append(text)
+                job.done += 1
+                if on_progress:
+                    Clock.schedule_once(lambda dt: on_progress(job))
+            return texts
+
+        def finished(future):
+            with self._lock:
+                self._pending -= 1
+            if future.cancelled() or job.cancelled:
+                return
+            error = future.exception()
+            if error is not None:
+                if on_error:
+                    Clock.schedule_once(lambda dt: on_error(error))
+            elif on_done:
+                texts = future.result()
+                Clock.schedule_once(lambda dt: on_done(texts))
+
+        job.future = self._executor.submit(run)
+        job.future.add_done_callback(finished)
+        return job
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_service = None
+
+
+def get_ocr_service() -> OCRService:
+    global _service
+    if _service is None:
+        _service = OCRService()
+    return _service
@@ -0,0 +1,78 @@
+# services/ocr_cache.py
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+# ─── OCR result cache ────────────────────────────────────────────────────────
+# Recognized text keyed by a hash of the input content (image bytes, or PDF
+# file hash + page + dpi) and the OCR settings. One small file per entry
+# under cache/ocr/, so the OCR threads and other app instances can all
+# share it without locking; a little LRU sits in front.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OCR_CACHE_DIR = os.path.join(BASE_DIR, "cache", "ocr")
+MEMORY_ENTRIES = 256
+
+_memory = OrderedDict()
+_lock = threading.Lock()
+
+
+def content_key(*parts) -> str:
+    digest = hashlib.sha1()
+    for part in parts:
+        if hasattr(part, "tobytes"):   # numpy array: shape matters too
+            digest.update(repr((part.shape, str(part.dtype))).encode())
+            part = part.tobytes()
+        elif not isinstance(part, bytes):
+            part = repr(part).encode("utf-8")
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _path(key):
+    return os.path.join(OCR_CACHE_DIR, key[:2], key + ".txt")
+
+
+def get(key):
+    with _lock:
+        if key in _memory:
+            _memory.move_to_end(key)
+            return _memory[key]
+    try:
+        with open(_path(key), "r", encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return None
+    _remember(key, text)
+    return text
+
+
+def put(key, text):
+    _remember(key, text)
+    path = _path(key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # memory copy still serves this session
+
+
+def _remember(key, text):
+    with _lock:
+        _memory[key] = text
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_ENTRIES:
+            _memory.popitem(last=False)
@@ -0,0 +1,95 @@
+# services/ocr_preprocess.py
+
+import cv2
+import numpy as np
+
+# ─── OCR preprocessing ───────────────────────────────────────────────────────
+# Grayscale crop → clean, upright, black-on-white binary at the text size
+# tesseract works best with. Every step is a whole-array cv2/NumPy op.
+PREPROCESS_VERSION = 1        # bump when the pipeline changes (invalidates the OCR cache)
+
+# Tesseract is most accurate with glyphs ~20-40 px tall
+TARGET_GLYPH_HEIGHT = 32
+MIN_SCALE, MAX_SCALE = 0.5, 4.0
+MAX_SKEW_DEGREES = 15.0
+THRESHOLD_BLOCK = 31
+THRESHOLD_C = 15
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 3:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return image
+
+
+def binarize(gray: np.ndarray) -> np.ndarray:
+    """Adaptive threshold (handles shadows / uneven lighting on photos); text → 0."""
+    binary = cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, THRESHOLD_BLOCK, THRESHOLD_C
+    )
+    # Light text on a dark background: flip so text is always black
+    if np.count_nonzero(binary) < binary.size // 2:
+        binary = cv2.bitwise_not(binary)
+    return binary
+
+
+def denoise(binary: np.ndarray) -> np.ndarray:
+    """Drop isolated speckles without eroding thin Arabic strokes and dots."""
+    return cv2.medianBlur(binary, 3)
+
+
+def glyph_height(binary: np.ndarray) -> float:
+    """Median height of connected components that look like characters."""
+    count, _, stats, _ = cv2.connectedComponentsWithStats(cv2.bitwise_not(binary), connectivity=8)
+    if count <= 1:
+        return 0.0
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    areas = stats[1:, cv2.CC_STAT_AREA]
+    heights = heights[(areas >= 6) & (heights < binary.shape[0] * 0.5)]
+    return float(np.median(heights)) if heights.size else 0.0
+
+
+def normalize_scale(gray: np.ndarray, binary: np.ndarray):
+    """Resize so text lands at TARGET_GLYPH_HEIGHT (what a fixed DPI would do for scans)."""
+    height = glyph_height(binary)
+    if not height:
+        return gray, 1.0
+    scale = float(np.clip(TARGET_GLYPH_HEIGHT / height, MIN_SCALE, MAX_SCALE))
+    if abs(scale - 1.0) < 0.15:
+        return gray, 1.0
+    interpolation = cv2.INTER_CUBIC if scale > 1 else cv2.INTER_AREA
+    return cv2.resize(gray, None, fx=scale, fy=scale, interpolation=interpolation), scale
+
+
+def skew_angle(binary: np.ndarray) -> float:
+    """Dominant text angle in degrees from the min-area rectangle of ink pixels."""
+    ys, xs = np.nonzero(binary == 0)
+    if xs.size < 50:
+        return 0.0
+    step = max(1, xs.size // 20000)   # subsample big pages, the angle barely changes
+    points = np.column_stack((xs[::step], ys[::step])).astype(np.float32)
+    angle = cv2.minAreaRect(points)[-1]
+    # OpenCV reports (0, 90] or [-90, 0) depending on version; fold to [-45, 45]
+    if angle > 45:
+        angle -= 90
+    elif angle < -45:
+        angle += 90
+    return angle if abs(angle) <= MAX_SKEW_DEGREES else 0.0
+
+
+def deskew(binary: np.ndarray) -> np.ndarray:
+    angle = skew_angle(binary)
+    if abs(angle) < 0.3:
+        return binary
+    h, w = binary.shape
+    matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    return cv2.warpAffine(binary, matrix, (w, h), flags=cv2.INTER_NEAREST,
+                          borderMode=cv2.BORDER_CONSTANT, borderValue=255)
+
+
+def preprocess(image: np.ndarray) -> np.ndarray:
+    """BGR or grayscale uint8 → binary image ready for tesseract."""
+    gray = _to_gray(image)
+    gray, _ = normalize_scale(gray, binarize(gray))
+    binary = denoise(binarize(gray))
+    return deskew(binary)
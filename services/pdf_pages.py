@@ -0,0 +1,123 @@
+# services/pdf_pages.py
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from kivy.clock import Clock
+from kivy.graphics.texture import Texture
+
+# ─── Lazy PDF pages ──────────────────────────────────────────────────────────
+# Pages are rasterized one at a time (pdf2image first_page/last_page) on a
+# background thread, only when the viewer asks for them, and kept in a small
+# LRU. Textures are filled straight from the RGB buffer — no PNG round-trip.
+THUMB_DPI = 60
+OCR_DPI = 300
+THUMB_CACHE_PAGES = 24
+
+
+def page_count(path: str) -> int:
+    from pdf2image import pdfinfo_from_path
+    return int(pdfinfo_from_path(path)["Pages"])
+
+
+def render_page(path: str, page: int, dpi: int) -> np.ndarray:
+    """One page (1-based) → RGB uint8 array (H, W, 3)."""
+    from pdf2image import convert_from_path
+    images = convert_from_path(path, dpi=dpi, first_page=page, last_page=page, fmt="ppm")
+    if not images:
+        raise ValueError(f"Page {page} could not be rendered")
+    return np.asarray(images[0].convert("RGB"))
+
+
+def rgb_texture(rgb: np.ndarray) -> Texture:
+    """Must run on the Kivy thread."""
+    height, width = rgb.shape[:2]
+    texture = Texture.create(size=(width, height), colorfmt="rgb")
+    texture.blit_buffer(np.ascontiguousarray(rgb).tobytes(), colorfmt="rgb", bufferfmt="ubyte")
+    texture.flip_vertical()
+    return texture
+
+
+class PdfPageSource:
+    """
+    Thumbnail provider for one document. `request(page, callback)` returns a
+    cached texture immediately or renders in the background and calls back
+    on the Kivy thread; pages scrolled out of view before their turn are
+    skipped.
+    """
+
+    def __init__(self, path, thumb_dpi=THUMB_DPI, cache_pages=THUMB_CACHE_PAGES):
+        self.path = path
+        self.thumb_dpi = thumb_dpi
+        self.cache_pages = cache_pages
+        self.pages = page_count(path)
+        self._textures = OrderedDict()   # page → Texture
+        self._waiting = {}               # page → [callbacks]
+        self._visible = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-pages")
+        # Separate lane so a picked page never waits behind queued thumbnails
+        self._full_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-full")
+
+    # ─── Thumbnails ──────────────────────────────────────────────────────────
+    def cached(self, page):
+        texture = self._textures.get(page)
+        if texture is not None:
+            self._textures.move_to_end(page)
+        return texture
+
+    def request(self, page, callback):
+        texture = self.cached(page)
+        if texture is not None:
+            return texture
+        with self._lock:
+            self._visible.add(page)
+            if page in self._waiting:
+                self._waiting[page].append(callback)
+                return None
+            self._waiting[page] = [callback]
+        self._executor.submit(self._render_thumb, page)
+        return None
+
+    def forget(self, page):
+        """The viewer recycled this row; don't bother rendering the page."""
+        with self._lock:
+            self._visible.discard(page)
+
+    def _render_thumb(self, page):
+        with self._lock:
+            if page not in self._visible:
+                self._waiting.pop(page, None)
+                return
+        try:
+            rgb = render_page(self.path, page, self.thumb_dpi)
+        except Exception:
+            with self._lock:
+                self._waiting.pop(page, None)
+            return
+        Clock.schedule_once(lambda dt: self._deliver(page, rgb))
+
+    def _deliver(self, page, rgb):
+        texture = rgb_texture(rgb)
+        self._textures[page] = texture
+        while len(self._textures) > self.cache_pages:
+            self._textures.popitem(last=False)
+        with self._lock:
+            callbacks = self._waiting.pop(page, [])
+        for callback in callbacks:
+            callback(page, texture)
+
+    # ─── Full resolution ────────────────────────────────────────────────────
+    def render_full(self, page, on_ready, dpi=OCR_DPI):
+        """High-DPI render of a single page for OCR; on_ready(rgb) on the Kivy thread."""
+        def run():
+            rgb = render_page(self.path, page, dpi)
+            Clock.schedule_once(lambda dt: on_ready(rgb))
+        return self._full_executor.submit(run)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._full_executor.shutdown(wait=False, cancel_futures=True)
+        self._textures.clear()
@@ -0,0 +1,165 @@
+# services/playback.py
+
+from collections import deque
+
+from kivy.clock import Clock
+
+from services.clip_preloader import DecoderPool
+
+# Extra time allowed past a clip's known duration before we assume its EOS
+# event was lost and move on anyway.
+EOS_GRACE = 0.5
+# Used as the safety timeout when the clip index has no duration for a clip.
+UNKNOWN_DURATION = 10.0
+# How long a clip may take to open before it is skipped, so a decoder that
+# never reports `loaded` can't stall the rest of the sequence.
+WARM_TIMEOUT = 3.0
+
+
+class PlaybackScheduler:
+    """
+    Plays a queue of clips back-to-back on a pool of stacked Video widgets.
+
+    Items are (path, duration) pairs; a None path is a pause that holds the
+    last frame for `duration` seconds. While the front widget plays, the
+    next clips are opened on the hidden widgets of the DecoderPool and parked
+    on their first frame; the front widget's `eos` brings the next one up
+    immediately, so consecutive clips play with no idle frames and no polling.
+    A clip that is still warming shows its cached first frame meanwhile.
+
+    Kivy's Video widget has no rate control, so `speed` paces the sequence:
+    pauses last duration / speed, and at speed < 1 every clip is followed by
+    a hold of duration × (1 / speed − 1).
+    """
+
+    def __init__(self, videos, container, speed=1.0, on_finished=None, frame_cache=None):
+        self.pool = DecoderPool(videos, frame_cache)
+        self.pool.on_ready = self._on_ready
+        self.container = container
+        self.speed = speed
+        self.on_finished = on_finished
+
+        self.front = None              # widget currently on screen
+        self._queue = deque()
+        self._current = None           # (path, duration) being shown
+        self._waiting = None           # widget we'll show as soon as it's ready
+        self._timer = None
+
+        for video in self.pool.videos:
+            video.bind(eos=self._on_eos)
+
+    # ─── Public API ──────────────────────────────────────────────────────────
+    def play(self, items):
+        self.stop()
+        self._queue = deque(items)
+        self._start_next()
+
+    def stop(self):
+        self._cancel_timer()
+        self._queue.clear()
+        self._current = None
+        self._waiting = None
+        self.pool.reset()
+
+    def set_speed(self, speed):
+        self.speed = max(0.25, min(float(speed), 4.0))
+
+    @property
+    def is_playing(self):
+        return self._current is not None or bool(self._queue)
+
+    # ─── Sequencing ──────────────────────────────────────────────────────────
+    def _cancel_timer(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+    def _start_next(self, *args):
+        self._cancel_timer()
+        self._current = None
+        if not self._queue:
+            if self.on_finished:
+                self.on_finished()
+            return
+
+        path, duration = self._queue.popleft()
+        if path is None:
+            # Pause: keep the current frame on screen, warm the next clips meanwhile
+            self._timer = Clock.schedule_once(self._start_next, duration / self.speed)
+            self._prefetch()
+            return
+
+        self._current = (path, duration)
+        video = self.pool.load(path, exclude=(self.front,))
+        if video is None:
+            self._clip_done()
+            return
+        if self.pool.is_ready(video):
+            self._show(video)
+        else:
+            self._waiting = video
+            poster = self.pool.frame_cache.get(path)
+            if poster is not None:
+                video.texture = poster
+                self._raise(video)
+            self._timer = Clock.schedule_once(lambda dt: self._warm_timed_out(video), WARM_TIMEOUT)
+            self._prefetch()
+
+    def _warm_timed_out(self, video):
+        if video is not self._waiting:
+            return
+        self._timer = None
+        self._waiting = None
+        self.pool.release(video)
+        self._clip_done()
+
+    def _clip_done(self):
+        if self._current is None:
+            return
+        _, duration = self._current
+        self._current = None
+        self._cancel_timer()
+        hold = duration * (1.0 / self.speed - 1.0) if self.speed < 1.0 else 0.0
+        if hold > 0:
+            self._timer = Clock.schedule_once(self._start_next, hold)
+        else:
+            self._start_next()
+
+    def _prefetch(self):
+        ahead = len(self.pool.videos) - 1
+        upcoming = [p for p, _ in self._queue if p is not None][:ahead]
+        busy = {v for v in (self.front, self._waiting) if v is not None}
+        self.pool.prefetch(upcoming, busy=busy)
+
+    # ─── Widgets ─────────────────────────────────────────────────────────────
+    def _raise(self, video):
+        self.container.remove_widget(video)
+        self.container.add_widget(video)
+        video.opacity = 1
+
+    def _show(self, video):
+        self._cancel_timer()
+        self._waiting = None
+        previous = self.front
+
+        self._raise(video)
+        video.seek(0)
+        video.state = 'play'
+        if previous is not None and previous is not video:
+            previous.opacity = 0
+            self.pool.release(previous)
+        self.front = video
+
+        _, duration = self._current
+        timeout = (duration + EOS_GRACE) if duration else UNKNOWN_DURATION
+        self._timer = Clock.schedule_once(lambda dt: self._clip_done(), timeout)
+        self._prefetch()
+
+    # ─── Video events ────────────────────────────────────────────────────────
+    def _on_ready(self, video):
+        if video is self._waiting and self._current is not None:
+            self._show(video)
+
+    def _on_eos(self, video, eos):
+        if eos and video is self.front:
+            self._clip_done()
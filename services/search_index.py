@@ -0,0 +1,67 @@
+# services/search_index.py
+
+from services.arabic_text import search_key
+
+# ─── In-memory substring search ──────────────────────────────────────────────
+# Built once per data change over one text per record (username, word, ad
+# title), folded with search_key() so "أ"/"ا", tashkeel and Latin case
+# don't matter. Every 1-, 2- and 3-character substring of a record has a
+# postings list of record ids, in record order:
+#   * queries up to 3 characters are a single postings lookup
+#   * longer queries intersect the postings of their trigrams (rarest first)
+#     and confirm the survivors with a real substring test
+# A query that extends the previous one (typing another letter) only
+# re-checks the previous results instead of touching the index again.
+MAX_GRAM = 3
+
+
+class SearchIndex:
+    def __init__(self, texts):
+        self.size = 0
+        self._keys = []
+        self._postings = {}
+        self._last_query = None
+        self._last_ids = None
+        for text in texts:
+            self._add(text)
+
+    def _add(self, text):
+        rid = self.size
+        key = search_key(text or "")
+        self._keys.append(key)
+        self.size += 1
+        grams = set()
+        for n in range(1, MAX_GRAM + 1):
+            for i in range(len(key) - n + 1):
+                grams.add(key[i:i + n])
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(rid)
+
+    def search(self, query: str) -> list:
+        """Ids of records whose text contains `query`, in record order."""
+        query = search_key(query or "")
+        if not query:
+            ids = list(range(self.size))
+        elif self._last_query and self._last_query in query:
+            # Narrowing: every match of the new query matched the old one
+            keys = self._keys
+            ids = [i for i in self._last_ids if query in keys[i]]
+        elif len(query) <= MAX_GRAM:
+            ids = list(self._postings.get(query, ()))
+        else:
+            ids = self._lookup(query)
+        self._last_query, self._last_ids = query, ids
+        return ids
+
+    def _lookup(self, query):
+        grams = {query[i:i + MAX_GRAM] for i in range(len(query) - MAX_GRAM + 1)}
+        postings = sorted((self._postings.get(g, ()) for g in grams), key=len)
+        if not postings[0]:
+            return []
+        candidates = set(postings[0])
+        for plist in postings[1:]:
+            candidates.intersection_update(plist)
+            if not candidates:
+                return []
+        keys = self._keys
+        return sorted(i for i in candidates if query in keys[i])
@@ -0,0 +1,219 @@
+# services/sentence_video.py
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from kivy.clock import Clock
+from kivy.logger import Logger
+
+# ─── Sentence clips ──────────────────────────────────────────────────────────
+# A whole translated sentence rendered into one MP4, so playback is a single
+# decoder instead of one Video reload per letter. Rendered off the UI thread
+# with ffmpeg and cached by a hash of the playlist, so replaying the same text
+# (e.g. from history) plays the finished file straight away.
+# ffmpeg isn't packaged on Android: where it's missing, nothing is scheduled
+# and sentences always play clip by clip.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SENTENCE_DIR = os.path.join(BASE_DIR, "cache", "sentences")
+CACHE_BUDGET_BYTES = 200 * 1024 * 1024
+RENDER_FORMAT = 1
+
+# Every input is normalised to this before joining (concat/xfade need it)
+FRAME_SIZE = (480, 480)
+FRAME_RATE = 25
+
+PAUSE_HOLD = "hold"   # a space freezes the last sign for the pause duration
+PAUSE_SKIP = "skip"   # spaces are dropped, words run together
+
+_ffmpeg_found = None
+
+
+def ffmpeg_available() -> bool:
+    """Whether ffmpeg is on PATH (looked up once per process)."""
+    global _ffmpeg_found
+    if _ffmpeg_found is None:
+        _ffmpeg_found = shutil.which("ffmpeg") is not None
+        if not _ffmpeg_found:
+            Logger.info("SentenceVideo: ffmpeg not found, sentence clips are disabled")
+    return _ffmpeg_found
+
+
+def _clip_signature(path):
+    try:
+        st = os.stat(path)
+        return [os.path.basename(path), st.st_size, st.st_mtime_ns]
+    except OSError:
+        return [os.path.basename(path), None, None]
+
+
+def sentence_key(items, crossfade=0.0, pause_policy=PAUSE_HOLD, speed=1.0) -> str:
+    """
+    Hash of the playlist plus render options. Clip size/mtime are included
+    so re-recording a letter invalidates every sentence that used it.
+    """
+    payload = {
+        "format": RENDER_FORMAT,
+        "items": [_clip_signature(p) + [d] if p else [None, d] for p, d in items],
+        "crossfade": crossfade, "pause_policy": pause_policy, "speed": speed,
+        "frame": [FRAME_SIZE[0], FRAME_SIZE[1], FRAME_RATE],
+    }
+    blob = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(blob).hexdigest()
+
+
+def cached_path(key: str) -> str:
+    return os.path.join(SENTENCE_DIR, f"{key}.mp4")
+
+
+def _segments(items, pause_policy, speed):
+    """Playlist → [(clip path, clip duration, hold after)], durations at `speed`."""
+    segments = []
+    for path, duration in items:
+        if path is None:
+            if segments and pause_policy == PAUSE_HOLD:
+                clip, length, hold = segments[-1]
+                segments[-1] = (clip, length, hold + duration / speed)
+            continue
+        segments.append((path, duration / speed, 0.0))
+    return segments
+
+
+def build_command(segments, out_path, crossfade=0.0, speed=1.0) -> list:
+    w, h = FRAME_SIZE
+    cmd = ["ffmpeg", "-y", "-loglevel", "error"]
+    for path, _, _ in segments:
+        cmd += ["-i", path]
+
+    chains = []
+    for i, (_, _, hold) in enumerate(segments):
+        chain = (f"[{i}:v]scale={w}:{h}:force_original_aspect_ratio=decrease,"
+                 f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={FRAME_RATE},format=yuv420p")
+        if speed != 1.0:
+            chain += f",setpts=PTS/{speed}"
+        if hold > 0:
+            chain += f",tpad=stop_mode=clone:stop_duration={hold:.3f}"
+        chains.append(chain + f"[v{i}]")
+
+    if crossfade > 0 and len(segments) > 1:
+        # xfade offsets are absolute: where the running output ends minus the fade
+        last, running = "v0", segments[0][1] + segments[0][2]
+        for i in range(1, len(segments)):
+            running -= crossfade
+            out = f"x{i}"
+            chains.append(f"[{last}][v{i}]xfade=transition=fade:"
+                          f"duration={crossfade:.3f}:offset={max(running, 0):.3f}[{out}]")
+            last = out
+            running += segments[i][1] + segments[i][2]
+    else:
+        inputs = "".join(f"[v{i}]" for i in range(len(segments)))
+        chains.append(f"{inputs}concat=n={len(segments)}:v=1:a=0[out]")
+        last = "out"
+
+    cmd += ["-filter_complex", ";".join(chains), "-map", f"[{last}]", "-an",
+            "-c:v", "libx264", "-preset", "veryfast", "-crf", "23",
+            "-movflags", "+faststart", out_path]
+    return cmd
+
+
+def render(items, crossfade=0.0, pause_policy=PAUSE_HOLD, speed=1.0) -> str:
+    """Blocking render (or cache hit). Returns the MP4 path."""
+    key = sentence_key(items, crossfade, pause_policy, speed)
+    out_path = cached_path(key)
+    if os.path.exists(out_path):
+        os.utime(out_path)  # LRU touch
+        return out_path
+
+    segments = _segments(items, pause_policy, speed)
+    if not segments:
+        raise ValueError("Nothing to render")
+    # Segments shorter than the fade would make xfade offsets go backwards
+    if crossfade > 0:
+        crossfade = min(crossfade, min(length for _, length, _ in segments) / 2)
+
+    os.makedirs(SENTENCE_DIR, exist_ok=True)
+    tmp = out_path + ".part.mp4"
+    try:
+        subprocess.run(build_command(segments, tmp, crossfade, speed), check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        os.replace(tmp, out_path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    prune_cache()
+    return out_path
+
+
+def rendered_duration(items, crossfade=0.0, pause_policy=PAUSE_HOLD, speed=1.0) -> float:
+    segments = _segments(items, pause_policy, speed)
+    total = sum(length + hold for _, length, hold in segments)
+    return max(total - crossfade * max(len(segments) - 1, 0), 0.0)
+
+
+def prune_cache(budget=CACHE_BUDGET_BYTES):
+    """Drop least-recently-played sentence clips once the folder exceeds budget."""
+    try:
+        entries = [e for e in os.scandir(SENTENCE_DIR) if e.name.endswith(".mp4")
+                   and not e.name.endswith(".part.mp4")]
+    except OSError:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    used = 0
+    for entry in entries:
+        used += entry.stat().st_size
+        if used > budget:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+class SentenceRenderer:
+    """
+    One background worker rendering sentence clips. Only the newest request's
+    callback fires; older renders still finish and stay in the cache.
+    """
+
+    def __init__(self, crossfade=0.0, pause_policy=PAUSE_HOLD):
+        self.crossfade = crossfade
+        self.pause_policy = pause_policy
+        self.enabled = ffmpeg_available()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sentence-render")
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, items, speed=1.0):
+        """Path of an already rendered clip for this playlist, or None."""
+        path = cached_path(sentence_key(items, self.crossfade, self.pause_policy, speed))
+        if os.path.exists(path):
+            os.utime(path)
+            return path
+        return None
+
+    def duration(self, items, speed=1.0) -> float:
+        return rendered_duration(items, self.crossfade, self.pause_policy, speed)
+
+    def request(self, items, on_ready=None, speed=1.0):
+        """
+        Render in the background; on_ready(path) is called on the Kivy thread.
+        Returns the future, or None when ffmpeg isn't available.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        future = self._executor.submit(render, list(items), self.crossfade, self.pause_policy, speed)
+
+        def done(f):
+            if f.exception() is not None or on_ready is None:
+                return  # bad clip: per-letter playback stays in use
+            if generation == self._generation:
+                path = f.result()
+                Clock.schedule_once(lambda dt: on_ready(path))
+        future.add_done_callback(done)
+        return future
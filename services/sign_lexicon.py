@@ -0,0 +1,121 @@
+# services/sign_lexicon.py
+
+import os
+from collections import namedtuple
+
+from services.arabic_text import normalizer_for
+from services.storage import BASE_DIR
+
+# ─── Sign lexicon ────────────────────────────────────────────────────────────
+# Word-level trie over every whole-word / phrase sign we have a clip for:
+#   * clip-index keys with more than one letter ("بيت", "السلام عليكم")
+#   * word entries in storage that carry an optional "video" file
+# Text is segmented longest-match-first over words; anything without a sign
+# is fingerspelled letter by letter.
+_CLIP = "\0"   # trie node key holding the clip path of a complete entry
+
+Segment = namedtuple("Segment", "text clip")   # clip is None → fingerspell
+
+
+class SignLexicon:
+    def __init__(self):
+        self._root = {}
+        self.size = 0
+
+    def add(self, phrase: str, clip: str) -> None:
+        words = phrase.split()
+        if not words:
+            return
+        node = self._root
+        for word in words:
+            node = node.setdefault(word, {})
+        if _CLIP not in node:
+            self.size += 1
+        node[_CLIP] = clip
+
+    def lookup(self, phrase: str):
+        node = self._root
+        for word in phrase.split():
+            node = node.get(word)
+            if node is None:
+                return None
+        return node.get(_CLIP)
+
+    def segment(self, text: str) -> list:
+        """
+        Greedy longest match over the word sequence; O(words × longest phrase).
+        """
+        words = text.split()
+        segments = []
+        i = 0
+        while i < len(words):
+            node = self._root
+            match_end, match_clip = None, None
+            j = i
+            while j < len(words):
+                node = node.get(words[j])
+                if node is None:
+                    break
+                j += 1
+                if _CLIP in node:
+                    match_end, match_clip = j, node[_CLIP]
+            if match_end is None:
+                segments.append(Segment(words[i], None))
+                i += 1
+            else:
+                segments.append(Segment(" ".join(words[i:match_end]), match_clip))
+                i = match_end
+        return segments
+
+
+def build_lexicon(clip_index, storage=None) -> SignLexicon:
+    # Keys go through the same folding as the input text, so "مدرسة.mp4"
+    # still matches when "ة" itself is folded to "ه"
+    fold = normalizer_for(clip_index).fold
+    lexicon = SignLexicon()
+    for key in clip_index.keys():
+        if len(key) > 1:
+            lexicon.add(fold(key), clip_index.first(key))
+    for entry in storage.list_words() if storage is not None else ():
+        if not (entry.get("word") and entry.get("video")):
+            continue
+        video = entry["video"]
+        if not os.path.isabs(video):
+            video = os.path.join(BASE_DIR, video)
+        if os.path.exists(video):
+            lexicon.add(fold(entry["word"]), video)
+    return lexicon
+
+
+_cache = {}
+
+
+def get_lexicon(clip_index, storage=None) -> SignLexicon:
+    """Rebuilt only when the clip folder or the stored words change."""
+    stamp = (clip_index.stamp, storage.version("words") if storage is not None else None)
+    key = (clip_index.video_dir, id(storage))
+    cached = _cache.get(key)
+    if cached is None or cached[0] != stamp:
+        cached = _cache[key] = (stamp, build_lexicon(clip_index, storage))
+    return cached[1]
+
+
+def build_playlist(text, clip_index, storage=None, word_pause=0.0) -> list:
+    """
+    [(clip path | None, seconds), ...] for already-normalized text: word and
+    phrase signs where we have them, fingerspelled letters otherwise, with a
+    (None, word_pause) hold between words.
+    """
+    items = []
+    for segment in get_lexicon(clip_index, storage).segment(text):
+        if items and items[-1][0] is not None:
+            items.append((None, word_pause))
+        if segment.clip:
+            # Whole-word / phrase sign
+            items.append((segment.clip, clip_index.duration(segment.clip)))
+            continue
+        for letter in segment.text:
+            video_path = clip_index.first(letter)
+            if video_path:
+                items.append((video_path, clip_index.duration(video_path)))
+    return items
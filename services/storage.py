@@ -0,0 +1,433 @@
+# services/storage.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from services import json_cache
+from services.history_store import HistoryStore
+
+# ─── Data access layer ───────────────────────────────────────────────────────
+# The one place screens read and write users, words, ads and history.
+#   JsonStore   – the JSON files in the repo root (default, hand-editable),
+#                 parsed once and kept until they change (json_cache)
+#   SqliteStore – slingo.db: WAL, indexed lookups, transactional edits;
+#                 imports the JSON files once on first open
+# Pick with SLINGO_STORAGE=json|sqlite. Records are plain dicts:
+#   user  {"password": …}          word {"word", "image"[, "video"]}
+#   ad    {"id", "image", "title", "details", "link"}
+#   history {"id", "time", "text"}
+# Ad ids are stable: an INTEGER PRIMARY KEY in SQLite, a random hex string
+# stored with each ad in ads.json (assigned on first read to ads that lack
+# one). Edits match on the id, so a queued edit replayed onto a file another
+# process changed meanwhile can't land on a different ad.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+USERS_FILE = os.path.join(BASE_DIR, "users.json")
+WORDS_FILE = os.path.join(BASE_DIR, "words.json")
+ADS_FILE = os.path.join(BASE_DIR, "ads.json")
+HISTORY_FILE = os.path.join(BASE_DIR, "history.jsonl")
+LEGACY_HISTORY_FILE = os.path.join(BASE_DIR, "history.json")
+DB_FILE = os.path.join(BASE_DIR, "slingo.db")
+
+AD_FIELDS = ("image", "title", "details", "link")
+
+
+def _matches(query, text):
+    return not query or query.lower() in text.lower()
+
+
+def _like(query):
+    """LIKE pattern matching `query` anywhere, with % _ \\ taken literally (ESCAPE '\\')."""
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _new_ad_id():
+    return uuid.uuid4().hex[:12]
+
+
+def _assign_ad_ids(ads):
+    for ad in ads:
+        if "id" not in ad:
+            ad["id"] = _new_ad_id()
+
+
+class JsonStore:
+    def __init__(self, users_file=USERS_FILE, words_file=WORDS_FILE, ads_file=ADS_FILE,
+                 history_file=HISTORY_FILE, legacy_history_file=LEGACY_HISTORY_FILE):
+        self.files = {"users": users_file, "words": words_file, "ads": ads_file}
+        self.history = HistoryStore(history_file, legacy_path=legacy_history_file)
+        self._writes = dict.fromkeys(self.files, 0)
+
+    # ─── File plumbing ───────────────────────────────────────────────────────
+    def _read(self, kind):
+        """Shared cached copy — callers must not mutate it (see _edit)."""
+        default = {} if kind == "users" else []
+        data = json_cache.load(self.files[kind], default)
+        return data if isinstance(data, type(default)) else default
+
+    def _edit(self, kind, mutate, batch=True):
+        """
+        Locked read → mutate → atomic write (json_cache / atomic_io). Batched
+        edits are visible to reads at once and reach the file within
+        json_cache.BATCH_DELAY; batch=False writes before returning.
+        """
+        default = {} if kind == "users" else []
+        self._writes[kind] += 1
+        if batch:
+            return json_cache.queue_edit(self.files[kind], mutate, default)
+        return json_cache.edit(self.files[kind], mutate, default)
+
+    def flush(self):
+        json_cache.flush()
+
+    def version(self, kind):
+        """Changes whenever `kind` is modified (cheap; for cache invalidation)."""
+        # Our own (possibly still queued) writes are counted too, in case the
+        # file's mtime is coarse or the batch hasn't been flushed yet
+        try:
+            st = os.stat(self.files[kind])
+            return st.st_mtime_ns, st.st_size, self._writes[kind]
+        except OSError:
+            return None, self._writes[kind]
+
+    def metrics(self):
+        """Parse / cache-hit / write counts per kind, from json_cache."""
+        counts = json_cache.metrics()
+        empty = {"parses": 0, "hits": 0, "writes": 0, "conflicts": 0}
+        return {kind: counts.get(os.path.abspath(path), empty)
+                for kind, path in self.files.items()}
+
+    # ─── Users ───────────────────────────────────────────────────────────────
+    def get_user(self, username):
+        return self._read("users").get(username)
+
+    def list_users(self, query=""):
+        return [(u, rec) for u, rec in self._read("users").items() if _matches(query, u)]
+
+    def save_user(self, username, record, rename_from=None):
+        def mutate(users):
+            if rename_from and rename_from != username:
+                users.pop(rename_from, None)
+            users[username] = record
+        self._edit("users", mutate)
+
+    def create_user(self, username, record):
+        """False if the username is taken (checked and written under the file lock)."""
+        def mutate(users):
+            if username in users:
+                return False
+            users[username] = record
+            return True
+        return self._edit("users", mutate, batch=False)
+
+    def delete_user(self, username):
+        self._edit("users", lambda users: users.pop(username, None))
+
+    # ─── Words ───────────────────────────────────────────────────────────────
+    def list_words(self, query=""):
+        return [w for w in self._read("words") if _matches(query, w.get("word", ""))]
+
+    def get_word(self, word):
+        return next((w for w in self._read("words") if w.get("word") == word), None)
+
+    def save_word(self, entry, original=None):
+        def mutate(words):
+            key = original or entry["word"]
+            for i, w in enumerate(words):
+                if w.get("word") == key:
+                    words[i] = {**w, **entry}
+                    return
+            words.append(entry)
+        self._edit("words", mutate)
+
+    def delete_word(self, word):
+        def mutate(words):
+            words[:] = [w for w in words if w.get("word") != word]
+        self._edit("words", mutate)
+
+    # ─── Ads ─────────────────────────────────────────────────────────────────
+    def _ads(self):
+        ads = self._read("ads")
+        if any("id" not in ad for ad in ads):
+            # ads.json from before ids (or edited by hand): give them one, on disk
+            self._edit("ads", _assign_ad_ids, batch=False)
+            ads = self._read("ads")
+        return ads
+
+    def list_ads(self):
+        return [dict(ad) for ad in self._ads()]
+
+    def get_ad(self, ad_id):
+        return next((dict(ad) for ad in self._ads() if ad["id"] == ad_id), None)
+
+    def save_ad(self, entry, ad_id=None):
+        """Add an ad (ad_id=None) or update one; an ad deleted meanwhile stays deleted."""
+        record = {k: entry.get(k, "") for k in AD_FIELDS}
+        if ad_id is None:
+            record = {"id": _new_ad_id(), **record}
+            self._edit("ads", lambda ads: ads.append(record))
+            return
+
+        def mutate(ads):
+            for i, ad in enumerate(ads):
+                if ad.get("id") == ad_id:
+                    ads[i] = {"id": ad_id, **record}
+                    return
+        self._edit("ads", mutate)
+
+    def delete_ad(self, ad_id):
+        def mutate(ads):
+            ads[:] = [ad for ad in ads if ad.get("id") != ad_id]
+        self._edit("ads", mutate)
+
+    # ─── History ─────────────────────────────────────────────────────────────
+    def add_history(self, text, when=None):
+        return self.history.add(text, when)
+
+    def history_tail(self, n=10):
+        return self.history.tail(n)
+
+    def delete_history(self, entry_id):
+        self.history.delete(entry_id)
+
+
+class SqliteStore:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS users (
+            username TEXT PRIMARY KEY,
+            password TEXT NOT NULL,
+            extra    TEXT NOT NULL DEFAULT '{}'
+        );
+        CREATE TABLE IF NOT EXISTS words (
+            id    INTEGER PRIMARY KEY,
+            word  TEXT NOT NULL UNIQUE,
+            image TEXT NOT NULL DEFAULT '',
+            extra TEXT NOT NULL DEFAULT '{}'
+        );
+        CREATE TABLE IF NOT EXISTS ads (
+            id      INTEGER PRIMARY KEY,
+            image   TEXT NOT NULL DEFAULT '',
+            title   TEXT NOT NULL DEFAULT '',
+            details TEXT NOT NULL DEFAULT '',
+            link    TEXT NOT NULL DEFAULT ''
+        );
+        CREATE TABLE IF NOT EXISTS history (
+            id   INTEGER PRIMARY KEY AUTOINCREMENT,
+            time TEXT NOT NULL,
+            text TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key   TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path=DB_FILE, import_from=None):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(self.SCHEMA)
+        if self._meta("imported") is None:
+            self._import_json(import_from or JsonStore())
+
+    # ─── Connection / meta ───────────────────────────────────────────────────
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _meta(self, key):
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _bump(self, conn, kind):
+        conn.execute(
+            "INSERT INTO meta(key, value) VALUES (?, '1') "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+            (f"version:{kind}",),
+        )
+
+    def version(self, kind):
+        return self._meta(f"version:{kind}")
+
+    def _import_json(self, source):
+        """One transaction: everything from the JSON files, or nothing."""
+        with self._conn() as conn:
+            for username, record in source.list_users():
+                extra = {k: v for k, v in record.items() if k != "password"}
+                conn.execute(
+                    "INSERT OR IGNORE INTO users(username, password, extra) VALUES (?, ?, ?)",
+                    (username, record.get("password", ""), json.dumps(extra, ensure_ascii=False)),
+                )
+            for entry in source.list_words():
+                if not entry.get("word"):
+                    continue
+                extra = {k: v for k, v in entry.items() if k not in ("word", "image")}
+                conn.execute(
+                    "INSERT OR IGNORE INTO words(word, image, extra) VALUES (?, ?, ?)",
+                    (entry["word"], entry.get("image", ""), json.dumps(extra, ensure_ascii=False)),
+                )
+            for ad in source.list_ads():
+                conn.execute(
+                    "INSERT INTO ads(image, title, details, link) VALUES (?, ?, ?, ?)",
+                    tuple(ad.get(k, "") for k in AD_FIELDS),
+                )
+            for entry in source.history.all():
+                conn.execute("INSERT INTO history(time, text) VALUES (?, ?)",
+                             (entry.get("time", ""), entry.get("text", "")))
+            conn.execute("INSERT INTO meta(key, value) VALUES ('imported', ?)",
+                         (time.strftime("%Y-%m-%d %H:%M:%S"),))
+
+    # ─── Users ───────────────────────────────────────────────────────────────
+    @staticmethod
+    def _user(row):
+        return {**json.loads(row["extra"]), "password": row["password"]}
+
+    def get_user(self, username):
+        row = self._conn().execute(
+            "SELECT password, extra FROM users WHERE username = ?", (username,)).fetchone()
+        return self._user(row) if row else None
+
+    def list_users(self, query=""):
+        rows = self._conn().execute(
+            "SELECT username, password, extra FROM users WHERE username LIKE ? ESCAPE '\\' "
+            "ORDER BY rowid", (_like(query),))
+        return [(row["username"], self._user(row)) for row in rows]
+
+    def _upsert_user(self, conn, username, record):
+        extra = {k: v for k, v in record.items() if k != "password"}
+        conn.execute(
+            "INSERT INTO users(username, password, extra) VALUES (?, ?, ?) "
+            "ON CONFLICT(username) DO UPDATE SET password = excluded.password, extra = excluded.extra",
+            (username, record.get("password", ""), json.dumps(extra, ensure_ascii=False)),
+        )
+
+    def save_user(self, username, record, rename_from=None):
+        with self._conn() as conn:
+            if rename_from and rename_from != username:
+                conn.execute("DELETE FROM users WHERE username = ?", (rename_from,))
+            self._upsert_user(conn, username, record)
+            self._bump(conn, "users")
+
+    def create_user(self, username, record):
+        """False if the username is taken (one INSERT, so concurrent sign-ups can't both win)."""
+        extra = {k: v for k, v in record.items() if k != "password"}
+        with self._conn() as conn:
+            cur = conn.execute(
+                "INSERT INTO users(username, password, extra) VALUES (?, ?, ?) "
+                "ON CONFLICT(username) DO NOTHING",
+                (username, record.get("password", ""), json.dumps(extra, ensure_ascii=False)),
+            )
+            if cur.rowcount == 0:
+                return False
+            self._bump(conn, "users")
+        return True
+
+    def delete_user(self, username):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM users WHERE username = ?", (username,))
+            self._bump(conn, "users")
+
+    # ─── Words ───────────────────────────────────────────────────────────────
+    @staticmethod
+    def _word(row):
+        return {**json.loads(row["extra"]), "word": row["word"], "image": row["image"]}
+
+    def list_words(self, query=""):
+        rows = self._conn().execute(
+            "SELECT word, image, extra FROM words WHERE word LIKE ? ESCAPE '\\' ORDER BY id",
+            (_like(query),))
+        return [self._word(row) for row in rows]
+
+    def get_word(self, word):
+        row = self._conn().execute(
+            "SELECT word, image, extra FROM words WHERE word = ?", (word,)).fetchone()
+        return self._word(row) if row else None
+
+    def save_word(self, entry, original=None):
+        with self._conn() as conn:
+            # Take the write lock before reading, so the merge below can't
+            # be based on a row another writer is changing
+            conn.execute("BEGIN IMMEDIATE")
+            key = original or entry["word"]
+            row = conn.execute("SELECT extra FROM words WHERE word = ?", (key,)).fetchone()
+            # Like JsonStore, keep fields the caller didn't pass (e.g. "video")
+            extra = json.loads(row["extra"]) if row else {}
+            extra.update((k, v) for k, v in entry.items() if k not in ("word", "image"))
+            extra = json.dumps(extra, ensure_ascii=False)
+            if row:
+                conn.execute("UPDATE words SET word = ?, image = ?, extra = ? WHERE word = ?",
+                             (entry["word"], entry.get("image", ""), extra, key))
+            else:
+                conn.execute("INSERT INTO words(word, image, extra) VALUES (?, ?, ?)",
+                             (entry["word"], entry.get("image", ""), extra))
+            self._bump(conn, "words")
+
+    def delete_word(self, word):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM words WHERE word = ?", (word,))
+            self._bump(conn, "words")
+
+    # ─── Ads ─────────────────────────────────────────────────────────────────
+    def list_ads(self):
+        rows = self._conn().execute("SELECT id, image, title, details, link FROM ads ORDER BY id")
+        return [dict(row) for row in rows]
+
+    def get_ad(self, ad_id):
+        row = self._conn().execute(
+            "SELECT id, image, title, details, link FROM ads WHERE id = ?", (ad_id,)).fetchone()
+        return dict(row) if row else None
+
+    def save_ad(self, entry, ad_id=None):
+        values = tuple(entry.get(k, "") for k in AD_FIELDS)
+        with self._conn() as conn:
+            if ad_id is not None:
+                conn.execute("UPDATE ads SET image = ?, title = ?, details = ?, link = ? WHERE id = ?",
+                             values + (ad_id,))
+            else:
+                conn.execute("INSERT INTO ads(image, title, details, link) VALUES (?, ?, ?, ?)", values)
+            self._bump(conn, "ads")
+
+    def delete_ad(self, ad_id):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM ads WHERE id = ?", (ad_id,))
+            self._bump(conn, "ads")
+
+    # ─── History ─────────────────────────────────────────────────────────────
+    def add_history(self, text, when=None):
+        when = when or time.strftime("%Y-%m-%d %H:%M")
+        with self._conn() as conn:
+            cur = conn.execute("INSERT INTO history(time, text) VALUES (?, ?)", (when, text))
+        return {"id": cur.lastrowid, "time": when, "text": text}
+
+    def history_tail(self, n=10):
+        rows = self._conn().execute(
+            "SELECT id, time, text FROM history ORDER BY id DESC LIMIT ?", (n,))
+        return [dict(row) for row in rows]
+
+    def delete_history(self, entry_id):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM history WHERE id = ?", (entry_id,))
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    """Process-wide store, chosen by SLINGO_STORAGE (json by default)."""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            backend = os.environ.get("SLINGO_STORAGE", "json").lower()
+            _storage = SqliteStore() if backend == "sqlite" else JsonStore()
+        return _storage
@@ -0,0 +1,120 @@
+# services/thumbnails.py
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from kivy.core.image import Image as CoreImage
+
+# ─── Ad image thumbnails ─────────────────────────────────────────────────────
+# Ads are uploaded as full-resolution photos but only ever shown at carousel
+# size. A display-size, compressed copy is written to cache/thumbs/ when the
+# ad is saved (make_thumbnail), and screens load textures through one shared
+# LRU cache with a byte budget (load_texture), so an original is decoded at
+# most once — to make its thumbnail — and a thumbnail at most once per
+# session while it stays in the cache.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+THUMB_DIR = os.path.join(BASE_DIR, "cache", "thumbs")
+AD_SIZE = (1280, 720)
+JPEG_QUALITY = 82
+TEXTURE_BUDGET = 48 * 1024 * 1024
+
+
+def thumbnail_path(source: str, max_size=AD_SIZE):
+    """Where the thumbnail of `source` lives; None if the source is missing."""
+    source = os.path.abspath(source)
+    try:
+        st = os.stat(source)
+    except OSError:
+        return None
+    # Keyed by the source's mtime/size too, so replacing the file re-thumbnails it
+    key = hashlib.sha1(repr((source, st.st_mtime_ns, st.st_size, tuple(max_size))).encode("utf-8"))
+    return os.path.join(THUMB_DIR, key.hexdigest() + ".jpg")
+
+
+def make_thumbnail(source: str, max_size=AD_SIZE):
+    """Write the display-size copy of `source` (if not there yet) and return its path."""
+    path = thumbnail_path(source, max_size)
+    if path is None or os.path.exists(path):
+        return path
+    try:
+        from PIL import Image
+        with Image.open(source) as image:
+            image.draft("RGB", max_size)   # JPEG: decode at reduced scale
+            image.thumbnail(max_size, Image.LANCZOS)
+            if image.mode in ("RGBA", "LA", "P"):
+                # Flatten transparency onto white, like the screen behind it
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                background.paste(image.convert("RGBA"), mask=image.convert("RGBA").split()[-1])
+                image = background
+            else:
+                image = image.convert("RGB")
+            os.makedirs(THUMB_DIR, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            image.save(tmp, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+        os.replace(tmp, path)
+    except Exception:
+        return None
+    return path
+
+
+def thumbnail_for(source: str, max_size=AD_SIZE) -> str:
+    """The thumbnail path, made now if the ad predates thumbnails; else the original."""
+    return make_thumbnail(source, max_size) or source
+
+
+class TextureCache:
+    """Decoded textures by path: LRU with a byte budget, shared by all screens."""
+
+    def __init__(self, budget_bytes=TEXTURE_BUDGET):
+        self.budget_bytes = budget_bytes
+        self.bytes = 0
+        self.loads = 0
+        self._textures = OrderedDict()   # path → (texture, nbytes)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._textures)
+
+    def texture(self, path):
+        with self._lock:
+            entry = self._textures.get(path)
+            if entry is not None:
+                self._textures.move_to_end(path)
+                return entry[0]
+        try:
+            texture = CoreImage(path).texture
+        except Exception:
+            return None
+        self.loads += 1
+        width, height = texture.size
+        nbytes = width * height * 4
+        with self._lock:
+            if nbytes <= self.budget_bytes:
+                self._textures[path] = (texture, nbytes)
+                self.bytes += nbytes
+                while self.bytes > self.budget_bytes:
+                    _, (_, evicted) = self._textures.popitem(last=False)
+                    self.bytes -= evicted
+        return texture
+
+    def clear(self):
+        with self._lock:
+            self._textures.clear()
+            self.bytes = 0
+
+
+_cache = None
+
+
+def get_texture_cache() -> TextureCache:
+    global _cache
+    if _cache is None:
+        _cache = TextureCache()
+    return _cache
+
+
+def load_texture(source: str, max_size=AD_SIZE):
+    """Texture of the thumbnail of `source` (None if it can't be loaded)."""
+    return get_texture_cache().texture(thumbnail_for(source, max_size))
@@ -0,0 +1,15 @@
+import pytest
+
+from services.storage import JsonStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    """A JsonStore on empty files under tmp_path."""
+    return JsonStore(
+        users_file=str(tmp_path / "users.json"),
+        words_file=str(tmp_path / "words.json"),
+        ads_file=str(tmp_path / "ads.json"),
+        history_file=str(tmp_path / "history.jsonl"),
+        legacy_history_file=str(tmp_path / "history.json"),
+    )
@@ -0,0 +1,38 @@
+from services.arabic_text import ArabicNormalizer, has_foreign, normalize, search_key
+
+
+def test_strips_tashkeel_and_tatweel():
+    assert normalize("مَرْحَبـــاً") == "مرحبا"
+
+
+def test_folds_letter_variants_by_default():
+    assert normalize("أإآ ؤ ئى ة") == "ااا و يي ه"
+
+
+def test_keeps_variants_that_have_their_own_clip():
+    normalizer = ArabicNormalizer(available={"ة", "ا"})
+    assert normalizer("مدرسة أ") == "مدرسة ا"
+
+
+def test_digits_map_to_the_script_with_clips():
+    assert normalize("١٢ ۳4") == "12 34"
+    assert ArabicNormalizer(available={"١", "٢", "٣"})("12 ۳") == "١٢ ٣"
+
+
+def test_drops_foreign_characters_and_tidies_whitespace():
+    assert normalize("  سلام, hello!  \r\n\n\n  عليكم 😀 ") == "سلام\nعليكم"
+    assert normalize("سطر\nآخر", keep_newlines=False) == "سطر اخر"
+
+
+def test_fold_and_non_strings():
+    assert ArabicNormalizer().fold(" بَيت\nجَميل ") == "بيت جميل"
+    assert normalize(None) == ""
+
+
+def test_search_key_keeps_other_scripts():
+    assert search_key("  أحمد ABC ٣ ") == "احمد abc 3"
+
+
+def test_has_foreign():
+    assert has_foreign("مرحبا hello")
+    assert not has_foreign("مرحبا 123 ، ؟")
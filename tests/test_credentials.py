@@ -0,0 +1,16 @@
+from services.credentials import authenticate, create_admin, is_admin
+
+
+def test_no_builtin_admin(store):
+    assert authenticate(store, "admin_ahlam", "admin1234") is None
+    assert store.get_user("admin_ahlam") is None
+
+
+def test_create_admin_never_touches_existing_user(store):
+    store.create_user("sara", {"password": "old-plaintext"})
+
+    assert not create_admin(store, "sara", "new-password")
+    assert store.get_user("sara") == {"password": "old-plaintext"}
+
+    assert create_admin(store, "boss", "s3cret-pass")
+    assert is_admin(authenticate(store, "boss", "s3cret-pass"))
@@ -0,0 +1,82 @@
+import json
+
+from services import history_store
+from services.history_store import HistoryStore
+
+
+def _history(tmp_path):
+    return HistoryStore(str(tmp_path / "history.jsonl"), legacy_path=str(tmp_path / "history.json"))
+
+
+def _lines(history):
+    with open(history.path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_add_appends_one_line_and_tail_is_newest_first(tmp_path):
+    history = _history(tmp_path)
+    for text in ("a", "b", "c"):
+        history.add(text, when="2025-06-01 10:00")
+
+    assert [r["text"] for r in _lines(history)] == ["a", "b", "c"]
+    assert [e["text"] for e in history.tail(2)] == ["c", "b"]
+
+
+def test_delete_appends_tombstone_hidden_from_reads(tmp_path):
+    history = _history(tmp_path)
+    first = history.add("a")
+    history.add("b")
+
+    history.delete(first["id"])
+
+    assert _lines(history)[-1] == {"del": first["id"]}
+    assert [e["text"] for e in history.tail()] == ["b"]
+    assert [e["text"] for e in history.all()] == ["b"]
+
+
+def test_compaction_drops_dead_lines(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_store, "COMPACT_AFTER_TOMBSTONES", 2)
+    history = _history(tmp_path)
+    entries = [history.add(t) for t in ("a", "b", "c")]
+
+    history.delete(entries[0]["id"])
+    assert len(_lines(history)) == 4
+    history.delete(entries[1]["id"])
+
+    assert _lines(history) == [entries[2]]
+    history.add("d")
+    assert [e["text"] for e in history.tail()] == ["d", "c"]
+
+
+def test_torn_last_line_is_skipped_and_terminated(tmp_path):
+    history = _history(tmp_path)
+    history.add("a")
+    with open(history.path, "ab") as f:
+        f.write(b'{"id": "ff", "te')   # crash mid-write
+
+    reopened = _history(tmp_path)
+    reopened.add("b")
+
+    assert [e["text"] for e in reopened.tail()] == ["b", "a"]
+    assert [e["text"] for e in reopened.all()] == ["a", "b"]
+
+
+def test_tail_reads_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_store, "_TAIL_CHUNK", 16)
+    history = _history(tmp_path)
+    for i in range(20):
+        history.add(f"نص {i}")
+
+    assert [e["text"] for e in history.tail(3)] == ["نص 19", "نص 18", "نص 17"]
+
+
+def test_legacy_json_is_migrated_once(tmp_path):
+    legacy = tmp_path / "history.json"
+    legacy.write_text(json.dumps([{"time": "t1", "text": "قديم"}, "junk"], ensure_ascii=False),
+                      encoding="utf-8")
+
+    history = _history(tmp_path)
+    assert [(e["time"], e["text"]) for e in history.all()] == [("t1", "قديم")]
+
+    history.add("جديد")
+    assert [e["text"] for e in _history(tmp_path).all()] == ["قديم", "جديد"]
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from services import json_cache
+from services.atomic_io import atomic_write
+
+
+@pytest.fixture(autouse=True)
+def no_timer_flush(monkeypatch):
+    # Tests flush explicitly; keep the batch timer out of the way
+    monkeypatch.setattr(json_cache, "BATCH_DELAY", 60)
+    yield
+    json_cache.flush()
+
+
+def _write_elsewhere(path, data):
+    """What another app instance does: a write this process's cache didn't see."""
+    atomic_write(str(path), json.dumps(data, ensure_ascii=False))
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_queued_edits_are_visible_before_flush(tmp_path):
+    path = tmp_path / "words.json"
+    _write_elsewhere(path, ["a"])
+
+    json_cache.queue_edit(str(path), lambda data: data.append("b"), [])
+
+    assert json_cache.load(str(path)) == ["a", "b"]
+    assert _read(path) == ["a"]
+    json_cache.flush(str(path))
+    assert _read(path) == ["a", "b"]
+
+
+def test_conflict_replays_edits_onto_fresh_contents(tmp_path):
+    path = tmp_path / "words.json"
+    _write_elsewhere(path, ["a"])
+    json_cache.load(str(path))
+
+    json_cache.queue_edit(str(path), lambda data: data.append("mine"), [])
+    _write_elsewhere(path, ["a", "theirs"])
+    json_cache.flush(str(path))
+
+    assert _read(path) == ["a", "theirs", "mine"]
+    assert json_cache.metrics()[str(path)]["conflicts"] == 1
+
+
+def _titles(store):
+    return [ad["title"] for ad in store.list_ads()]
+
+
+def _add_ads(store, *titles):
+    for title in titles:
+        store.save_ad({"title": title})
+    store.flush()
+    return [ad["id"] for ad in store.list_ads()]
+
+
+def test_ad_delete_replayed_by_id(store):
+    ids = _add_ads(store, "A", "B", "C")
+    path = store.files["ads"]
+
+    store.delete_ad(ids[0])
+    # Meanwhile another instance deletes the same first ad
+    _write_elsewhere(path, _read(path)[1:])
+    store.flush()
+
+    assert [ad["title"] for ad in _read(path)] == ["B", "C"]
+    assert _titles(store) == ["B", "C"]
+
+
+def test_ad_update_skipped_when_deleted_elsewhere(store):
+    ids = _add_ads(store, "A", "B", "C")
+    path = store.files["ads"]
+
+    store.save_ad({"title": "B2"}, ad_id=ids[1])
+    _write_elsewhere(path, [ad for ad in _read(path) if ad["id"] != ids[1]])
+    store.flush()
+
+    assert _titles(store) == ["A", "C"]
+    assert store.get_ad(ids[0])["title"] == "A"
+
+
+def test_ads_without_ids_get_stable_ones(store):
+    path = store.files["ads"]
+    _write_elsewhere(path, [{"title": "A"}, {"title": "B"}])
+
+    first = [ad["id"] for ad in store.list_ads()]
+
+    assert all(first) and len(set(first)) == 2
+    assert [ad["id"] for ad in _read(path)] == first
+    assert [ad["id"] for ad in store.list_ads()] == first
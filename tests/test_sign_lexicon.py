@@ -0,0 +1,39 @@
+import os
+
+from services.clip_index import ClipIndex
+from services.sign_lexicon import build_playlist, get_lexicon
+
+
+def _clip_index(tmp_path, names):
+    video_dir = tmp_path / "datavideos"
+    video_dir.mkdir()
+    index = ClipIndex(str(video_dir), cache_path=str(tmp_path / "clip_index.json"))
+    index._set_files({n: {"size": 0, "mtime_ns": 0, "duration": 1.0} for n in names}, 1)
+    return index
+
+
+def test_playlist_through_get_lexicon(tmp_path, store):
+    index = _clip_index(tmp_path, ["ب.mp4", "ا.mp4", "بيت.mp4"])
+
+    items = build_playlist("بيت باب", index, store, word_pause=0.5)
+
+    video_dir = index.video_dir
+    assert items == [
+        (os.path.join(video_dir, "بيت.mp4"), 1.0),
+        (None, 0.5),
+        (os.path.join(video_dir, "ب.mp4"), 1.0),
+        (os.path.join(video_dir, "ا.mp4"), 1.0),
+        (os.path.join(video_dir, "ب.mp4"), 1.0),
+    ]
+
+
+def test_lexicon_uses_stored_word_videos(tmp_path, store):
+    index = _clip_index(tmp_path, ["ب.mp4"])
+    video = tmp_path / "door.mp4"
+    video.write_bytes(b"")
+    store.save_word({"word": "باب", "image": "", "video": str(video)})
+
+    lexicon = get_lexicon(index, store)
+
+    assert lexicon.lookup("باب") == str(video)
+    assert build_playlist("باب", index, store) == [(str(video), 0.0)]
@@ -0,0 +1,53 @@
+import threading
+
+import pytest
+
+from services.storage import SqliteStore
+
+
+@pytest.fixture
+def db(tmp_path, store):
+    return SqliteStore(str(tmp_path / "slingo.db"), import_from=store)
+
+
+def test_create_user_never_overwrites(db):
+    assert db.create_user("sara", {"password": "first"})
+    assert not db.create_user("sara", {"password": "second"})
+    assert db.get_user("sara")["password"] == "first"
+
+
+def test_concurrent_create_user_has_one_winner(db):
+    results = []
+    start = threading.Barrier(8)
+
+    def register(i):
+        start.wait()
+        results.append((i, db.create_user("sara", {"password": f"pw{i}"})))
+
+    threads = [threading.Thread(target=register, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    winners = [i for i, ok in results if ok]
+    assert len(winners) == 1
+    assert db.get_user("sara")["password"] == f"pw{winners[0]}"
+
+
+def test_save_word_keeps_fields_not_passed(db):
+    db.save_word({"word": "باب", "image": "door.png", "video": "door.mp4"})
+    db.save_word({"word": "باب", "image": "door2.png"})
+    assert db.get_word("باب") == {"word": "باب", "image": "door2.png", "video": "door.mp4"}
+
+
+def test_search_treats_wildcards_literally(db):
+    for name in ("a_b", "axb", "50%", "500"):
+        db.create_user(name, {"password": "x"})
+    db.save_word({"word": "a_b", "image": ""})
+    db.save_word({"word": "acb", "image": ""})
+
+    assert [u for u, _ in db.list_users("_")] == ["a_b"]
+    assert [u for u, _ in db.list_users("%")] == ["50%"]
+    assert [w["word"] for w in db.list_words("a_")] == ["a_b"]
+    assert len(db.list_users("")) == 4
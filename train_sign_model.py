@@ -1,94 +1,684 @@
+import argparse
+import itertools
+import json
+import multiprocessing
 import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import numpy as np
 import cv2
 import tensorflow as tf
 from tensorflow.keras.applications import MobileNetV2
-from tensorflow.keras.layers import Dense, GlobalAveragePooling2D
+from tensorflow.keras.layers import (
+    BatchNormalization, Conv2D, Dense, GlobalAveragePooling2D, Input, MaxPooling2D, ReLU, Softmax
+)
 from tensorflow.keras.models import Model
 from tensorflow.keras.preprocessing.image import ImageDataGenerator
 from sklearn.preprocessing import LabelEncoder
 from sklearn.model_selection import train_test_split
 
+from services import model_registry
+
+# Optional: better CPU / memory numbers in profiling mode (works on Windows too)
+try:
+    import psutil
+except ImportError:
+    psutil = None
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
 # === Config
 IMG_SIZE = 128
 DATASET_DIR = "dataset"  # Use your original dataset
 BATCH_SIZE = 32
 EPOCHS = 10
+HEAD_UNITS = 128
+AUGMENTATION = {
+    "rotation_range": 10,
+    "zoom_range": 0.1,
+    "width_shift_range": 0.1,
+    "height_shift_range": 0.1,
+}
+PROFILE_DIR = "models/profiles"
+
+# === Distillation config
+STUDENT_IMG_SIZE = 96
+STUDENT_ALPHA = 0.35        # MobileNetV2 width multiplier for the student
+DISTILL_TEMPERATURE = 4.0
+DISTILL_HARD_WEIGHT = 0.1   # weight of the true-label loss vs. the teacher's soft labels
+
 
 # === Load Data
-images = []
-labels = []
-
-print("🔍 Inspecting dataset folder:", DATASET_DIR)
-for label_folder in sorted(os.listdir(DATASET_DIR)):
-    folder_path = os.path.join(DATASET_DIR, label_folder)
-    print(f"📁 Folder: {folder_path}")
-    if not os.path.isdir(folder_path):
-        continue
-
-    for img_file in os.listdir(folder_path):
-        if img_file.lower().endswith((".jpg", ".jpeg", ".png")):
-            img_path = os.path.join(folder_path, img_file)
-            try:
-                data = np.fromfile(img_path, dtype=np.uint8)
-                img = cv2.imdecode(data, cv2.IMREAD_COLOR)
-                if img is None:
-                    raise ValueError("cv2.imdecode failed")
-                img = cv2.resize(img, (IMG_SIZE, IMG_SIZE))
-                images.append(img)
-                labels.append(label_folder)
-                print("🖼️ Loaded:", img_path)
-            except Exception as e:
-                print(f"⚠️ Failed to load {img_path}: {e}")
+def load_dataset(dataset_dir=DATASET_DIR, img_size=IMG_SIZE, verbose=True):
+    images = []
+    labels = []
+
+    print("🔍 Inspecting dataset folder:", dataset_dir)
+    for label_folder in sorted(os.listdir(dataset_dir)):
+        folder_path = os.path.join(dataset_dir, label_folder)
+        if verbose:
+            print(f"📁 Folder: {folder_path}")
+        if not os.path.isdir(folder_path):
+            continue
+
+        for img_file in os.listdir(folder_path):
+            if img_file.lower().endswith((".jpg", ".jpeg", ".png")):
+                img_path = os.path.join(folder_path, img_file)
+                try:
+                    data = np.fromfile(img_path, dtype=np.uint8)
+                    img = cv2.imdecode(data, cv2.IMREAD_COLOR)
+                    if img is None:
+                        raise ValueError("cv2.imdecode failed")
+                    img = cv2.resize(img, (img_size, img_size))
+                    images.append(img)
+                    labels.append(label_folder)
+                    if verbose:
+                        print("🖼️ Loaded:", img_path)
+                except Exception as e:
+                    print(f"⚠️ Failed to load {img_path}: {e}")
+
+    print(f"\n✅ Total loaded images: {len(images)}")
+    if len(images) == 0:
+        raise ValueError("❌ No images loaded. Check dataset folder and image files.")
+    return images, labels
 
-print(f"\n✅ Total loaded images: {len(images)}")
-if len(images) == 0:
-    raise ValueError("❌ No images loaded. Check dataset folder and image files.")
 
 # === Preprocess
-images = np.array(images, dtype="float32") / 255.0
-le = LabelEncoder()
-labels_encoded = le.fit_transform(labels)
-labels_encoded = tf.keras.utils.to_categorical(labels_encoded)
+def prepare_data(images, labels):
+    """Normalize, one-hot encode and split. Returns (X_train, X_val, y_train, y_val, classes)."""
+    images = np.array(images, dtype="float32") / 255.0
+    le = LabelEncoder()
+    labels_encoded = le.fit_transform(labels)
+    labels_encoded = tf.keras.utils.to_categorical(labels_encoded)
+    classes = [str(label) for label in le.classes_]
+
+    X_train, X_val, y_train, y_val = train_test_split(
+        images, labels_encoded, test_size=0.2, random_state=42
+    )
+    return X_train, X_val, y_train, y_val, classes
 
-# === Save label map
-os.makedirs("models", exist_ok=True)
-label_map = {i: label for i, label in enumerate(le.classes_)}
-np.save("models/label_map.npy", label_map)
-print("✅ Saved label_map.npy:", label_map)
 
-# === Train/Test Split
-X_train, X_val, y_train, y_val = train_test_split(images, labels_encoded, test_size=0.2, random_state=42)
+def held_out_set(images, labels):
+    """
+    The same validation split prepare_data() makes (same size and seed), but
+    as raw uint8 images + class indices, so any model variant can apply its
+    own normalization.
+    """
+    le = LabelEncoder()
+    label_ids = le.fit_transform(labels)
+    _, X_val, _, y_val = train_test_split(
+        np.array(images, dtype=np.uint8), label_ids, test_size=0.2, random_state=42
+    )
+    return X_val, y_val, [str(label) for label in le.classes_]
+
+
+def make_datagen(augmentation=None):
+    return ImageDataGenerator(**(augmentation or AUGMENTATION))
+
 
 # === Build Model
-base_model = MobileNetV2(include_top=False, input_shape=(IMG_SIZE, IMG_SIZE, 3), weights='imagenet')
-x = base_model.output
-x = GlobalAveragePooling2D()(x)
-x = Dense(128, activation="relu")(x)
-output = Dense(y_train.shape[1], activation="softmax")(x)
-model = Model(inputs=base_model.input, outputs=output)
+def build_model(num_classes, img_size=IMG_SIZE, head_units=HEAD_UNITS):
+    base_model = MobileNetV2(include_top=False, input_shape=(img_size, img_size, 3), weights='imagenet')
+    x = base_model.output
+    x = GlobalAveragePooling2D()(x)
+    x = Dense(head_units, activation="relu")(x)
+    output = Dense(num_classes, activation="softmax")(x)
+    model = Model(inputs=base_model.input, outputs=output)
+
+    for layer in base_model.layers:
+        layer.trainable = False
+
+    model.compile(optimizer="adam", loss="categorical_crossentropy", metrics=["accuracy"])
+    return model
+
+
+# === Distillation
+def build_student(num_classes, img_size=STUDENT_IMG_SIZE, kind="mobilenet", alpha=STUDENT_ALPHA):
+    """
+    Small student network that outputs logits (softmax is added at export).
+      - "mobilenet": MobileNetV2 with a reduced width multiplier, fully trainable
+      - "tiny":      4-block CNN, ~100k parameters
+    """
+    if kind == "tiny":
+        inputs = Input(shape=(img_size, img_size, 3))
+        x = inputs
+        for filters in (16, 32, 64, 96):
+            x = Conv2D(filters, 3, padding="same", use_bias=False)(x)
+            x = BatchNormalization()(x)
+            x = ReLU()(x)
+            x = MaxPooling2D()(x)
+        x = GlobalAveragePooling2D()(x)
+    else:
+        base = MobileNetV2(include_top=False, input_shape=(img_size, img_size, 3),
+                           alpha=alpha, weights='imagenet')
+        inputs = base.input
+        x = GlobalAveragePooling2D()(base.output)
+    logits = Dense(num_classes)(x)
+    return Model(inputs=inputs, outputs=logits, name=f"student_{kind}")
+
+
+class Distiller(tf.keras.Model):
+    """
+    Trains `student` on a mix of the true labels and the teacher's
+    temperature-softened predictions (Hinton et al. knowledge distillation).
+    The teacher is frozen and sees the same augmented batch, resized to its
+    own input size.
+    """
+
+    def __init__(self, student, teacher, temperature=DISTILL_TEMPERATURE, hard_weight=DISTILL_HARD_WEIGHT):
+        super().__init__()
+        self.student = student
+        self.teacher = teacher
+        self.temperature = temperature
+        self.hard_weight = hard_weight
+        self.teacher_size = teacher.input_shape[1:3]
+        self.student_size = student.input_shape[1:3]
+        self.hard_loss = tf.keras.losses.CategoricalCrossentropy(from_logits=True)
+        self.soft_loss = tf.keras.losses.KLDivergence()
+        self.loss_tracker = tf.keras.metrics.Mean(name="loss")
+        self.acc = tf.keras.metrics.CategoricalAccuracy(name="accuracy")
+
+    @property
+    def metrics(self):
+        return [self.loss_tracker, self.acc]
+
+    def _resize(self, x, size):
+        return x if tuple(x.shape[1:3]) == tuple(size) else tf.image.resize(x, size)
+
+    def train_step(self, data):
+        x, y = data
+        teacher_probs = self.teacher(self._resize(x, self.teacher_size), training=False)
+        teacher_logits = tf.math.log(teacher_probs + 1e-7)
+        x_student = self._resize(x, self.student_size)
+        t = self.temperature
+
+        with tf.GradientTape() as tape:
+            logits = self.student(x_student, training=True)
+            soft = self.soft_loss(
+                tf.nn.softmax(teacher_logits / t), tf.nn.softmax(logits / t)
+            ) * (t * t)
+            hard = self.hard_loss(y, logits)
+            loss = self.hard_weight * hard + (1.0 - self.hard_weight) * soft
+
+        grads = tape.gradient(loss, self.student.trainable_variables)
+        self.optimizer.apply_gradients(zip(grads, self.student.trainable_variables))
+        self.loss_tracker.update_state(loss)
+        self.acc.update_state(y, logits)
+        return {m.name: m.result() for m in self.metrics}
+
+    def test_step(self, data):
+        x, y = data
+        logits = self.student(self._resize(x, self.student_size), training=False)
+        self.loss_tracker.update_state(self.hard_loss(y, logits))
+        self.acc.update_state(y, logits)
+        return {m.name: m.result() for m in self.metrics}
+
+
+def export_tflite(model, path, quantize=True):
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if quantize:
+        # Dynamic-range quantization: int8 weights, ~4× smaller, float I/O
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    with open(path, "wb") as f:
+        f.write(converter.convert())
+    return path
+
+
+def distill(student_kind="mobilenet", img_size=STUDENT_IMG_SIZE, alpha=STUDENT_ALPHA,
+            batch_size=BATCH_SIZE, epochs=EPOCHS, teacher_version=None, activate=False):
+    teacher_version = teacher_version or model_registry.active_version()
+    if not teacher_version:
+        raise ValueError("❌ No teacher model in the registry. Train one first.")
+    teacher_manifest = model_registry.load_manifest(teacher_version)
+    if teacher_manifest["backend"] != "keras":
+        raise ValueError(f"❌ Teacher {teacher_version} must be a Keras model")
+    teacher = tf.keras.models.load_model(model_registry.artifact_path(teacher_version), compile=False)
+    teacher.trainable = False
+    print(f"🎓 Teacher: {teacher_version} ({teacher.count_params():,} params)")
+
+    # Load at the teacher's resolution; the student input is resized per batch
+    images, labels = load_dataset(img_size=teacher_manifest["input_size"], verbose=False)
+    X_train, X_val, y_train, y_val, classes = prepare_data(images, labels)
+    if classes != teacher_manifest["classes"]:
+        raise ValueError("❌ Dataset classes differ from the teacher's classes")
+
+    student = build_student(len(classes), img_size=img_size, kind=student_kind, alpha=alpha)
+    print(f"🧒 Student: {student.name} @ {img_size}px ({student.count_params():,} params)")
+
+    distiller = Distiller(student, teacher)
+    distiller.compile(optimizer=tf.keras.optimizers.Adam(1e-3))
+
+    datagen = make_datagen()
+    history = distiller.fit(
+        datagen.flow(X_train, y_train, batch_size=batch_size),
+        validation_data=(X_val, y_val),
+        epochs=epochs,
+        callbacks=[tf.keras.callbacks.EarlyStopping(
+            monitor="val_accuracy", patience=3, restore_best_weights=True, mode="max"
+        )],
+    )
+
+    # === Export: student + softmax → TFLite → registry
+    os.makedirs("models", exist_ok=True)
+    exported = Model(student.input, Softmax()(student.output))
+    tflite_path = export_tflite(exported, os.path.join("models", f"student_{student_kind}.tflite"))
+    version = model_registry.publish(
+        tflite_path,
+        classes,
+        input_size=img_size,
+        backend="tflite",
+        activate=activate,
+        extra={
+            "distilled_from": teacher_version,
+            "student": student_kind,
+            "width_multiplier": alpha if student_kind == "mobilenet" else None,
+            "val_accuracy": float(max(history.history["val_accuracy"])),
+            "size_bytes": os.path.getsize(tflite_path),
+        },
+    )
+    state = "now active" if activate else f"activate with model_registry.set_active('{version}')"
+    print(f"✅ Student published to models/registry/{version} ({state})")
+    return version
+
+
+# === Hyperparameter sweep
+# Trials train in parallel worker processes and are compared on accuracy
+# there. Latency is measured afterwards in this process, one saved model at
+# a time with the same thread settings, so it isn't skewed by whatever the
+# other workers were doing.
+SWEEP_DIR = "models/sweeps"
+SWEEP_PATIENCE = 3
+LATENCY_RUNS = 50
+
+# Used when --sweep is given without a file. Keys are run_trial() config keys;
+# every value is a list of candidates.
+DEFAULT_SEARCH_SPACE = {
+    "img_size": [96, 128],
+    "batch_size": [32, 64],
+    "epochs": [EPOCHS],
+    "head_units": [64, 128],
+    "rotation_range": [5, 10],
+    "zoom_range": [0.1],
+}
+
+_DATASET_CACHE = {}
+
+
+def _worker_init(threads):
+    # Split the cores between parallel trials instead of oversubscribing
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def _trial_data(img_size):
+    """Each worker process loads and splits the dataset once per image size."""
+    if img_size not in _DATASET_CACHE:
+        images, labels = load_dataset(img_size=img_size, verbose=False)
+        _DATASET_CACHE[img_size] = prepare_data(images, labels)
+    return _DATASET_CACHE[img_size]
+
 
-for layer in base_model.layers:
-    layer.trainable = False
+def measure_latency_ms(model, img_size, runs=LATENCY_RUNS):
+    """Median and p90 single-image inference latency, after warm-up."""
+    sample = np.random.rand(1, img_size, img_size, 3).astype("float32")
+    for _ in range(5):
+        model(sample, training=False)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        model(sample, training=False)
+        timings.append(1000 * (time.perf_counter() - start))
+    return float(np.percentile(timings, 50)), float(np.percentile(timings, 90))
+
+
+def run_trial(config, model_path):
+    """
+    Train one configuration with early stopping and save the model to
+    model_path; returns a result record (latency is measured by sweep()).
+    """
+    img_size = int(config.get("img_size", IMG_SIZE))
+    batch_size = int(config.get("batch_size", BATCH_SIZE))
+    epochs = int(config.get("epochs", EPOCHS))
+    head_units = int(config.get("head_units", HEAD_UNITS))
+    augmentation = {k: config.get(k, v) for k, v in AUGMENTATION.items()}
+
+    start = time.perf_counter()
+    X_train, X_val, y_train, y_val, classes = _trial_data(img_size)
+    tf.keras.backend.clear_session()
+    model = build_model(y_train.shape[1], img_size=img_size, head_units=head_units)
+    datagen = make_datagen(augmentation)
+    history = model.fit(
+        datagen.flow(X_train, y_train, batch_size=batch_size),
+        validation_data=(X_val, y_val),
+        epochs=epochs,
+        verbose=0,
+        callbacks=[tf.keras.callbacks.EarlyStopping(
+            monitor="val_accuracy", patience=SWEEP_PATIENCE, restore_best_weights=True, mode="max"
+        )],
+    )
+    model.save(model_path)
+    return {
+        "config": config,
+        "val_accuracy": float(max(history.history["val_accuracy"])),
+        "epochs_run": len(history.history["val_accuracy"]),
+        "params": int(model.count_params()),
+        "train_s": round(time.perf_counter() - start, 1),
+        "model_path": model_path,
+    }
+
+
+def measure_saved_latency(result):
+    """Load a trial's saved model and add its latency to the result record."""
+    tf.keras.backend.clear_session()
+    model = tf.keras.models.load_model(result["model_path"], compile=False)
+    p50, p90 = measure_latency_ms(model, int(result["config"].get("img_size", IMG_SIZE)))
+    result["latency_ms_p50"] = round(p50, 3)
+    result["latency_ms_p90"] = round(p90, 3)
+    return result
+
+
+def expand_search_space(space, trials=None, seed=42):
+    """Full grid, or a seeded random sample of `trials` grid points."""
+    keys = sorted(space)
+    grid = [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+    if trials and trials < len(grid):
+        grid = random.Random(seed).sample(grid, trials)
+    return grid
+
+
+def pareto_front(results):
+    """Trials no other trial beats on both accuracy (higher) and latency (lower)."""
+    front = []
+    for r in results:
+        dominated = any(
+            o["val_accuracy"] >= r["val_accuracy"] and o["latency_ms_p50"] <= r["latency_ms_p50"]
+            and (o["val_accuracy"] > r["val_accuracy"] or o["latency_ms_p50"] < r["latency_ms_p50"])
+            for o in results
+        )
+        if not dominated:
+            front.append(r)
+    return sorted(front, key=lambda r: r["latency_ms_p50"])
+
+
+def _log_trial(log_path, record):
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def sweep(space_path=None, workers=2, trials=None):
+    if space_path:
+        with open(space_path, "r", encoding="utf-8") as f:
+            space = json.load(f)
+    else:
+        space = DEFAULT_SEARCH_SPACE
+    configs = expand_search_space(space, trials)
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    model_dir = os.path.join(SWEEP_DIR, f"sweep_{stamp}_models")
+    os.makedirs(model_dir, exist_ok=True)
+    log_path = os.path.join(SWEEP_DIR, f"sweep_{stamp}.jsonl")
+    print(f"🔬 {len(configs)} trials on {workers} workers → {log_path}")
+
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    try:
+        # Latency below is measured here, with the thread settings a worker has
+        _worker_init(threads)
+    except RuntimeError:
+        print("⚠️ TensorFlow already initialized; latency uses its default thread settings")
+    results = []
+    # "spawn" gives every worker a fresh TensorFlow runtime
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_worker_init, initargs=(threads,)) as pool:
+        futures = {
+            pool.submit(run_trial, cfg, os.path.join(model_dir, f"trial_{i:03d}.h5")): cfg
+            for i, cfg in enumerate(configs)
+        }
+        for future in as_completed(futures):
+            cfg = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"⚠️ Trial {cfg} failed: {e}")
+                _log_trial(log_path, {"config": cfg, "error": str(e)})
+            else:
+                results.append(result)
+                print(f"✅ {cfg} → acc {result['val_accuracy']:.3f}, {result['epochs_run']} epochs")
+
+    print(f"\n⏱️ Measuring latency of {len(results)} trained models, one at a time…")
+    for result in results:
+        measure_saved_latency(result)
+        print(f"   {result['latency_ms_p50']:7.1f} ms (p50)  {result['config']}")
+        _log_trial(log_path, result)
+
+    print("\n🏁 Pareto-optimal configurations (accuracy vs. latency):")
+    for r in pareto_front(results):
+        print(f"   acc {r['val_accuracy']:.3f}  {r['latency_ms_p50']:7.1f} ms  {r['config']}")
+    return results
+
+
+# === Profiling
+def _peak_rss_mb():
+    """Peak resident set size of this process in MiB, or None if unknown."""
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        peak = getattr(info, "peak_wset", None)  # Windows keeps a real peak
+        if peak:
+            return peak / (1024 * 1024)
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return peak / 1024 if os.uname().sysname != "Darwin" else peak / (1024 * 1024)
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    return None
+
+
+def _round_or_none(value, digits=1):
+    return round(value, digits) if value is not None else None
+
+
+class TimedSequence(tf.keras.utils.Sequence):
+    """
+    Wraps a batch source (e.g. datagen.flow(...)) and adds up the time spent
+    producing batches. Keras may pull batches ahead on its own thread, so
+    the gap between train-batch callbacks doesn't show generator time;
+    timing the source itself does.
+    """
+
+    def __init__(self, source):
+        super().__init__()
+        self.source = source
+        self.seconds = 0.0
+        self.batches = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.source)
+
+    def __getitem__(self, index):
+        start = time.perf_counter()
+        batch = self.source[index]
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.seconds += elapsed
+            self.batches += 1
+        return batch
+
+    def on_epoch_end(self):
+        self.source.on_epoch_end()
+
+    def take(self):
+        """(seconds, batches) since the last call, then reset."""
+        with self._lock:
+            totals = (self.seconds, self.batches)
+            self.seconds, self.batches = 0.0, 0
+        return totals
+
+
+class ThroughputProfiler(tf.keras.callbacks.Callback):
+    """
+    Per-epoch training profile:
+      - input_wait_s : time spent producing batches in the augmentation
+                       generator (measured by the TimedSequence around it;
+                       may overlap compute if Keras prefetches)
+      - step_s       : time spent inside train steps (compute)
+      - images_per_s : training images / training wall time (validation excluded)
+      - cpu_percent  : process CPU time / (wall time × cores)
+      - peak_rss_mb  : peak resident memory so far
+    """
+
+    def __init__(self, source, num_train_images, batch_size, out_path=None):
+        super().__init__()
+        self.source = source
+        self.num_train_images = num_train_images
+        self.batch_size = batch_size
+        self.out_path = out_path
+        self.epochs = []
+        self._cpus = os.cpu_count() or 1
+
+    def on_epoch_begin(self, epoch, logs=None):
+        now = time.perf_counter()
+        self._epoch_start = now
+        self._cpu_start = time.process_time()
+        self._last_batch_end = now
+        self._batch_start = now
+        self._step = 0.0
+        self._steps = 0
+        self.source.take()   # drop batches fetched before the epoch started
+
+    def on_train_batch_begin(self, batch, logs=None):
+        self._batch_start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        now = time.perf_counter()
+        self._step += now - self._batch_start
+        self._last_batch_end = now
+        self._steps += 1
+
+    def on_epoch_end(self, epoch, logs=None):
+        wall = time.perf_counter() - self._epoch_start
+        cpu = time.process_time() - self._cpu_start
+        wait, _ = self.source.take()
+        train_time = self._last_batch_end - self._epoch_start
+        images = min(self._steps * self.batch_size, self.num_train_images)
+        record = {
+            "epoch": epoch + 1,
+            "wall_s": round(wall, 3),
+            "input_wait_s": round(wait, 3),
+            "step_s": round(self._step, 3),
+            "steps": self._steps,
+            "mean_step_ms": round(1000 * self._step / max(self._steps, 1), 2),
+            "images_per_s": round(images / train_time, 1) if train_time else None,
+            "input_wait_fraction": round(min(wait / train_time, 1.0), 3) if train_time else None,
+            "cpu_percent": round(100 * cpu / (wall * self._cpus), 1) if wall else None,
+            "peak_rss_mb": _round_or_none(_peak_rss_mb()),
+            "val_accuracy": (logs or {}).get("val_accuracy"),
+        }
+        self.epochs.append(record)
+        bound = "input-bound" if (record["input_wait_fraction"] or 0) > 0.3 else "compute-bound"
+        print(
+            f"⏱️ Epoch {record['epoch']}: {record['images_per_s']} img/s, "
+            f"wait {record['input_wait_s']}s / step {record['step_s']}s ({bound}), "
+            f"CPU {record['cpu_percent']}%, peak RSS {record['peak_rss_mb']} MiB"
+        )
+
+    def on_train_end(self, logs=None):
+        if not self.out_path:
+            return
+        os.makedirs(os.path.dirname(self.out_path), exist_ok=True)
+        report = {
+            "batch_size": self.batch_size,
+            "train_images": self.num_train_images,
+            "cpu_count": self._cpus,
+            "epochs": self.epochs,
+        }
+        with open(self.out_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✅ Training profile saved to {self.out_path}")
 
-model.compile(optimizer="adam", loss="categorical_crossentropy", metrics=["accuracy"])
-model.summary()
 
 # === Train
-datagen = ImageDataGenerator(
-    rotation_range=10,
-    zoom_range=0.1,
-    width_shift_range=0.1,
-    height_shift_range=0.1
-)
-datagen.fit(X_train)
+def train(batch_size=BATCH_SIZE, epochs=EPOCHS, profile=False, trace=False):
+    images, labels = load_dataset()
+    X_train, X_val, y_train, y_val, classes = prepare_data(images, labels)
+    print("✅ Classes:", classes)
+    os.makedirs("models", exist_ok=True)
+
+    model = build_model(y_train.shape[1])
+    model.summary()
+
+    datagen = make_datagen()
+    datagen.fit(X_train)
+
+    train_data = datagen.flow(X_train, y_train, batch_size=batch_size)
+    callbacks = []
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    if profile:
+        train_data = TimedSequence(train_data)
+        callbacks.append(ThroughputProfiler(
+            train_data, len(X_train), batch_size,
+            out_path=os.path.join(PROFILE_DIR, f"profile_{stamp}.json"),
+        ))
+    if trace:
+        # Trace a window of steps after warm-up; open with TensorBoard's Profile tab
+        log_dir = os.path.join(PROFILE_DIR, f"trace_{stamp}")
+        callbacks.append(tf.keras.callbacks.TensorBoard(log_dir=log_dir, profile_batch=(10, 20)))
+        print(f"🧭 TensorBoard trace → {log_dir}")
+
+    history = model.fit(
+        train_data,
+        validation_data=(X_val, y_val),
+        epochs=epochs,
+        callbacks=callbacks
+    )
+
+    # === Save model & publish a new registry version
+    model.save("models/asl_model.h5")
+    version = model_registry.publish(
+        "models/asl_model.h5",
+        classes,
+        input_size=IMG_SIZE,
+        backend="keras",
+        extra={"val_accuracy": float(history.history["val_accuracy"][-1])},
+    )
+    print(f"✅ Trained model published to models/registry/{version} (now active)")
+    return version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the Arabic sign letter classifier.")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--profile", action="store_true",
+                        help="record input wait, step time, img/s, CPU and peak RSS per epoch")
+    parser.add_argument("--trace", action="store_true",
+                        help="also write a TensorBoard profiler trace (needs tensorboard-plugin-profile)")
+    parser.add_argument("--distill", choices=["mobilenet", "tiny"],
+                        help="train a small student from the active model's soft labels")
+    parser.add_argument("--student-size", type=int, default=STUDENT_IMG_SIZE)
+    parser.add_argument("--student-alpha", type=float, default=STUDENT_ALPHA)
+    parser.add_argument("--teacher", help="registry version to distill from (default: active)")
+    parser.add_argument("--activate", action="store_true",
+                        help="make the distilled student the active model")
+    parser.add_argument("--sweep", nargs="?", const="", metavar="SPACE_JSON",
+                        help="run a hyperparameter sweep (JSON: key → list of values)")
+    parser.add_argument("--workers", type=int, default=2, help="parallel sweep trials")
+    parser.add_argument("--trials", type=int, help="random sample of the grid instead of all of it")
+    args = parser.parse_args()
+    if args.sweep is not None:
+        sweep(args.sweep or None, workers=args.workers, trials=args.trials)
+    elif args.distill:
+        distill(student_kind=args.distill, img_size=args.student_size, alpha=args.student_alpha,
+                batch_size=args.batch_size, epochs=args.epochs,
+                teacher_version=args.teacher, activate=args.activate)
+    else:
+        train(batch_size=args.batch_size, epochs=args.epochs, profile=args.profile, trace=args.trace)
 
-history = model.fit(
-    datagen.flow(X_train, y_train, batch_size=BATCH_SIZE),
-    validation_data=(X_val, y_val),
-    epochs=EPOCHS
-)
 
-# === Save model
-model.save("models/asl_model.h5")
-print("✅ Trained model saved to models/asl_model.h5")
+if __name__ == "__main__":
+    main()